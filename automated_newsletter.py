@@ -4,6 +4,7 @@ Climate Cardinals - Automated Weekly Newsletter System
 Uses DuckDuckGo (free, no API keys needed)
 """
 
+import asyncio
 import os
 import sys
 import json
@@ -11,7 +12,7 @@ import re
 import csv
 import time
 import html
-import random
+from contextlib import closing
 from datetime import datetime, timedelta
 from pathlib import Path
 from urllib.parse import urlparse
@@ -19,14 +20,46 @@ from urllib.parse import urlparse
 import requests
 import pandas as pd
 from bs4 import BeautifulSoup
-from dateutil import parser
-from ddgs import DDGS
-import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 
+from data_store import (
+    SECTION_NAMES,
+    CsvAccumulator,
+    OpportunityStore,
+    SectionBundle,
+    compact_section,
+    load_section,
+)
+from date_utils import (
+    DateExtractor,
+    fuzzy_parse_stats,
+    normalize_section_dates,
+    parse_fuzzy_date,
+)
+from search_client import (
+    AdaptiveRateLimiter,
+    DDGSClient,
+    RecordingBackend,
+    ReplayBackend,
+    RetryPolicy,
+    SearchCache,
+    SearchExecutor,
+    SearchMetrics,
+    SessionResetError,
+    is_retryable_error,
+)
+from mailer import SmtpPool, load_recipients, render_personalized
+from outbox import Outbox
+from term_matcher import TermMatcher
+
 # ---------------------- CONFIG ----------------------
-POLITE_DELAY = 0.25
+POLITE_DELAY = 0.25  # Starting spacing between search requests (seconds)
+SEARCH_WORKERS = 4  # Keyword searches allowed in flight at once
+SEARCH_MIN_RATE = 0.2  # Slowest request rate when throttled (searches/second)
+SEARCH_MAX_RATE = 8.0  # Fastest request rate when the backend is healthy
+SEARCH_MAX_ATTEMPTS = 4  # Attempts per query on rate-limit/timeout errors
+SEARCH_RETRY_BUDGET = 20  # Total retries allowed across the whole run
 MAX_RESULTS_PER_KEYWORD = 4
 MAX_ROWS_PER_SECTION = 40
 MIN_YEAR = 2026  # Current year - update annually
@@ -34,6 +67,29 @@ OUTPUT_FOLDER = Path("weekly_data")
 OUTPUT_FOLDER.mkdir(exist_ok=True)
 TODAY = datetime.now().date()
 
+# Search result cache (reruns within the TTL cost zero network calls). It is a
+# local file, not committed: the TTL is shorter than the daily schedule, so a
+# copy from the previous run would never produce a hit
+SEARCH_CACHE_PATH = OUTPUT_FOLDER / "search_cache.sqlite"
+SEARCH_CACHE_TTL_HOURS = float(os.getenv("SEARCH_CACHE_TTL_HOURS", "20"))
+SEARCH_CACHE_MAX_ENTRIES = 2000
+
+# Offline search: replay recorded results from a JSONL file instead of DDGS,
+# or record live DDGS results to a JSONL file for later replay
+SEARCH_REPLAY_FILE = os.getenv("SEARCH_REPLAY_FILE", "")
+SEARCH_RECORD_FILE = os.getenv("SEARCH_RECORD_FILE", "")
+
+# Per-keyword scrape progress; a run restarted on the same day resumes from it
+CHECKPOINT_PATH = OUTPUT_FOLDER / "scrape_checkpoint.json"
+
+# Updated rows held back before a section CSV is rewritten (see data_store.py)
+CSV_COMPACT_THRESHOLD = 50
+
+# Full history of scraped rows; the weekly digest is a query over it. Not
+# committed: the newsletter workflow keeps it in the Actions cache, and an
+# empty store is refilled from the section CSVs (backfill_opportunity_store)
+OPPORTUNITY_DB_PATH = OUTPUT_FOLDER / "opportunities.sqlite"
+
 # Email format configuration
 USE_CONDENSED_EMAIL = True  # Set to False to use full format with all data
 
@@ -58,6 +114,36 @@ SENDER_EMAIL = os.getenv("SENDER_EMAIL", "")
 SENDER_PASSWORD = os.getenv("SENDER_PASSWORD", "")
 RECIPIENT_EMAILS = [e.strip() for e in os.getenv("RECIPIENT_EMAILS", "").split(",") if e.strip()]
 
+# Delivery: a few SMTP connections are reused for the whole send (see
+# mailer.SmtpPool); the shared digest goes out SMTP_BATCH_SIZE recipients per
+# envelope, and a connection is replaced after SMTP_MAX_MESSAGES_PER_CONNECTION
+SMTP_POOL_SIZE = int(os.getenv("SMTP_POOL_SIZE", "2"))
+SMTP_BATCH_SIZE = int(os.getenv("SMTP_BATCH_SIZE", "50"))
+SMTP_MAX_MESSAGES_PER_CONNECTION = int(os.getenv("SMTP_MAX_MESSAGES_PER_CONNECTION", "100"))
+SMTP_STARTTLS = os.getenv("SMTP_STARTTLS", "1") == "1"
+
+# Outgoing mail is queued in a durable outbox first (see outbox.py): each run
+# retries with backoff for up to OUTBOX_DRAIN_SECONDS, and whatever is left is
+# sent by the next daily run without re-rendering the newsletter. The database
+# holds recipient addresses, so it is never committed; on GitHub Actions it
+# only survives between runs when the workflow caches it (OUTBOX_DURABLE=1).
+# Without that, a digest only counts as sent once it was actually delivered.
+OUTBOX_PATH = OUTPUT_FOLDER / "outbox.sqlite"
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "10"))
+OUTBOX_DRAIN_SECONDS = float(os.getenv("OUTBOX_DRAIN_SECONDS", "600"))
+OUTBOX_DURABLE = os.getenv("OUTBOX_DURABLE", "0" if os.getenv("GITHUB_ACTIONS") else "1") == "1"
+OUTBOX_KEEP_DAYS = 30  # Sent/failed messages kept for inspection
+
+# Personalized sending: every recipient gets their own copy of the condensed
+# digest with their name, only the sections they chose and a signed
+# unsubscribe link (see mailer.py). RECIPIENTS_FILE is a CSV with email, name
+# and sections columns; without it RECIPIENT_EMAILS get the full digest.
+PERSONALIZED_EMAIL = os.getenv("PERSONALIZED_EMAIL", "0") == "1"
+RECIPIENTS_FILE = os.getenv("RECIPIENTS_FILE", "")
+UNSUBSCRIBE_URL = os.getenv("UNSUBSCRIBE_URL", "")
+UNSUBSCRIBE_SECRET = os.getenv("UNSUBSCRIBE_SECRET", "")
+EMAIL_RENDER_WORKERS = int(os.getenv("EMAIL_RENDER_WORKERS", str(min(4, os.cpu_count() or 1))))
+
 # ---------------------- KEYWORDS ----------------------
 GRANT_KEYWORDS = [
     "resilience grant", "sustainability grant", "climate adaptation grant",
@@ -86,58 +172,75 @@ CLIMATE_TERMS = [
     "net zero", "renewable", "flood", "heat", "wildfire", "community", "justice"
 ]
 
-def looks_relevant(title, snippet, url):
-    blob = f"{title} {snippet} {url}".lower()
-    
-    # Filter out Wikipedia, books, and other irrelevant content
-    exclude_patterns = [
-        "wikipedia.org",
-        "grokipedia.com",
-        "(book)",
-        "book review",
-        "amazon.com",
-        "goodreads.com",
-        "isbn"
-    ]
-    
-    if any(pattern in blob for pattern in exclude_patterns):
+# Filter out Wikipedia, books, and other irrelevant content
+EXCLUDE_PATTERNS = [
+    "wikipedia.org",
+    "grokipedia.com",
+    "(book)",
+    "book review",
+    "amazon.com",
+    "goodreads.com",
+    "isbn"
+]
+
+GRANT_POSITIVE_SIGNALS = [
+    "apply",
+    "application",
+    "applications",
+    "deadline",
+    "funding opportunity",
+    "request for proposals",
+    "rfp",
+    "open call",
+    "grant program",
+    "now accepting",
+    "eligible",
+]
+GRANT_NEGATIVE_SIGNALS = [
+    "announcing",
+    "grantees",
+    "grantee",
+    "awardees",
+    "awarded",
+    "winner",
+    "winners",
+    "press release",
+    "recap",
+    "highlights",
+]
+
+# All term lists compiled into one matcher, so each result is scanned once
+TERM_MATCHER = TermMatcher({
+    "climate": CLIMATE_TERMS,
+    "exclude": EXCLUDE_PATTERNS,
+    "grant_positive": GRANT_POSITIVE_SIGNALS,
+    "grant_negative": GRANT_NEGATIVE_SIGNALS,
+})
+
+def match_terms(title, snippet, url):
+    """Scan "title snippet url" once for every term list"""
+    return TERM_MATCHER.scan(f"{title} {snippet} {url}".lower())
+
+def looks_relevant(title, snippet, url, matches=None):
+    if matches is None:
+        matches = match_terms(title, snippet, url)
+    if matches.has("exclude"):
         return False
-    
-    return any(t in blob for t in CLIMATE_TERMS)
-
-
-def looks_like_active_grant(title, snippet, date_info):
-    """Heuristic filter to keep active grant opportunities and drop grant news."""
-    blob = f"{title} {snippet}".lower()
-
-    positive_signals = [
-        "apply",
-        "application",
-        "applications",
-        "deadline",
-        "funding opportunity",
-        "request for proposals",
-        "rfp",
-        "open call",
-        "grant program",
-        "now accepting",
-        "eligible",
-    ]
-    negative_signals = [
-        "announcing",
-        "grantees",
-        "grantee",
-        "awardees",
-        "awarded",
-        "winner",
-        "winners",
-        "press release",
-        "recap",
-        "highlights",
-    ]
-
-    has_positive = any(sig in blob for sig in positive_signals)
-    has_negative = any(sig in blob for sig in negative_signals)
+    return matches.has("climate")
+
+
+def looks_like_active_grant(title, snippet, date_info, matches=None):
+    """Heuristic filter to keep active grant opportunities and drop grant news.
+
+    matches can be the match_terms() result already computed for the
+    relevance check; grant signals only count inside the title and snippet.
+    """
+    text = f"{title} {snippet}".lower()
+    if matches is None:
+        matches = TERM_MATCHER.scan(text)
+
+    has_positive = matches.has("grant_positive", end=len(text))
+    has_negative = matches.has("grant_negative", end=len(text))
 
     # Strong reject for announcement-style pages unless they also include
     # explicit application/funding language.
@@ -162,76 +265,14 @@ def domain_from_url(url):
         return "—"
 
 def extract_year(text):
-    try:
-        return parser.parse(text, fuzzy=True).year
-    except:
-        return None
+    parsed = parse_fuzzy_date(text)
+    return parsed.year if parsed else None
+
+# Patterns are compiled once here instead of on every call
+DATE_EXTRACTOR = DateExtractor(min_year=MIN_YEAR)
 
 def extract_date_snippet(text, future=True):
-    if not text:
-        return "—"
-    
-    # Enhanced pattern to catch various date formats
-    # Format 1: "January 15, 2026" or "Jan 15, 2026"
-    month_full_pat = re.compile(
-        r"(January|February|March|April|May|June|July|August|September|October|November|December|"
-        r"Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Sept|Oct|Nov|Dec)"
-        r"\.?\s+\d{1,2},?\s*(20\d{2})", re.I
-    )
-    
-    # Format 2: "15 January 2026" or "15 Jan 2026"
-    day_month_pat = re.compile(
-        r"\d{1,2}\s+(January|February|March|April|May|June|July|August|September|October|November|December|"
-        r"Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Sept|Oct|Nov|Dec)"
-        r"\.?\s*(20\d{2})", re.I
-    )
-    
-    # Format 3: "2026-01-15" or "01/15/2026" or "15-01-2026"
-    numeric_pat = re.compile(r"(20\d{2})[/-](0?\d|1[0-2])[/-](0?\d|[12]\d|3[01])|"
-                            r"(0?\d|1[0-2])[/-](0?\d|[12]\d|3[01])[/-](20\d{2})|"
-                            r"(0?\d|[12]\d|3[01])[/-](0?\d|1[0-2])[/-](20\d{2})")
-    
-    # Look for deadline keywords followed by dates
-    deadline_patterns = [
-        r"(?:deadline|due|submit\s+by|applications?\s+(?:due|close)|closes?|ends?)[:\s]+(.*?)(?:\.|,|$)",
-        r"(?:apply\s+by|applications?\s+accepted\s+until)[:\s]+(.*?)(?:\.|,|$)",
-        r"(?:open\s+until|accepting\s+until)[:\s]+(.*?)(?:\.|,|$)"
-    ]
-    
-    for pat in deadline_patterns:
-        match = re.search(pat, text, re.I)
-        if match:
-            date_text = match.group(1)
-            # Try to extract date from this snippet
-            date_match = month_full_pat.search(date_text) or day_month_pat.search(date_text) or numeric_pat.search(date_text)
-            if date_match:
-                year_str = date_match.group(2) if len(date_match.groups()) >= 2 else date_match.group(0)[-4:]
-                try:
-                    year = int(re.search(r'20\d{2}', year_str).group())
-                    if year >= MIN_YEAR:
-                        return date_match.group(0)
-                except:
-                    pass
-    
-    # Standard date search
-    for m in month_full_pat.finditer(text):
-        year_match = re.search(r'20\d{2}', m.group(0))
-        if year_match:
-            year = int(year_match.group())
-            if year >= MIN_YEAR:
-                return m.group(0)
-    
-    for m in day_month_pat.finditer(text):
-        year_match = re.search(r'20\d{2}', m.group(0))
-        if year_match:
-            year = int(year_match.group())
-            if year >= MIN_YEAR:
-                return m.group(0)
-    
-    if future and re.search(r"rolling|ongoing|open\s+until|continuous", text, re.I):
-        return "Rolling / Ongoing"
-    
-    return "—"
+    return DATE_EXTRACTOR.extract(text, future=future)
 
 def calculate_deadline_text(date_str):
     """Convert a date string into a countdown format like 'Due in 4 weeks'"""
@@ -242,8 +283,10 @@ def calculate_deadline_text(date_str):
         return "Rolling deadline"
     
     try:
-        # Parse the date
-        deadline_date = parser.parse(date_str, fuzzy=True)
+        # Parse the date (memoized, the same strings come back every run)
+        deadline_date = parse_fuzzy_date(date_str)
+        if deadline_date is None:
+            return date_str
         today = datetime.now()
         
         # Calculate difference
@@ -269,143 +312,273 @@ def calculate_deadline_text(date_str):
         return date_str  # If parsing fails, return original date
 
 # ---------------------- SEARCH ----------------------
-def web_search(query, num=8):
+SEARCH_CACHE = SearchCache(
+    SEARCH_CACHE_PATH,
+    ttl_seconds=SEARCH_CACHE_TTL_HOURS * 3600,
+    max_entries=SEARCH_CACHE_MAX_ENTRIES,
+)
+
+# One rate limiter shared by all search workers replaces the per-keyword sleeps.
+# It speeds up while searches succeed and backs off when the backend pushes back.
+SEARCH_LIMITER = AdaptiveRateLimiter(
+    rate=1 / POLITE_DELAY,
+    min_rate=SEARCH_MIN_RATE,
+    max_rate=SEARCH_MAX_RATE,
+)
+SEARCH_RETRY = RetryPolicy(max_attempts=SEARCH_MAX_ATTEMPTS, budget=SEARCH_RETRY_BUDGET)
+SEARCH_METRICS = SearchMetrics()
+
+def create_search_backend():
+    """Build the backend for this run: JSONL replay, or one shared DDGS session"""
+    if SEARCH_REPLAY_FILE:
+        return ReplayBackend(SEARCH_REPLAY_FILE)
+    backend = DDGSClient()
+    if SEARCH_RECORD_FILE:
+        backend = RecordingBackend(backend, SEARCH_RECORD_FILE)
+    return backend
+
+SEARCH_BACKEND = create_search_backend()
+
+def web_search(query, num=8, backend=None):
+    backend = backend or SEARCH_BACKEND
+    if not backend.remote:
+        return backend.text(query, max_results=num)
+
+    # A recording run queries the backend every time so the fixture ends up
+    # with every query, not only the ones missing from the cache
+    if not isinstance(backend, RecordingBackend):
+        cached = SEARCH_CACHE.get(query, num, backend.name)
+        if cached is not None:
+            return cached
+
     results = []
-    try:
-        with DDGS() as ddgs:
-            for r in ddgs.text(query, max_results=num):
-                results.append({
-                    "title": r.get("title", ""),
-                    "link": r.get("href", ""),
-                    "snippet": r.get("body", "")
-                })
-    except Exception as e:
-        print(f"⚠️  Search error: {e}")
+    attempt = 0
+    ok = False
+    started = time.monotonic()
+    while True:
+        attempt += 1
+        SEARCH_LIMITER.acquire()
+        try:
+            results = backend.text(query, max_results=num)
+            SEARCH_LIMITER.on_success()
+            ok = True
+            break
+        except Exception as e:
+            if not is_retryable_error(e):
+                print(f"⚠️  Search error: {e}")
+                break
+            # A dropped session is a connection problem, not the backend pushing back
+            if not isinstance(e, SessionResetError):
+                SEARCH_LIMITER.on_throttle()
+            if not SEARCH_RETRY.take_retry(attempt):
+                print(f"⚠️  Search error after {attempt} attempt(s), giving up: {e}")
+                break
+            delay = SEARCH_RETRY.backoff(attempt)
+            print(f"⏳ Search failed on '{query}' ({e}), retrying in {delay:.1f}s")
+            time.sleep(delay)
+    SEARCH_METRICS.record(query, attempt, time.monotonic() - started, ok)
+
+    # Failed or empty searches are not cached so the next run retries them
+    if results:
+        SEARCH_CACHE.put(query, num, backend.name, results)
     return results
 
+SEARCH_EXECUTOR = SearchExecutor(web_search, max_workers=SEARCH_WORKERS)
+
 # ---------------------- CORE PIPELINE ----------------------
-def run_section(keywords, future=True, section_type=None):
-    rows = []
-    seen_domains = set()
-    for kw in keywords:
-        if len(rows) >= MAX_ROWS_PER_SECTION:
-            break
-        print(f"🔍 Searching: {kw}")
-        items = web_search(kw, num=8)[:MAX_RESULTS_PER_KEYWORD]
-        for item in items:
-            if len(rows) >= MAX_ROWS_PER_SECTION:
-                break
-            url = item["link"]
-            domain = domain_from_url(url)
-            if not url or domain in seen_domains:
+# run_section is a chain of generator stages. Each stage consumes and yields
+# (keyword, rows) chunks, one per keyword, so rows reach the CSV and the
+# checkpoint as soon as their keyword is done.
+
+def search_stage(keywords, executor, backend):
+    """Yield (keyword, raw results) in keyword order"""
+    # Searches run concurrently but results are consumed in keyword order,
+    # so domain dedup and the row cap behave exactly as a sequential scan.
+    with closing(executor.iter_results(keywords, num=8, backend=backend)) as results:
+        for kw, found in results:
+            print(f"🔍 Searching: {kw}")
+            yield kw, found
+
+def normalize_stage(chunks):
+    """Turn raw search results into rows with cleaned text and a domain"""
+    for kw, found in chunks:
+        yield kw, [{
+            "Title": clean_text(item["title"]),
+            "Organization": domain_from_url(item["link"]),
+            "Description": clean_text(item["snippet"]),
+            "URL": item["link"]
+        } for item in found[:MAX_RESULTS_PER_KEYWORD]]
+
+def dedup_stage(chunks, seen_domains):
+    """Keep the first result per domain (irrelevant results still claim it)"""
+    for kw, rows in chunks:
+        kept = []
+        for row in rows:
+            if not row["URL"] or row["Organization"] in seen_domains:
                 continue
-            seen_domains.add(domain)
-            title = clean_text(item["title"])
-            snippet = clean_text(item["snippet"])
-            if not looks_relevant(title, snippet, url):
-                continue
-            
-            date_info = extract_date_snippet(f"{title} {snippet}", future=future)
+            seen_domains.add(row["Organization"])
+            kept.append(row)
+        yield kw, kept
+
+def relevance_stage(chunks):
+    """Drop irrelevant rows; kept rows carry their term matches for later filters"""
+    for kw, rows in chunks:
+        kept = []
+        for row in rows:
+            row["_matches"] = match_terms(row["Title"], row["Description"], row["URL"])
+            if looks_relevant(row["Title"], row["Description"], row["URL"], matches=row["_matches"]):
+                kept.append(row)
+        yield kw, kept
+
+def extract_dates_stage(chunks, future=True):
+    """Add the 'Date Info' text found in each row's title and snippet"""
+    for kw, rows in chunks:
+        for row in rows:
+            row["Date Info"] = extract_date_snippet(f"{row['Title']} {row['Description']}", future=future)
+        yield kw, rows
+
+def grant_filter_stage(chunks):
+    for kw, rows in chunks:
+        yield kw, [row for row in rows
+                   if looks_like_active_grant(row["Title"], row["Description"], row["Date Info"],
+                                              matches=row["_matches"])]
+
+def enrich_dates_stage(chunks, future=True):
+    """Parse dates per chunk, drop past items and add the 'Deadline' countdown"""
+    columns = ["Title", "Organization", "Description", "Date Info", "Deadline", "URL", "Parsed Date"]
+    for kw, rows in chunks:
+        if rows:
+            # Future sections drop explicitly old or past-dated items and get a
+            # countdown ("Due in 4 weeks"); items without a date are kept.
+            batch = normalize_section_dates(pd.DataFrame(rows), future=future,
+                                            min_year=MIN_YEAR, today=TODAY)
+            rows = batch[columns].to_dict("records")
+        yield kw, rows
+
+def run_section(keywords, future=True, section_type=None, executor=None, backend=None,
+                csv_name=None, checkpoint=None):
+    """Scrape one section; returns the rows found by this run
+
+    With csv_name, each keyword's rows are appended to that CSV as soon as
+    the keyword is done. With a checkpoint as well, progress is saved after
+    every keyword and a restarted run skips the keywords already finished.
+    A keyword whose search failed is left pending, so a restart retries it.
+    """
+    executor = executor or SEARCH_EXECUTOR
+    progress = {"done": [], "rows": 0, "seen_domains": []}
+    if csv_name and checkpoint is not None:
+        progress = checkpoint["sections"].setdefault(csv_name, progress)
+        if progress["done"]:
+            print(f"♻️  Resuming {csv_name}: {len(progress['done'])} keyword(s) already done")
+    done = set(progress["done"])
+    seen_domains = set(progress["seen_domains"])
+    total = progress["rows"]
+    rows = []
 
-            if section_type == "grants" and not looks_like_active_grant(title, snippet, date_info):
-                continue
-            
-            # For future events/grants, filter smartly
-            if future:
-                year = extract_year(date_info)
-                
-                # REJECT: Explicitly old events (with confirmed past dates)
-                if year and year < MIN_YEAR:
-                    continue
-                
-                # REJECT: Events with past dates we can parse
-                if date_info != "—" and date_info != "Rolling / Ongoing":
-                    try:
-                        event_date = parser.parse(date_info, fuzzy=True)
-                        if event_date.date() < TODAY:
-                            continue  # Skip past events
-                    except:
-                        pass  # If parsing fails, include it
-                
-                # ACCEPT: Items with no date (most upcoming events don't have dates in snippets)
-                # ACCEPT: Rolling/Ongoing items
-                # ACCEPT: Items with future dates
-            
-            # Add deadline countdown for grants
-            deadline_text = calculate_deadline_text(date_info) if future else date_info
-            
-            rows.append({
-                "Title": title,
-                "Organization": domain,
-                "Description": snippet,
-                "Date Info": date_info,
-                "Deadline": deadline_text,
-                "URL": url
-            })
-        time.sleep(POLITE_DELAY + random.uniform(0, 0.15))
+    if total >= MAX_ROWS_PER_SECTION:
+        return rows
+
+    chunks = search_stage([kw for kw in keywords if kw not in done], executor, backend)
+    searches = chunks
+    chunks = normalize_stage(chunks)
+    chunks = dedup_stage(chunks, seen_domains)
+    chunks = relevance_stage(chunks)
+    chunks = extract_dates_stage(chunks, future=future)
+    if section_type == "grants":
+        chunks = grant_filter_stage(chunks)
+    chunks = enrich_dates_stage(chunks, future=future)
+
+    with closing(searches):
+        for kw, chunk in chunks:
+            chunk = chunk[:MAX_ROWS_PER_SECTION - total]
+            if csv_name and chunk:
+                write_csv(csv_name, chunk)
+            rows.extend(chunk)
+            total += len(chunk)
+            if csv_name and checkpoint is not None:
+                if SEARCH_METRICS.failed(kw):
+                    print(f"⚠️  '{kw}' left pending in the checkpoint")
+                else:
+                    progress["done"].append(kw)
+                progress["rows"] = total
+                progress["seen_domains"] = sorted(seen_domains)
+                save_checkpoint(checkpoint)
+            if total >= MAX_ROWS_PER_SECTION:
+                break
     return rows
 
 def looks_like_person(name):
     return (len(name.split()) >= 2 and name[0].isupper() and
             not any(x in name.lower() for x in ["jobs", "careers", "hiring"]))
 
-def run_experts(queries):
+def run_experts(queries, executor=None, backend=None):
+    executor = executor or SEARCH_EXECUTOR
     rows = []
     seen_profiles = set()
-    for q in queries:
-        print(f"🔍 Searching Experts: {q}")
-        items = web_search(q, num=12)
-        for item in items:
-            url = item["link"]
-            if "linkedin.com/in" not in url:
-                continue
-            if url in seen_profiles:
-                continue
-            seen_profiles.add(url)
-            title = clean_text(item["title"])
-            snippet = clean_text(item["snippet"])
-            
-            # Parse name and role - split only on the FIRST dash/em-dash separator
-            # This preserves hyphens within job titles (e.g., "C-Suite Executive")
-            name = "—"
-            role = "—"
-            
-            if "–" in title:  # Em-dash separator
-                parts = title.split("–", 1)  # Split only once
-                name = parts[0].strip()
-                role = parts[1].strip() if len(parts) > 1 else "—"
-            elif " - " in title:  # Regular dash with spaces
-                parts = title.split(" - ", 1)  # Split only once
-                name = parts[0].strip()
-                role = parts[1].strip() if len(parts) > 1 else "—"
-            else:
-                name = title.strip()
-                role = "—"
-            
-            if not looks_like_person(name):
-                continue
-            
-            # Clean up role - remove truncation artifacts or overly short roles
-            if role != "—" and (len(role) <= 2 or not any(c.isalpha() for c in role[1:])):
+    with closing(executor.iter_results(queries, num=12, backend=backend)) as results:
+        for q, items in results:
+            print(f"🔍 Searching Experts: {q}")
+            for item in items:
+                url = item["link"]
+                if "linkedin.com/in" not in url:
+                    continue
+                if url in seen_profiles:
+                    continue
+                seen_profiles.add(url)
+                title = clean_text(item["title"])
+                snippet = clean_text(item["snippet"])
+                
+                # Parse name and role - split only on the FIRST dash/em-dash separator
+                # This preserves hyphens within job titles (e.g., "C-Suite Executive")
+                name = "—"
                 role = "—"
-            
-            org = "—"
-            if " at " in snippet:
-                org = snippet.split(" at ")[-1].split(".")[0].strip()
-            rows.append({
-                "Name": name,
-                "Role": role,
-                "Organization": org,
-                "LinkedIn": url
-            })
-        time.sleep(POLITE_DELAY)
-        if len(rows) >= 30:
-            break
+                
+                if "–" in title:  # Em-dash separator
+                    parts = title.split("–", 1)  # Split only once
+                    name = parts[0].strip()
+                    role = parts[1].strip() if len(parts) > 1 else "—"
+                elif " - " in title:  # Regular dash with spaces
+                    parts = title.split(" - ", 1)  # Split only once
+                    name = parts[0].strip()
+                    role = parts[1].strip() if len(parts) > 1 else "—"
+                else:
+                    name = title.strip()
+                    role = "—"
+                
+                if not looks_like_person(name):
+                    continue
+                
+                # Clean up role - remove truncation artifacts or overly short roles
+                if role != "—" and (len(role) <= 2 or not any(c.isalpha() for c in role[1:])):
+                    role = "—"
+                
+                org = "—"
+                if " at " in snippet:
+                    org = snippet.split(" at ")[-1].split(".")[0].strip()
+                rows.append({
+                    "Name": name,
+                    "Role": role,
+                    "Organization": org,
+                    "LinkedIn": url
+                })
+            if len(rows) >= 30:
+                break
     return rows
 
 # ---------------------- WRITE CSVs WITH ACCUMULATION ----------------------
+OPPORTUNITY_STORE = OpportunityStore(OPPORTUNITY_DB_PATH)
+
+def backfill_opportunity_store():
+    """Seed empty store tables from the current CSVs (first run with the store)"""
+    for section in SECTION_NAMES:
+        if OPPORTUNITY_STORE.count(section) == 0:
+            df = load_section(section, OUTPUT_FOLDER)
+            if not df.empty:
+                written = OPPORTUNITY_STORE.upsert(section, df)
+                print(f"🗄️  Imported {written} {section} row(s) into {OPPORTUNITY_DB_PATH.name}")
+
 def write_csv(name, data):
-    """Accumulate data to CSV and remove duplicates by URL"""
+    """Accumulate data to CSV, deduplicated by URL (LinkedIn for experts)"""
     path = OUTPUT_FOLDER / name
     
     if not data:
@@ -422,54 +595,42 @@ def write_csv(name, data):
     else:
         new_df.loc[:, 'Scraped'] = today_str
     
-    # Load existing data if file exists
-    if path.exists():
-        try:
-            existing_df = pd.read_csv(path)
-            # Combine existing and new data
-            combined_df = pd.concat([existing_df, new_df], ignore_index=True)
-        except (pd.errors.EmptyDataError, FileNotFoundError):
-            combined_df = new_df
-    else:
-        combined_df = new_df
-    
     # Determine which column to use for deduplication
     # experts.csv uses 'LinkedIn', others use 'URL'
-    if 'LinkedIn' in combined_df.columns:
+    if 'LinkedIn' in new_df.columns:
         dedup_column = 'LinkedIn'
-    elif 'URL' in combined_df.columns:
+    elif 'URL' in new_df.columns:
         dedup_column = 'URL'
     else:
-        # No unique identifier column, save without deduplication
-        combined_df.to_csv(path, index=False)
-        print(f"Saved {name} (+{len(new_df)} new, {len(combined_df)} total, no deduplication)")
-        return
-    
-    # Remove duplicates by unique column (keep latest occurrence from this run)
-    deduplicated_df = combined_df.drop_duplicates(subset=[dedup_column], keep='last')
-    
-    # Save back to CSV
-    deduplicated_df.to_csv(path, index=False)
-    
-    new_count = len(new_df)
-    total_count = len(deduplicated_df)
-    duplicates_removed = len(combined_df) - len(deduplicated_df)
-    
-    if duplicates_removed > 0:
-        print(f"Saved {name} (+{new_count} new, {total_count} total, {duplicates_removed} duplicates removed)")
+        dedup_column = None
+    
+    # Only genuinely new rows are appended; rows for URLs already in the file
+    # are held back and merged in one rewrite once enough of them pile up
+    store = CsvAccumulator(path, key_column=dedup_column,
+                           compact_threshold=CSV_COMPACT_THRESHOLD, date_columns=['Parsed Date'])
+    result = store.add(new_df)
+    OPPORTUNITY_STORE.upsert(Path(name).stem, new_df)
+    
+    if not dedup_column:
+        print(f"Saved {name} (+{result['new']} new, {result['total']} total, no deduplication)")
+    elif result['compacted']:
+        print(f"Saved {name} (+{result['new']} new, {result['updated']} updated, {result['total']} total, compacted)")
+    elif result['updated']:
+        print(f"Saved {name} (+{result['new']} new, {result['updated']} updated, {result['total']} total)")
     else:
-        print(f"Saved {name} (+{new_count} new, {total_count} total after deduplication)")
+        print(f"Saved {name} (+{result['new']} new, {result['total']} total after deduplication)")
 
 def clear_weekly_data():
-    """Clear all CSV files and old HTML reports for fresh week"""
+    """Clear this week's CSV exports and old HTML reports for fresh week"""
     csv_files = ['grants.csv', 'events.csv', 'csr_reports.csv', 'experts.csv']
     cleared_count = 0
     
     # Clear CSV data files
     for csv_file in csv_files:
         path = OUTPUT_FOLDER / csv_file
-        if path.exists():
-            path.unlink()
+        existed = path.exists()
+        CsvAccumulator(path).clear()  # also drops the key index and pending rows
+        if existed:
             cleared_count += 1
             print(f"🗑️  Cleared {csv_file}")
     
@@ -498,14 +659,21 @@ def cleanup_old_reports():
         old_reports = html_files[keep_count:]
         print(f"\n🗑️  Cleaning up old reports (keeping {keep_count} most recent)...")
         
+        from report_manifest import remove_report
+        from web_report_generator import update_index_html
+
+        entries = None
         for old_report in old_reports:
             try:
                 old_report.unlink()
+                entries = remove_report(OUTPUT_FOLDER, old_report.name)
                 print(f"   ✖️  Deleted: {old_report.name}")
             except Exception as e:
                 print(f"   ⚠️  Failed to delete {old_report.name}: {e}")
         
         print(f"✅ Cleaned up {len(old_reports)} old report(s)")
+        if entries is not None:
+            update_index_html(OUTPUT_FOLDER, entries=entries)
     else:
         print(f"\n📁 Currently have {len(html_files)} report(s) (keeping {keep_count})")
 
@@ -535,15 +703,45 @@ def save_state(state):
     with open(state_path, 'w') as f:
         json.dump(state, f, indent=2)
 
+def load_checkpoint():
+    """Load today's scrape checkpoint, or start a new one"""
+    if CHECKPOINT_PATH.exists():
+        try:
+            with open(CHECKPOINT_PATH, 'r') as f:
+                checkpoint = json.load(f)
+            if checkpoint.get('date') == str(TODAY):
+                return checkpoint
+        except (json.JSONDecodeError, FileNotFoundError):
+            pass
+    return {"date": str(TODAY), "sections": {}}
+
+def save_checkpoint(checkpoint):
+    """Write the checkpoint atomically so a crash never leaves half a file"""
+    tmp_path = CHECKPOINT_PATH.with_suffix(".tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump(checkpoint, f, indent=2)
+    os.replace(tmp_path, CHECKPOINT_PATH)
+
+def clear_checkpoint():
+    if CHECKPOINT_PATH.exists():
+        CHECKPOINT_PATH.unlink()
+
 # ---------------------- EMAIL ----------------------
-def send_email(grants_data, events_data, csr_data, experts_data, use_condensed=True):
-    """Send newsletter email using condensed or full template - only on Monday"""
+OUTBOX = Outbox(OUTBOX_PATH, max_attempts=OUTBOX_MAX_ATTEMPTS)
+
+def send_email(sections, use_condensed=True):
+    """Send newsletter email using condensed or full template - only on Monday
+
+    sections is a data_store.SectionBundle; its DataFrames go to the templates as-is.
+    """
     # Only send on Monday (weekday 0 = Monday)
     if datetime.now().weekday() != 0:
         print(f"⏭️  Not Monday (today is {datetime.now().strftime('%A')}), skipping email send")
         return False
     
-    if not SENDER_EMAIL or not SENDER_PASSWORD or not RECIPIENT_EMAILS:
+    personalized = PERSONALIZED_EMAIL and use_condensed
+    has_recipients = RECIPIENT_EMAILS or (personalized and RECIPIENTS_FILE)
+    if not SENDER_EMAIL or not SENDER_PASSWORD or not has_recipients:
         print("⚠️  Email config missing, skipping send")
         return False
     
@@ -555,63 +753,119 @@ def send_email(grants_data, events_data, csr_data, experts_data, use_condensed=T
         from email_template import generate_email_html as generate_template
         template_type = "Full Report"
     
-    # Convert to DataFrames and rename columns for template
-    grants_df = pd.DataFrame(grants_data) if grants_data else pd.DataFrame()
-    events_df = pd.DataFrame(events_data) if events_data else pd.DataFrame()
-    csr_df = pd.DataFrame(csr_data) if csr_data else pd.DataFrame()
-    experts_df = pd.DataFrame(experts_data) if experts_data else pd.DataFrame()
-    
-    # Rename Organization to Domain for template compatibility
-    if not grants_df.empty:
-        grants_df = grants_df.rename(columns={'Organization': 'Domain'})
-    if not events_df.empty:
-        events_df = events_df.rename(columns={'Organization': 'Domain'})
-    if not csr_df.empty:
-        csr_df = csr_df.rename(columns={'Organization': 'Domain'})
-    
     # Generate report from the exact same DataFrames that drive email counts.
     report_filename = None
     if use_condensed:
         from web_report_generator import generate_full_report_html
-        report_path = generate_full_report_html(experts_df, grants_df, events_df, csr_df)
+        report_path = generate_full_report_html(sections)
         report_filename = Path(report_path).name
 
     # Generate HTML using selected template
     if use_condensed:
         html_content = generate_template(
-            experts_df,
-            grants_df,
-            events_df,
-            csr_df,
+            sections,
             base_url=WEB_REPORT_BASE_URL,
             report_filename=report_filename,
         )
     else:
-        html_content = generate_template(experts_df, grants_df, events_df, csr_df)
+        html_content = generate_template(sections.experts, sections.grants, sections.events, sections.csr_reports)
     
-    # Send email
+    subject_prefix = "🌍 Climate Cardinals Newsletter"
+    if use_condensed:
+        subject_prefix += " - Weekly Digest"
+    subject = f"{subject_prefix} - {TODAY}"
+    if personalized:
+        return send_personalized_email(html_content, subject)
+    
+    # Queue the email, then send it
     try:
         msg = MIMEMultipart("alternative")
-        subject_prefix = "🌍 Climate Cardinals Newsletter"
-        if use_condensed:
-            subject_prefix += " - Weekly Digest"
-        msg["Subject"] = f"{subject_prefix} - {TODAY}"
+        msg["Subject"] = subject
         msg["From"] = SENDER_EMAIL
         msg["To"] = ", ".join(RECIPIENT_EMAILS)
         
         msg.attach(MIMEText(html_content, "html"))
         
-        with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as server:
-            server.starttls()
-            server.login(SENDER_EMAIL, SENDER_PASSWORD)
-            server.sendmail(SENDER_EMAIL, RECIPIENT_EMAILS, msg.as_string())
-        
-        print(f"✅ Email sent ({template_type}) to {len(RECIPIENT_EMAILS)} recipients")
+        message = msg.as_string()
+        queued = OUTBOX.enqueue(f"digest-{TODAY}", (
+            (RECIPIENT_EMAILS[i:i + SMTP_BATCH_SIZE], message)
+            for i in range(0, len(RECIPIENT_EMAILS), SMTP_BATCH_SIZE)
+        ))
+        print(f"📥 {template_type} queued for {len(RECIPIENT_EMAILS)} recipients ({queued} envelopes)")
+    except Exception as e:
+        print(f"❌ Email error: {e}")
+        print("⚠️  Data preserved - you can retry sending the email")
+        return False
+    return deliver_digest(f"digest-{TODAY}")
+
+def smtp_pool():
+    """SMTP connection pool for one send run"""
+    return SmtpPool(
+        SMTP_SERVER, SMTP_PORT, SENDER_EMAIL, SENDER_PASSWORD,
+        size=SMTP_POOL_SIZE, max_messages=SMTP_MAX_MESSAGES_PER_CONNECTION, starttls=SMTP_STARTTLS,
+    )
+
+def deliver_outbox():
+    """Send everything due in the outbox, retrying with backoff for up to OUTBOX_DRAIN_SECONDS
+
+    Whatever is still queued afterwards stays in the outbox and is sent by
+    the next run (or `python outbox.py`), without re-rendering.
+    """
+    with smtp_pool() as pool:
+        totals = asyncio.run(OUTBOX.drain(
+            lambda recipients, message: pool.send(SENDER_EMAIL, recipients, message),
+            concurrency=SMTP_POOL_SIZE, max_seconds=OUTBOX_DRAIN_SECONDS,
+        ))
+    counts = OUTBOX.counts()
+    print(f"📤 Outbox: sent {totals['sent']}, retries {totals['retried']}, gave up on {totals['failed']}")
+    if counts.get("pending") and OUTBOX_DURABLE:
+        print(f"⚠️  {counts['pending']} message(s) still queued - they will be retried on the next run")
+    return totals
+
+def deliver_digest(batch):
+    """Send a just-queued digest; True when the week's data can be cleared
+
+    With a durable outbox anything still queued is sent by a later run. When
+    the outbox does not outlive this run, the digest only counts as sent if
+    none of its messages are still waiting, so a failed send keeps the data
+    for the next send instead of losing the week's mail.
+    """
+    deliver_outbox()
+    if OUTBOX_DURABLE:
         return True
+    pending = OUTBOX.counts(batch).get("pending", 0)
+    if pending:
+        print(f"⚠️  {pending} message(s) undelivered and the outbox isn't kept between runs - data preserved")
+        return False
+    return True
+
+def send_personalized_email(html_content, subject):
+    """Queue and send every recipient their own copy of the condensed digest
+
+    The week's digest is rendered once; per recipient only the greeting,
+    section selection and unsubscribe link change (see mailer.py).
+    """
+    from email_template_condensed import PersonalizedDigest
+
+    try:
+        recipients = load_recipients(RECIPIENTS_FILE, RECIPIENT_EMAILS)
+        if not recipients:
+            print("⚠️  No recipients, skipping send")
+            return False
+        if not (UNSUBSCRIBE_URL and UNSUBSCRIBE_SECRET):
+            print("⚠️  UNSUBSCRIBE_URL/UNSUBSCRIBE_SECRET not set - sending without unsubscribe links")
+
+        messages = render_personalized(
+            PersonalizedDigest(html_content), recipients, SENDER_EMAIL, subject,
+            unsubscribe_base=UNSUBSCRIBE_URL, secret=UNSUBSCRIBE_SECRET, workers=EMAIL_RENDER_WORKERS,
+        )
+        queued = OUTBOX.enqueue(f"digest-{TODAY}", (([email], message) for email, message in messages))
+        print(f"📥 Personalized digest queued for {queued} recipients")
     except Exception as e:
         print(f"❌ Email error: {e}")
         print("⚠️  Data preserved - you can retry sending the email")
         return False
+    return deliver_digest(f"digest-{TODAY}")
 
 # ---------------------- MAIN ----------------------
 def main():
@@ -623,6 +877,12 @@ def main():
     
     # Load state
     state = load_or_create_state()
+    backfill_opportunity_store()
+    
+    # Retry mail a previous run queued but couldn't deliver
+    if OUTBOX.next_due() is not None and SENDER_EMAIL and SENDER_PASSWORD:
+        print("\n📬 Sending messages left in the outbox...")
+        deliver_outbox()
     
     # Track new data from today's scrape (empty if skipped)
     grants_data = []
@@ -638,43 +898,43 @@ def main():
     else:
         # Scrape new data
         print("\n🔍 Scraping new data...")
-        grants_data = run_section(GRANT_KEYWORDS, future=True, section_type="grants")
-        events_data = run_section(EVENT_KEYWORDS, future=True, section_type="events")
-        csr_data = run_section(CSR_KEYWORDS, future=False)
+        # Section rows are accumulated to their CSVs (with deduplication)
+        # keyword by keyword, so a crash only loses the keyword in progress
+        checkpoint = load_checkpoint()
+        grants_data = run_section(GRANT_KEYWORDS, future=True, section_type="grants",
+                                  csv_name="grants.csv", checkpoint=checkpoint)
+        events_data = run_section(EVENT_KEYWORDS, future=True, section_type="events",
+                                  csv_name="events.csv", checkpoint=checkpoint)
+        csr_data = run_section(CSR_KEYWORDS, future=False,
+                               csv_name="csr_reports.csv", checkpoint=checkpoint)
         experts_data = run_experts(EXPERT_QUERIES)
-        
-        # Accumulate to CSV files (with deduplication)
-        write_csv("grants.csv", grants_data)
-        write_csv("events.csv", events_data)
-        write_csv("csr_reports.csv", csr_data)
         write_csv("experts.csv", experts_data)
+        # Apply held-back updates so the committed/published CSVs are current
+        for name in SECTION_NAMES:
+            compact_section(name, OUTPUT_FOLDER)
         
         print(f"\n✅ CSVs saved to: {OUTPUT_FOLDER.resolve()}")
         
         # Update state with last scrape date
         state['last_scrape_date'] = str(TODAY)
         save_state(state)
+        clear_checkpoint()
     
-    # Load accumulated data for email (all data from the week)
-    grants_df = pd.read_csv(OUTPUT_FOLDER / "grants.csv") if (OUTPUT_FOLDER / "grants.csv").exists() else pd.DataFrame()
-    events_df = pd.read_csv(OUTPUT_FOLDER / "events.csv") if (OUTPUT_FOLDER / "events.csv").exists() else pd.DataFrame()
-    csr_df = pd.read_csv(OUTPUT_FOLDER / "csr_reports.csv") if (OUTPUT_FOLDER / "csr_reports.csv").exists() else pd.DataFrame()
-    experts_df = pd.read_csv(OUTPUT_FOLDER / "experts.csv") if (OUTPUT_FOLDER / "experts.csv").exists() else pd.DataFrame()
-    
-    # Convert back to list of dicts for email function
-    all_grants = grants_df.to_dict('records') if not grants_df.empty else []
-    all_events = events_df.to_dict('records') if not events_df.empty else []
-    all_csr = csr_df.to_dict('records') if not csr_df.empty else []
-    all_experts = experts_df.to_dict('records') if not experts_df.empty else []
+    # Load accumulated data for email (everything scraped since the week started)
+    week_start = state.get('week_start_date') or str(TODAY)
+    week = SectionBundle.from_frames({
+        name: OPPORTUNITY_STORE.weekly_digest(name, since=week_start) for name in SECTION_NAMES
+    })
     
     # Send email (only on Monday, and only if not already sent today)
     if state.get('last_email_sent') == str(TODAY):
         print(f"⏭️  Email already sent today ({TODAY}), skipping")
         email_sent = False
     else:
-        email_sent = send_email(all_grants, all_events, all_csr, all_experts, use_condensed=USE_CONDENSED_EMAIL)
+        email_sent = send_email(week, use_condensed=USE_CONDENSED_EMAIL)
     
-    # Clear data if email was successfully sent
+    # Start a new week if email was successfully sent. The CSVs are this
+    # week's export only; the full history stays in the opportunity store.
     if email_sent:
         print("\n🗑️  Clearing weekly data for fresh start...")
         clear_weekly_data()
@@ -685,10 +945,11 @@ def main():
     # Display summary
     pd.set_option("display.max_colwidth", 120)
     print("\n===== 📊 WEEKLY TOTALS =====")
-    print(f"📧 Grants: {len(all_grants)}")
-    print(f"🎤 Events: {len(all_events)}")
-    print(f"🏢 CSR Reports: {len(all_csr)}")
-    print(f"👥 Experts: {len(all_experts)}")
+    print(f"📧 Grants: {len(week.grants)}")
+    print(f"🎤 Events: {len(week.events)}")
+    print(f"🏢 CSR Reports: {len(week.csr_reports)}")
+    print(f"👥 Experts: {len(week.experts)}")
+    print(f"⏰ Grants due in the next 30 days: {len(OPPORTUNITY_STORE.due_within('grants', 30, today=TODAY))}")
     
     if grants_data:
         print("\n===== 🌍 NEW GRANTS (Today) =====")
@@ -703,5 +964,25 @@ def main():
         print("\n===== 👥 NEW EXPERTS (Today) =====")
         print(pd.DataFrame(experts_data).to_string())
 
+    print("\n===== 🔎 SEARCH STATS =====")
+    # Only remote backends use the cache; replay runs never create its file
+    if SEARCH_BACKEND.remote:
+        cache_stats = SEARCH_CACHE.stats()
+        print(f"Hits: {cache_stats['hits']}  Misses: {cache_stats['misses']}  "
+              f"Hit rate: {cache_stats['hit_rate']:.0%}  Cached queries: {cache_stats['entries']}")
+    search_stats = SEARCH_METRICS.summary()
+    if search_stats['queries']:
+        print(f"Network searches: {search_stats['queries']}  Attempts: {search_stats['attempts']}  "
+              f"Retries: {search_stats['retries']}  Failed: {search_stats['failures']}  "
+              f"Mean latency: {search_stats['mean_latency']:.2f}s  Max: {search_stats['max_latency']:.2f}s")
+    date_stats = fuzzy_parse_stats()
+    print(f"Date parses: {date_stats['hits'] + date_stats['misses']}  "
+          f"Cache hit rate: {date_stats['hit_rate']:.0%}  Distinct dates: {date_stats['entries']}")
+    SEARCH_BACKEND.close()
+    SEARCH_CACHE.close()
+    OPPORTUNITY_STORE.close()
+    OUTBOX.purge(older_than_days=OUTBOX_KEEP_DAYS)
+    OUTBOX.close()
+
 if __name__ == "__main__":
     main()
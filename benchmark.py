@@ -0,0 +1,493 @@
+#!/usr/bin/env python3
+"""
+Offline benchmarks for the newsletter pipeline
+Runs the CPU-side code paths against local data only (no network), so timings
+are deterministic and can be compared between changes
+"""
+
+import argparse
+import contextlib
+import cProfile
+import io
+import json
+import multiprocessing
+import pstats
+import resource
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import pandas as pd
+
+WEEKLY_DATA_DIR = Path("weekly_data")
+
+
+def _timed(fn, repeat):
+    """Run fn repeat times with stdout silenced; return (best seconds, last result)"""
+    best = None
+    result = None
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            result = fn()
+            elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def build_replay_fixture(path, keywords, expert_queries, scale=1):
+    """Write a JSONL replay file whose results come from the weekly_data CSVs
+
+    Each keyword (repeated `scale` times with a numeric suffix) is answered
+    with a rotating slice of real scraped rows, so the filters see realistic
+    titles, snippets and URLs.
+    """
+    def load(name):
+        csv_path = WEEKLY_DATA_DIR / name
+        return pd.read_csv(csv_path).fillna("—") if csv_path.exists() else pd.DataFrame()
+
+    items = []
+    for name in ["grants.csv", "events.csv", "csr_reports.csv"]:
+        df = load(name)
+        for _, row in df.iterrows():
+            items.append({
+                "title": str(row.get("Title", "")),
+                "link": str(row.get("URL", "")),
+                "snippet": str(row.get("Description", "")),
+            })
+    people = []
+    experts_df = load("experts.csv")
+    for _, row in experts_df.iterrows():
+        people.append({
+            "title": f"{row.get('Name', '')} - {row.get('Role', '')}",
+            "link": str(row.get("LinkedIn", "")),
+            "snippet": f"Climate leader at {row.get('Organization', '')}.",
+        })
+    if not items:
+        raise SystemExit("❌ No CSV data in weekly_data/ to build a replay fixture from")
+
+    with open(path, "w", encoding="utf-8") as f:
+        for i, query in enumerate(scaled_queries(keywords, scale)):
+            results = [items[(i * 8 + j) % len(items)] for j in range(8)]
+            f.write(json.dumps({"query": query, "results": results}, ensure_ascii=False) + "\n")
+        for i, query in enumerate(scaled_queries(expert_queries, scale)):
+            results = [people[(i * 12 + j) % len(people)] for j in range(12)] if people else []
+            f.write(json.dumps({"query": query, "results": results}, ensure_ascii=False) + "\n")
+
+
+def scaled_queries(queries, scale):
+    """Return queries repeated `scale` times, each copy made unique"""
+    if scale <= 1:
+        return list(queries)
+    return [f"{q} #{n}" for n in range(scale) for q in queries]
+
+
+def bench_pipeline(args):
+    """Time run_section/run_experts end to end against a replay backend"""
+    import automated_newsletter as an
+    from search_client import ReplayBackend
+
+    all_keywords = an.GRANT_KEYWORDS + an.EVENT_KEYWORDS + an.CSR_KEYWORDS
+    replay_path = args.replay
+    if not replay_path:
+        replay_path = Path(tempfile.mkdtemp()) / "replay.jsonl"
+        build_replay_fixture(replay_path, all_keywords, an.EXPERT_QUERIES, scale=args.scale)
+    backend = ReplayBackend(replay_path)
+
+    sections = [
+        ("grants", lambda: an.run_section(scaled_queries(an.GRANT_KEYWORDS, args.scale), future=True,
+                                          section_type="grants", backend=backend)),
+        ("events", lambda: an.run_section(scaled_queries(an.EVENT_KEYWORDS, args.scale), future=True,
+                                          section_type="events", backend=backend)),
+        ("csr", lambda: an.run_section(scaled_queries(an.CSR_KEYWORDS, args.scale), future=False,
+                                       backend=backend)),
+        ("experts", lambda: an.run_experts(scaled_queries(an.EXPERT_QUERIES, args.scale), backend=backend)),
+    ]
+
+    print(f"📦 Replay fixture: {replay_path}")
+    print(f"🔁 Best of {args.repeat} run(s), keyword scale x{args.scale}\n")
+    profiler = cProfile.Profile() if args.profile else None
+    total = 0.0
+    for name, fn in sections:
+        if profiler:
+            profiler.enable()
+        elapsed, rows = _timed(fn, args.repeat)
+        if profiler:
+            profiler.disable()
+        total += elapsed
+        print(f"   {name:<8} {elapsed * 1000:9.2f} ms  ({len(rows)} rows)")
+    print(f"   {'total':<8} {total * 1000:9.2f} ms")
+
+    if profiler:
+        print()
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(20)
+
+
+def synthetic_week(rows):
+    """{section name: DataFrame} with `rows` rows in total, shaped like the store's digest"""
+    from data_store import SECTION_COLUMNS, SECTION_NAMES
+
+    per_section = rows // len(SECTION_NAMES)
+    frames = {}
+    for name in SECTION_NAMES:
+        data = {}
+        for column in SECTION_COLUMNS[name]:
+            if column == "Parsed Date":
+                data[column] = pd.date_range("2026-01-05", periods=per_section, freq="h")
+            else:
+                data[column] = [f"{column} {name} {i}" for i in range(per_section)]
+        frames[name] = pd.DataFrame(data)
+    return frames
+
+
+def _handoff_records(frames):
+    """The old main() → send_email() path: DataFrame → records → DataFrame + rename"""
+    records = {name: df.to_dict('records') for name, df in frames.items()}
+    rebuilt = {}
+    for name, rows in records.items():
+        df = pd.DataFrame(rows) if rows else pd.DataFrame()
+        if name != "experts" and not df.empty:
+            df = df.rename(columns={'Organization': 'Domain'})
+        rebuilt[name] = df
+    return rebuilt
+
+
+def _week_worker(variant, rows, queue):
+    """Run one handoff variant in a fresh process and report its time and peak RSS"""
+    from data_store import SectionBundle
+    from email_template_condensed import generate_condensed_email_html
+
+    frames = synthetic_week(rows)
+    baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        if variant == "records":
+            sections = SectionBundle(**_handoff_records(frames))
+        else:
+            sections = SectionBundle.from_frames(frames)
+        html = generate_condensed_email_html(sections)
+        elapsed = time.perf_counter() - start
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    queue.put((elapsed, baseline_kb, peak_kb, len(html)))
+
+
+def bench_week(args):
+    """Compare the records round trip with passing a SectionBundle on a synthetic week"""
+    ctx = multiprocessing.get_context("spawn")
+    print(f"🗓️  Synthetic week: {args.rows:,} rows, main() → send_email() → condensed email\n")
+    print(f"   {'variant':<8} {'time':>10}  {'peak RSS':>10}  {'over data':>10}")
+    for variant in ("records", "bundle"):
+        queue = ctx.Queue()
+        worker = ctx.Process(target=_week_worker, args=(variant, args.rows, queue))
+        worker.start()
+        elapsed, baseline_kb, peak_kb, _ = queue.get()
+        worker.join()
+        print(f"   {variant:<8} {elapsed * 1000:7.1f} ms  {peak_kb / 1024:7.1f} MB  "
+              f"{(peak_kb - baseline_kb) / 1024:7.1f} MB")
+
+
+def _grown(df, rows):
+    """df's rows repeated until there are `rows` of them"""
+    if df.empty:
+        return df
+    return pd.concat([df] * (rows // len(df) + 1), ignore_index=True).head(rows)
+
+
+def _iterrows_access(df):
+    """What the card loops used to pay per row: a Series from iterrows() and a .get() per field"""
+    for _, row in df.iterrows():
+        for column in df.columns:
+            row.get(column, '')
+
+
+def bench_render(args):
+    """Time full-report card rendering on large sections built from weekly_data"""
+    import web_report_generator as wrg
+    from data_store import get_sections
+
+    sections = get_sections(WEEKLY_DATA_DIR)
+    renderers = [
+        ("experts", wrg._experts_section, sections.experts),
+        ("grants", wrg._grants_section, sections.grants),
+        ("events", wrg._events_section, sections.events),
+        ("csr", wrg._csr_section, sections.csr_reports),
+    ]
+
+    print(f"🃏 {args.rows:,} cards per section, best of {args.repeat} run(s)\n")
+    print(f"   {'section':<8} {'render':>10}  {'html':>8}  {'iterrows() access alone':>24}")
+    for name, render, df in renderers:
+        df = _grown(df, args.rows)
+        if df.empty:
+            print(f"   {name:<8} (no weekly_data rows to build from)")
+            continue
+        elapsed, html = _timed(lambda: "".join(render(df)), args.repeat)
+        access, _ = _timed(lambda: _iterrows_access(df), args.repeat)
+        print(f"   {name:<8} {elapsed * 1000:7.1f} ms  {len(html) / 1e6:5.1f} MB  {access * 1000:21.1f} ms")
+
+
+def bench_recipients(args):
+    """Time personalized digest rendering for many recipients"""
+    from data_store import SECTION_NAMES, get_sections
+    from email_template_condensed import PersonalizedDigest, generate_condensed_email_html
+    from mailer import Recipient, render_personalized
+
+    sections = get_sections(WEEKLY_DATA_DIR)
+    with contextlib.redirect_stdout(io.StringIO()):
+        html = generate_condensed_email_html(sections)
+    recipients = [
+        Recipient(f"reader{i}@example.org", f"Reader {i}", None if i % 3 else tuple(SECTION_NAMES[:2]))
+        for i in range(args.count)
+    ]
+
+    # Baseline: what re-running the whole template per recipient would cost
+    sample = min(args.count, 200)
+    per_render, _ = _timed(lambda: [generate_condensed_email_html(sections) for _ in range(sample)], 1)
+    print(f"✉️  {args.count:,} recipients, personalized condensed digest\n")
+    print(f"   {'full re-render (est.)':<24} {per_render / sample * args.count * 1000:9.1f} ms  (HTML only)")
+
+    start = time.perf_counter()
+    digest = PersonalizedDigest(html)
+    size = sum(len(message) for _, message in render_personalized(
+        digest, recipients, "digest@example.org", "🌍 Climate Cardinals Newsletter - Weekly Digest",
+        unsubscribe_base="https://example.org/unsubscribe", secret="benchmark", workers=args.workers,
+    ))
+    elapsed = time.perf_counter() - start
+    print(f"   {f'personalized, {args.workers} worker(s)':<24} {elapsed * 1000:9.1f} ms  "
+          f"(HTML + MIME, {size / 1e6:.0f} MB of messages)")
+
+
+class _SinkHandler(socketserver.StreamRequestHandler):
+    """Minimal SMTP server that accepts and discards mail, replying after a delay"""
+
+    def reply(self, line):
+        time.sleep(self.server.latency)
+        self.wfile.write(line + b"\r\n")
+
+    def handle(self):
+        self.server.sessions += 1
+        self.reply(b"220 sink")
+        for line in self.rfile:
+            command = line[:4].upper()
+            if command == b"EHLO":
+                self.reply(b"250-sink\r\n250 8BITMIME")
+            elif command == b"DATA":
+                self.reply(b"354 go ahead")
+                for body_line in self.rfile:
+                    if body_line == b".\r\n":
+                        break
+                self.server.messages += 1
+                self.reply(b"250 queued")
+            elif command == b"QUIT":
+                self.reply(b"221 bye")
+                return
+            else:
+                self.reply(b"250 ok")
+
+
+def bench_smtp(args):
+    """Time delivery to a local SMTP sink: one session per send vs SmtpPool"""
+    from mailer import SmtpPool
+
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _SinkHandler)
+    server.daemon_threads = True
+    server.latency = args.latency / 1000
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address
+    message = "Subject: benchmark\r\n\r\n" + "x" * 20_000 + "\r\n"
+    recipients = [f"reader{i}@example.org" for i in range(args.count)]
+
+    def per_send():
+        for email in recipients:
+            with SmtpPool(host, port, starttls=False) as pool:
+                pool.send("digest@example.org", [email], message)
+
+    def pooled(size, batch):
+        with SmtpPool(host, port, size=size, starttls=False) as pool:
+            if batch > 1:
+                pool.send_batched("digest@example.org", recipients, message, batch)
+            else:
+                pool.send_all("digest@example.org", (([email], message) for email in recipients))
+
+    print(f"📮 {args.count:,} recipients, local SMTP sink with {args.latency:g} ms per reply\n")
+    variants = [
+        ("session per message", per_send),
+        ("pool of 1", lambda: pooled(1, 1)),
+        (f"pool of {args.pool}", lambda: pooled(args.pool, 1)),
+        (f"pool of {args.pool}, batch {args.batch}", lambda: pooled(args.pool, args.batch)),
+    ]
+    for label, fn in variants:
+        server.sessions = server.messages = 0
+        elapsed, _ = _timed(fn, 1)
+        print(f"   {label:<24} {elapsed * 1000:9.1f} ms  "
+              f"({server.messages} messages, {server.sessions} sessions)")
+    server.shutdown()
+
+
+def bench_urls(args):
+    """Time report-URL resolution for the email against a slow local web server"""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    import requests
+    from url_resolver import UrlResolver
+
+    latency = args.latency / 1000
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *log_args):
+            pass
+
+        def do_HEAD(self):
+            time.sleep(latency)
+            found = self.path.startswith("/weekly_data/")
+            self.send_response(200 if found else 404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    # The hosted report is the last of several candidates, as in the worst case
+    candidates = [f"{base}/report_{i}.html" for i in range(args.candidates - 1)]
+    candidates.append(f"{base}/weekly_data/report.html")
+
+    def serial():
+        for _ in range(args.renders):
+            next((url for url in candidates
+                  if 200 <= requests.head(url, timeout=5).status_code < 400), None)
+
+    resolver = UrlResolver(max_workers=args.candidates)
+
+    def resolved():
+        for _ in range(args.renders):
+            resolver.first_existing(candidates)
+
+    print(f"🔗 {args.renders} renders, {args.candidates} candidate URLs, {args.latency:g} ms per request\n")
+    for label, fn in [("serial requests.head", serial), ("UrlResolver (cold)", resolved),
+                      ("UrlResolver (warm)", resolved)]:
+        elapsed, _ = _timed(fn, 1)
+        print(f"   {label:<22} {elapsed * 1000:9.1f} ms")
+    resolver.close()
+    server.shutdown()
+
+
+def bench_index(args):
+    """Time index.html rebuilds over a large report archive"""
+    import shutil
+    from datetime import datetime, timedelta
+
+    from data_store import SectionBundle, get_sections
+    from report_manifest import MANIFEST_NAME, record_report, report_filename
+    from web_report_generator import generate_full_report_html, update_index_html
+
+    week = get_sections(WEEKLY_DATA_DIR)
+    sections = SectionBundle(*(_grown(df, args.rows) for df in week))
+    with tempfile.TemporaryDirectory() as tmp:
+        first = datetime(2020, 1, 6)
+        template = Path(tmp) / report_filename(first)
+        _timed(lambda: generate_full_report_html(sections, output_dir=tmp, report_datetime=first), 1)
+        for weeks in range(1, args.reports):
+            shutil.copyfile(template, Path(tmp) / report_filename(first + timedelta(weeks=weeks)))
+        (Path(tmp) / MANIFEST_NAME).unlink()
+        size = template.stat().st_size
+
+        print(f"🗂️  index.html over {args.reports:,} reports of {size / 1e6:.1f} MB each\n")
+        backfill, _ = _timed(lambda: update_index_html(tmp), 1)
+        print(f"   {'first run (backfill)':<24} {backfill * 1000:9.1f} ms  (reads every report once)")
+        rebuild, _ = _timed(lambda: update_index_html(tmp), args.repeat)
+        print(f"   {'rebuild from manifest':<24} {rebuild * 1000:9.1f} ms  (no report reads, index unchanged)")
+        rescan, _ = _timed(lambda: update_index_html(tmp, rescan=True), args.repeat)
+        print(f"   {'rebuild with rescan':<24} {rescan * 1000:9.1f} ms  (folder matched against manifest)")
+
+        newest = first + timedelta(weeks=args.reports)
+        add, _ = _timed(lambda: update_index_html(tmp, entries=record_report(
+            tmp, report_filename(newest), newest, sections.counts(), "0" * 64)), 1)
+        print(f"   {'add one report':<24} {add * 1000:9.1f} ms  (manifest entry + index rewrite)")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Offline benchmarks for the newsletter pipeline',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Scrape pipeline against a fixture built from weekly_data/*.csv
+  python benchmark.py pipeline
+
+  # Same, with 10x the keywords and a cProfile breakdown
+  python benchmark.py pipeline --scale 10 --profile
+
+  # Replay results recorded with SEARCH_RECORD_FILE=... python automated_newsletter.py
+  python benchmark.py pipeline --replay recorded.jsonl
+
+  # Section hand-off to the email templates on a 100k-row week (time, peak RSS)
+  python benchmark.py week --rows 100000
+
+  # Full-report card rendering, 50k cards per section
+  python benchmark.py render --rows 50000
+
+  # Personalized digest for 10k recipients across 4 render workers
+  python benchmark.py recipients --count 10000 --workers 4
+
+  # SMTP delivery, 1000 recipients, 5 ms simulated round trip
+  python benchmark.py smtp --count 1000 --latency 5
+
+  # Report-URL probing for the email, 200 ms per request
+  python benchmark.py urls --latency 200
+
+  # index.html rebuild over 500 archived reports
+  python benchmark.py index --reports 500
+        """
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    pipeline = subparsers.add_parser("pipeline", help="search → filter → rows, offline")
+    pipeline.add_argument('--replay', help='JSONL replay file (default: built from weekly_data CSVs)')
+    pipeline.add_argument('--scale', type=int, default=1, help='Multiply keyword lists by this factor')
+    pipeline.add_argument('--repeat', type=int, default=3, help='Runs per section (best time is reported)')
+    pipeline.add_argument('--profile', action='store_true', help='Print a cProfile breakdown')
+    pipeline.set_defaults(func=bench_pipeline)
+
+    week = subparsers.add_parser("week", help="DataFrame hand-off to send_email, synthetic week")
+    week.add_argument('--rows', type=int, default=100_000, help='Total rows across the four sections')
+    week.set_defaults(func=bench_week)
+
+    render = subparsers.add_parser("render", help="full-report card rendering, large sections")
+    render.add_argument('--rows', type=int, default=50_000, help='Cards per section')
+    render.add_argument('--repeat', type=int, default=1, help='Runs per section (best time is reported)')
+    render.set_defaults(func=bench_render)
+
+    recipients = subparsers.add_parser("recipients", help="personalized digest rendering, many recipients")
+    recipients.add_argument('--count', type=int, default=10_000, help='Number of recipients')
+    recipients.add_argument('--workers', type=int, default=1, help='Render worker processes')
+    recipients.set_defaults(func=bench_recipients)
+
+    smtp = subparsers.add_parser("smtp", help="SMTP delivery to a local sink, per-send sessions vs pool")
+    smtp.add_argument('--count', type=int, default=1000, help='Number of recipients')
+    smtp.add_argument('--latency', type=float, default=5, help='Milliseconds before each server reply')
+    smtp.add_argument('--pool', type=int, default=4, help='Pooled connections')
+    smtp.add_argument('--batch', type=int, default=50, help='Recipients per envelope when batching')
+    smtp.set_defaults(func=bench_smtp)
+
+    urls = subparsers.add_parser("urls", help="report-URL probing for the email, serial vs UrlResolver")
+    urls.add_argument('--latency', type=float, default=200, help='Milliseconds per request')
+    urls.add_argument('--candidates', type=int, default=4, help='Candidate URLs per render')
+    urls.add_argument('--renders', type=int, default=5, help='Email renders')
+    urls.set_defaults(func=bench_urls)
+
+    index = subparsers.add_parser("index", help="index.html rebuild over a large report archive")
+    index.add_argument('--reports', type=int, default=500, help='Archived weekly reports')
+    index.add_argument('--rows', type=int, default=200, help='Cards per section in each report')
+    index.add_argument('--repeat', type=int, default=5, help='Timed rebuilds (best is shown)')
+    index.set_defaults(func=bench_index)
+
+    args = parser.parse_args()
+    args.func(args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
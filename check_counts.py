@@ -9,27 +9,24 @@ import re
 from datetime import datetime
 from pathlib import Path
 
-import pandas as pd
 from bs4 import BeautifulSoup
 
+from data_store import SectionBundle, get_sections
 from email_template_condensed import generate_condensed_email_html
 
 OUTPUT_FOLDER = Path("weekly_data")
 REPORT_GLOB = "climate_cardinals_report_*.html"
 
 
-def load_csv_counts() -> dict[str, int]:
-    experts_df = pd.read_csv(OUTPUT_FOLDER / "experts.csv") if (OUTPUT_FOLDER / "experts.csv").exists() else pd.DataFrame()
-    grants_df = pd.read_csv(OUTPUT_FOLDER / "grants.csv") if (OUTPUT_FOLDER / "grants.csv").exists() else pd.DataFrame()
-    events_df = pd.read_csv(OUTPUT_FOLDER / "events.csv") if (OUTPUT_FOLDER / "events.csv").exists() else pd.DataFrame()
-    csr_df = pd.read_csv(OUTPUT_FOLDER / "csr_reports.csv") if (OUTPUT_FOLDER / "csr_reports.csv").exists() else pd.DataFrame()
+def load_csv_counts() -> tuple[dict[str, int], SectionBundle]:
+    sections = get_sections(OUTPUT_FOLDER)
 
     return {
-        "experts": len(experts_df),
-        "grants": len(grants_df),
-        "events": len(events_df),
-        "csr": len(csr_df),
-    }, experts_df, grants_df, events_df, csr_df
+        "experts": len(sections.experts),
+        "grants": len(sections.grants),
+        "events": len(sections.events),
+        "csr": len(sections.csr_reports),
+    }, sections
 
 
 def find_latest_report_file() -> Path | None:
@@ -83,18 +80,12 @@ def parse_index_latest_link(index_path: Path) -> str | None:
     return None
 
 
-def normalize_for_template(df: pd.DataFrame) -> pd.DataFrame:
-    if not df.empty and "Organization" in df.columns:
-        return df.rename(columns={"Organization": "Domain"})
-    return df
-
-
 def main() -> int:
     print("=" * 80)
     print("CONSISTENCY CHECK")
     print("=" * 80)
 
-    csv_counts, experts_df, grants_df, events_df, csr_df = load_csv_counts()
+    csv_counts, sections = load_csv_counts()
     print("\nCSV counts (source of truth):")
     print(f"  Experts: {csv_counts['experts']}")
     print(f"  Grants: {csv_counts['grants']}")
@@ -123,10 +114,7 @@ def main() -> int:
     print(f"  CSR Reports: {report_counts['csr']}")
 
     email_html = generate_condensed_email_html(
-        experts_df,
-        normalize_for_template(grants_df),
-        normalize_for_template(events_df),
-        normalize_for_template(csr_df),
+        sections,
         base_url="",
         report_filename=latest_report.name,
     )
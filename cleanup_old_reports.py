@@ -76,11 +76,11 @@ def cleanup_old_reports(keep=KEEP_RECENT_REPORTS, dry_run=False):
     else:
         print(f"\n✅ No cleanup needed (have {len(html_files)}, keeping {keep})")
     
-    # Update index.html if reports were deleted
+    # Update the manifest and index.html if reports were deleted
     if not dry_run and len(html_files) > keep:
         try:
             from web_report_generator import update_index_html
-            update_index_html(str(WEEKLY_DATA_DIR))
+            update_index_html(str(WEEKLY_DATA_DIR), rescan=True)
             print(f"✅ Updated index.html")
         except Exception as e:
             print(f"⚠️  Could not update index.html: {e}")
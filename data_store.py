@@ -0,0 +1,577 @@
+"""
+Storage helpers for the weekly section CSVs
+Accumulates scraped rows into a CSV without rewriting it on every run: a key
+index kept next to the CSV lets genuinely new rows be appended, while rows for
+keys that already exist wait in a pending file until enough of them pile up to
+be worth one in-place compaction
+
+load_section()/save_section() are the read/write API for whole sections. The
+CSV stays the source of truth; when pyarrow is installed a typed Parquet copy
+is kept next to it so repeated loads skip CSV parsing
+
+OpportunityStore keeps every row ever scraped in SQLite, so the weekly digest
+and "due soon" lists are indexed queries instead of file rewrites
+
+get_section()/get_sections() are the cached, template-schema view used by the
+report and email scripts; SectionBundle carries a week of sections to them
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from datetime import date, timedelta
+from pathlib import Path
+from typing import NamedTuple
+
+import pandas as pd
+
+from date_utils import parse_date_column
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet cache is optional
+    pa = None
+    pq = None
+
+SECTIONS_FOLDER = Path("weekly_data")
+SECTION_NAMES = ["grants", "events", "csr_reports", "experts"]
+DATE_COLUMNS = ["Parsed Date"]
+
+_FINGERPRINT_BYTES = 4096
+
+
+def _fingerprint(path):
+    """Size plus a hash of the last few KB: changes on any append or rewrite
+
+    Unlike mtime it survives a fresh git checkout, so the index stays valid
+    on CI runners.
+    """
+    size = path.stat().st_size
+    with open(path, "rb") as f:
+        f.seek(max(0, size - _FINGERPRINT_BYTES))
+        tail = f.read()
+    return {"size": size, "tail_sha1": hashlib.sha1(tail).hexdigest()}
+
+
+def _key(value):
+    return "" if pd.isna(value) else str(value)
+
+
+class CsvAccumulator:
+    """Accumulate rows into a CSV, deduplicated by key_column (latest row wins)
+
+    Sidecar files next to the CSV:
+      <name>.index.json  header, keys and a fingerprint of the CSV it describes
+      <name>.pending     newer rows for keys the CSV already holds
+
+    add() appends a batch of unseen keys to the CSV, so a daily write costs
+    O(new rows). A batch that updates a known key goes to the pending file
+    whole, and so does every batch after it until the next compaction, which
+    keeps the rows in arrival order. Once more than compact_threshold keys are
+    pending (or new rows bring new columns), or compact() is called, the CSV
+    is rewritten once with the pending rows applied. That gives the same rows
+    in the same order as concatenating everything and dropping duplicates
+    keeping the last row. Until then the CSV lacks the pending rows (plain
+    pd.read_csv readers see the previous version of updated rows; load_section
+    applies them), and every key appears in it exactly once.
+
+    An index whose fingerprint no longer matches the CSV (edited by hand,
+    replaced, deleted) is rebuilt from the CSV's key column.
+    """
+
+    def __init__(self, path, key_column=None, compact_threshold=50, date_columns=()):
+        self.path = Path(path)
+        self.key_column = key_column
+        self.compact_threshold = compact_threshold
+        self.date_columns = list(date_columns)
+        self.index_path = self.path.with_name(self.path.name + ".index.json")
+        self.pending_path = self.path.with_name(self.path.name + ".pending")
+
+    def _read(self, path):
+        df = pd.read_csv(path)
+        for column in self.date_columns:
+            if column in df.columns:
+                df[column] = pd.to_datetime(df[column], errors="coerce")
+        return df
+
+    def _load_index(self):
+        """Return the index for the current CSV, rebuilding it if stale"""
+        if not self.path.exists():
+            return None
+        fingerprint = _fingerprint(self.path)
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+            if index.get("fingerprint") == fingerprint and index.get("key_column") == self.key_column:
+                return index
+        except (json.JSONDecodeError, FileNotFoundError):
+            pass
+
+        try:
+            df = pd.read_csv(self.path)
+        except pd.errors.EmptyDataError:
+            return None
+        index = {
+            "key_column": self.key_column,
+            "columns": list(df.columns),
+            "rows": len(df),
+            "keys": [],
+            "pending_keys": [],
+        }
+        if self.key_column and self.key_column in df.columns:
+            index["keys"] = [_key(v) for v in df[self.key_column]]
+        if self.pending_path.exists() and self.key_column:
+            try:
+                pending = pd.read_csv(self.pending_path, usecols=[self.key_column])
+                index["pending_keys"] = sorted({_key(v) for v in pending[self.key_column]})
+            except (pd.errors.EmptyDataError, ValueError):
+                self.pending_path.unlink()
+        index["fingerprint"] = fingerprint
+        return index
+
+    def _save_index(self, index):
+        index["fingerprint"] = _fingerprint(self.path)
+        tmp_path = self.index_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f)
+        os.replace(tmp_path, self.index_path)
+
+    def _rewrite(self, frames):
+        """Write the deduplicated concatenation of frames as the new CSV"""
+        combined = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+        if self.key_column and self.key_column in combined.columns:
+            combined = combined.drop_duplicates(subset=[self.key_column], keep="last")
+        tmp_path = self.path.with_suffix(".tmp")
+        combined.to_csv(tmp_path, index=False)
+        os.replace(tmp_path, self.path)
+        if self.pending_path.exists():
+            self.pending_path.unlink()
+
+        index = {
+            "key_column": self.key_column,
+            "columns": list(combined.columns),
+            "rows": len(combined),
+            "keys": [],
+            "pending_keys": [],
+        }
+        if self.key_column and self.key_column in combined.columns:
+            index["keys"] = [_key(v) for v in combined[self.key_column]]
+        self._save_index(index)
+        return index
+
+    def compact(self):
+        """Apply pending rows to the CSV now; returns the row count"""
+        index = self._load_index()
+        if index is None:
+            return 0
+        if not self.pending_path.exists():
+            return index["rows"]
+        return self._rewrite([self._read(self.path), self._read(self.pending_path)])["rows"]
+
+    def add(self, new_df):
+        """Accumulate new_df; returns counts of new, updated and total rows"""
+        index = self._load_index()
+        keyed = bool(self.key_column) and self.key_column in new_df.columns
+        if keyed:
+            new_df = new_df.drop_duplicates(subset=[self.key_column], keep="last")
+
+        if index is None:
+            index = self._rewrite([new_df])
+            return {"new": len(new_df), "updated": 0, "total": index["rows"], "compacted": False}
+
+        if not set(new_df.columns) <= set(index["columns"]):
+            # New columns: the header changes, so the file is rewritten anyway
+            frames = [self._read(self.path)]
+            if self.pending_path.exists():
+                frames.append(self._read(self.pending_path))
+            known = set(index["keys"]) if keyed else set()
+            updated = sum(1 for v in new_df[self.key_column] if _key(v) in known) if keyed else 0
+            index = self._rewrite(frames + [new_df])
+            return {"new": len(new_df) - updated, "updated": updated, "total": index["rows"], "compacted": True}
+
+        new_df = new_df.reindex(columns=index["columns"])
+        pending = set(index["pending_keys"])
+        new_keys = [_key(v) for v in new_df[self.key_column]] if keyed else []
+        csv_keys = set(index["keys"])
+        updated = sum(1 for k in new_keys if k in csv_keys or k in pending)
+
+        if updated or pending:
+            # Held back whole (fresh rows too) so compaction replays every
+            # row after the last rewrite in the order it arrived
+            new_df.to_csv(self.pending_path, mode="a", header=not self.pending_path.exists(), index=False)
+            pending.update(new_keys)
+            index["pending_keys"] = sorted(pending)
+        elif not new_df.empty:
+            new_df.to_csv(self.path, mode="a", header=False, index=False)
+            index["rows"] += len(new_df)
+            index["keys"].extend(new_keys)
+
+        compacted = False
+        if len(index["pending_keys"]) > self.compact_threshold:
+            index = self._rewrite([self._read(self.path), self._read(self.pending_path)])
+            compacted = True
+        else:
+            self._save_index(index)
+        total = index["rows"] if compacted else index["rows"] + len(pending - csv_keys)
+        return {"new": len(new_df) - updated, "updated": updated, "total": total, "compacted": compacted}
+
+    def clear(self):
+        """Delete the CSV, its sidecar files and any Parquet copy"""
+        for path in (self.path, self.index_path, self.pending_path, self.path.with_suffix(".parquet")):
+            if path.exists():
+                path.unlink()
+
+
+# ---------------------- SECTION LOAD/SAVE ----------------------
+def _section_paths(name, folder):
+    stem = Path(name).stem  # accepts "grants" or "grants.csv"
+    folder = Path(folder)
+    return folder / f"{stem}.csv", folder / f"{stem}.parquet"
+
+
+def _key_column(columns):
+    if "LinkedIn" in columns:
+        return "LinkedIn"
+    if "URL" in columns:
+        return "URL"
+    return None
+
+
+def _source_fingerprint(csv_path):
+    """Fingerprint of everything a section load reads: the CSV and its pending rows"""
+    store = CsvAccumulator(csv_path)
+    fingerprint = {"csv": _fingerprint(csv_path)}
+    if store.pending_path.exists():
+        fingerprint["pending"] = _fingerprint(store.pending_path)
+    return json.dumps(fingerprint, sort_keys=True).encode("utf-8")
+
+
+def _read_section_csv(csv_path):
+    """Parse a section CSV with pending updates applied and typed date columns"""
+    try:
+        df = pd.read_csv(csv_path)
+    except pd.errors.EmptyDataError:
+        return pd.DataFrame()
+    pending_path = CsvAccumulator(csv_path).pending_path
+    key_column = _key_column(df.columns)
+    if key_column and pending_path.exists():
+        try:
+            df = pd.concat([df, pd.read_csv(pending_path)], ignore_index=True)
+            df = df.drop_duplicates(subset=[key_column], keep="last").reset_index(drop=True)
+        except pd.errors.EmptyDataError:
+            pass
+
+    for column in DATE_COLUMNS:
+        if column in df.columns:
+            df[column] = pd.to_datetime(df[column], errors="coerce")
+    # Rows saved before the parsed-date column existed get it from 'Date Info'
+    if "Date Info" in df.columns:
+        if "Parsed Date" not in df.columns:
+            df["Parsed Date"] = pd.Series(pd.NaT, index=df.index, dtype="datetime64[ns]")
+        missing = df["Parsed Date"].isna()
+        if missing.any():
+            df.loc[missing, "Parsed Date"] = parse_date_column(df.loc[missing, "Date Info"])
+    return df
+
+
+def _write_parquet(df, parquet_path, fingerprint):
+    """Best-effort Parquet cache write; the CSV remains authoritative"""
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        metadata = dict(table.schema.metadata or {})
+        metadata[b"source_fingerprint"] = fingerprint
+        table = table.replace_schema_metadata(metadata)
+        tmp_path = parquet_path.with_suffix(".parquet.tmp")
+        pq.write_table(table, tmp_path)
+        os.replace(tmp_path, parquet_path)
+    except Exception as e:
+        print(f"⚠️  Could not write {parquet_path.name}: {e}")
+
+
+def load_section(name, folder=SECTIONS_FOLDER):
+    """Load one section ("grants", "events", "csr_reports", "experts") as a DataFrame
+
+    Returns an empty DataFrame when the section has no data yet. Pending
+    updates are applied and 'Parsed Date' is a datetime column. With pyarrow
+    installed, the result is cached as <name>.parquet and reused until the
+    CSV (or its pending rows) change.
+    """
+    csv_path, parquet_path = _section_paths(name, folder)
+    if not csv_path.exists():
+        return pd.DataFrame()
+
+    fingerprint = _source_fingerprint(csv_path)
+    if pq is not None and parquet_path.exists():
+        try:
+            metadata = pq.read_schema(parquet_path).metadata or {}
+            if metadata.get(b"source_fingerprint") == fingerprint:
+                return pd.read_parquet(parquet_path)
+        except Exception:
+            pass  # unreadable cache, fall back to the CSV
+
+    df = _read_section_csv(csv_path)
+    if pq is not None and not df.empty:
+        _write_parquet(df, parquet_path, fingerprint)
+    return df
+
+
+def compact_section(name, folder=SECTIONS_FOLDER):
+    """Fold a section's pending rows into its CSV; returns the row count
+
+    Run before the CSVs are committed or published, so readers that parse the
+    CSV directly (rather than through load_section) see the latest rows.
+    """
+    csv_path, _ = _section_paths(name, folder)
+    if not csv_path.exists():
+        return 0
+    try:
+        columns = pd.read_csv(csv_path, nrows=0).columns
+    except pd.errors.EmptyDataError:
+        return 0
+    store = CsvAccumulator(csv_path, key_column=_key_column(columns), date_columns=DATE_COLUMNS)
+    return store.compact()
+
+
+def save_section(name, df, folder=SECTIONS_FOLDER):
+    """Replace a section's contents with df (CSV export, plus Parquet when available)"""
+    csv_path, parquet_path = _section_paths(name, folder)
+    csv_path.parent.mkdir(parents=True, exist_ok=True)
+    store = CsvAccumulator(csv_path)
+    store.clear()
+    tmp_path = csv_path.with_suffix(".tmp")
+    df.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, csv_path)
+    if pq is not None:
+        _write_parquet(df, parquet_path, _source_fingerprint(csv_path))
+
+
+# ---------------------- OPPORTUNITY STORE ----------------------
+# CSV column -> SQL column for each section table
+_OPPORTUNITY_COLUMNS = {
+    "Title": "title",
+    "Organization": "organization",
+    "Description": "description",
+    "Date Info": "date_info",
+    "Deadline": "deadline",
+    "URL": "url",
+    "Parsed Date": "parsed_date",
+    "Scraped": "scraped",
+}
+_EXPERT_COLUMNS = {
+    "Name": "name",
+    "Role": "role",
+    "Organization": "organization",
+    "LinkedIn": "linkedin",
+    "Scraped": "scraped",
+}
+SECTION_COLUMNS = {
+    "grants": _OPPORTUNITY_COLUMNS,
+    "events": _OPPORTUNITY_COLUMNS,
+    "csr_reports": _OPPORTUNITY_COLUMNS,
+    "experts": _EXPERT_COLUMNS,
+}
+SECTION_KEYS = {"grants": "url", "events": "url", "csr_reports": "url", "experts": "linkedin"}
+
+
+def _sql_value(value):
+    """Row value as stored in SQLite: NULL for missing, ISO text for dates"""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.strftime("%Y-%m-%d") if value == value.normalize() else value.isoformat(sep=" ")
+    return str(value)
+
+
+class OpportunityStore:
+    """SQLite history of every scraped row, one table per section
+
+    Each table has a UNIQUE index on its key (URL, or LinkedIn for experts)
+    plus indexes on the Scraped date and, for opportunity sections, the
+    parsed deadline/event date. upsert() inserts new keys and updates known
+    ones in place, so nothing ever has to be rewritten or wiped.
+
+    Every write stamps a row with an increasing sequence number and queries
+    return rows in that order, which matches the row order of the old
+    concat + drop_duplicates(keep="last") CSV accumulation.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            for section, columns in SECTION_COLUMNS.items():
+                key = SECTION_KEYS[section]
+                fields = ",\n".join(
+                    f"{col} TEXT NOT NULL" if col == key else f"{col} TEXT"
+                    for col in columns.values()
+                )
+                self._conn.execute(
+                    f"""CREATE TABLE IF NOT EXISTS {section} (
+                        id INTEGER PRIMARY KEY,
+                        {fields},
+                        first_seen TEXT NOT NULL,
+                        seq INTEGER NOT NULL
+                    )"""
+                )
+                self._conn.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS idx_{section}_{key} ON {section} ({key})")
+                self._conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{section}_scraped ON {section} (scraped)")
+                if "parsed_date" in columns.values():
+                    self._conn.execute(
+                        f"CREATE INDEX IF NOT EXISTS idx_{section}_parsed_date ON {section} (parsed_date)"
+                    )
+            self._conn.commit()
+        return self._conn
+
+    def upsert(self, section, df):
+        """Insert or update df's rows (CSV column names); returns rows written"""
+        columns = SECTION_COLUMNS[section]
+        key = SECTION_KEYS[section]
+        present = [c for c in columns if c in df.columns]
+        sql_columns = [columns[c] for c in present]
+        if key not in sql_columns or df.empty:
+            return 0
+        updates = ", ".join(f"{col} = excluded.{col}" for col in sql_columns if col != key)
+        statement = (
+            f"INSERT INTO {section} ({', '.join(sql_columns)}, first_seen, seq) "
+            f"VALUES ({', '.join('?' for _ in sql_columns)}, ?, ?) "
+            f"ON CONFLICT({key}) DO UPDATE SET {updates}, seq = excluded.seq"
+        )
+        today = date.today().isoformat()
+        key_position = sql_columns.index(key)
+        with self._lock:
+            conn = self._connect()
+            seq = conn.execute(f"SELECT COALESCE(MAX(seq), 0) FROM {section}").fetchone()[0]
+            params = []
+            for values in df[present].itertuples(index=False, name=None):
+                values = [_sql_value(v) for v in values]
+                if values[key_position] is None:
+                    continue
+                seq += 1
+                params.append((*values, today, seq))
+            with conn:
+                conn.executemany(statement, params)
+        return len(params)
+
+    def count(self, section):
+        with self._lock:
+            return self._connect().execute(f"SELECT COUNT(*) FROM {section}").fetchone()[0]
+
+    def _query(self, section, where, params, order="seq"):
+        columns = SECTION_COLUMNS[section]
+        select = ", ".join(columns.values())
+        with self._lock:
+            conn = self._connect()
+            rows = conn.execute(f"SELECT {select} FROM {section} WHERE {where} ORDER BY {order}", params).fetchall()
+        df = pd.DataFrame(rows, columns=list(columns), dtype=object)
+        # Same shape as a section read from CSV: empty text is missing,
+        # parsed dates are datetimes
+        df = df.mask(df.isna() | (df == ""))
+        if "Parsed Date" in df.columns:
+            df["Parsed Date"] = pd.to_datetime(df["Parsed Date"], errors="coerce")
+        return df
+
+    def weekly_digest(self, section, since):
+        """Rows scraped on or after `since` (a date or YYYY-MM-DD string)"""
+        return self._query(section, "scraped >= ?", (str(since),))
+
+    def due_within(self, section, days, today=None):
+        """Rows whose parsed date falls within the next `days` days, soonest first"""
+        today = today or date.today()
+        end = today + timedelta(days=days + 1)
+        return self._query(section, "parsed_date >= ? AND parsed_date < ?",
+                           (today.isoformat(), end.isoformat()), order="parsed_date, seq")
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+# ---------------------- SHARED SECTION LOADER ----------------------
+OPPORTUNITY_SECTIONS = ["grants", "events", "csr_reports"]
+
+_section_cache = {}
+_section_cache_lock = threading.Lock()
+
+
+def normalize_section(name, df):
+    """Template schema: opportunity sections expose 'Organization' as 'Domain'"""
+    if Path(name).stem in OPPORTUNITY_SECTIONS and "Organization" in df.columns:
+        return df.rename(columns={"Organization": "Domain"})
+    return df
+
+
+def _stat_token(path):
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def get_section(name, folder=SECTIONS_FOLDER):
+    """One section in template schema, read from disk at most once per change
+
+    Results are cached for the life of the process and reloaded only when
+    the CSV or its pending rows change (mtime or size). Each caller gets its
+    own shallow copy, so renaming or adding columns never leaks into the cache.
+    """
+    csv_path, _ = _section_paths(name, folder)
+    token = (_stat_token(csv_path), _stat_token(CsvAccumulator(csv_path).pending_path))
+    cache_key = str(csv_path.resolve())
+    with _section_cache_lock:
+        cached = _section_cache.get(cache_key)
+        if cached is None or cached[0] != token:
+            cached = (token, normalize_section(name, load_section(name, folder)))
+            _section_cache[cache_key] = cached
+    return cached[1].copy(deep=False)
+
+
+class SectionBundle(NamedTuple):
+    """One week of section DataFrames in template schema
+
+    This is what the report and email generators take, so the frames loaded
+    from disk or the store reach the templates without any conversion.
+    """
+    grants: pd.DataFrame
+    events: pd.DataFrame
+    csr_reports: pd.DataFrame
+    experts: pd.DataFrame
+
+    @classmethod
+    def from_frames(cls, frames):
+        """Bundle {section name: DataFrame}, normalized; missing sections are empty"""
+        return cls(**{
+            name: normalize_section(name, frames[name] if name in frames else pd.DataFrame())
+            for name in SECTION_NAMES
+        })
+
+    def counts(self):
+        return {name: len(df) for name, df in zip(self._fields, self)}
+
+
+def column_values(df, *names, default=""):
+    """Values of the first of names that df has, as a plain list
+
+    Per row this is row.get(names[0], row.get(names[1], ... default)) on
+    iterrows(), without building a Series per row; rows get default when none
+    of the columns exist.
+    """
+    for name in names:
+        if name in df.columns:
+            return df[name].tolist()
+    return [default] * len(df)
+
+
+def get_sections(folder=SECTIONS_FOLDER):
+    """All four sections as a SectionBundle, see get_section()"""
+    return SectionBundle(**{name: get_section(name, folder) for name in SECTION_NAMES})
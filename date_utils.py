@@ -0,0 +1,278 @@
+"""
+Date helpers shared by the scraper and the report generator
+Pulls deadline/event dates out of search snippets with precompiled patterns and
+normalizes whole section DataFrames (parsed date, countdown text) in one pass
+"""
+
+import re
+from datetime import date, datetime
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+from dateutil import parser
+
+FUZZY_PARSE_CACHE_SIZE = 4096  # Distinct date strings kept by parse_fuzzy_date()
+
+_MONTHS = (
+    r"(January|February|March|April|May|June|July|August|September|October|November|December|"
+    r"Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Sept|Oct|Nov|Dec)"
+)
+
+# "January 15, 2026" or "Jan 15, 2026"
+MONTH_FULL_PATTERN = _MONTHS + r"\.?\s+\d{1,2},?\s*(20\d{2})"
+
+# "15 January 2026" or "15 Jan 2026"
+DAY_MONTH_PATTERN = r"\d{1,2}\s+" + _MONTHS + r"\.?\s*(20\d{2})"
+
+# Deadline keywords followed by the text up to the next '.', ',' or end
+DEADLINE_PATTERNS = [
+    r"(?:deadline|due|submit\s+by|applications?\s+(?:due|close)|closes?|ends?)[:\s]+(.*?)(?:\.|,|$)",
+    r"(?:apply\s+by|applications?\s+accepted\s+until)[:\s]+(.*?)(?:\.|,|$)",
+    r"(?:open\s+until|accepting\s+until)[:\s]+(.*?)(?:\.|,|$)",
+]
+
+ROLLING_PATTERN = r"rolling|ongoing|open\s+until|continuous"
+
+# Anchored versions of the two layouts extract_date_snippet() produces. Month-first
+# dates need whitespace before the year: dateutil reads "Sep 202026" and
+# "Dec 21,2027" differently, so those are left to the dateutil fallback.
+_MONTH_FIRST_DATE = re.compile(
+    r"^(?P<month>[A-Za-z]{3,9})\.?\s+(?P<day>\d{1,2}),?\s+(?P<year>20\d{2})$"
+)
+_DAY_FIRST_DATE = re.compile(
+    r"^(?P<day>\d{1,2})\s+(?P<month>[A-Za-z]{3,9})\.?\s*(?P<year>20\d{2})$"
+)
+_MONTH_NUMBERS = {
+    "january": 1, "february": 2, "march": 3, "april": 4, "may": 5, "june": 6,
+    "july": 7, "august": 8, "september": 9, "october": 10, "november": 11, "december": 12,
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "jun": 6, "jul": 7, "aug": 8,
+    "sep": 9, "sept": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+
+# Characters that re.IGNORECASE folds onto ASCII letters but str.lower() does not
+# (or that change length when lowercased); text containing them takes the
+# case-insensitive path so results never depend on which path ran.
+_CASE_FOLD_EXCEPTIONS = re.compile("[İıſ]")
+
+
+class _PatternSet:
+    """One compiled copy of every date pattern"""
+
+    def __init__(self, flags, transform):
+        self.month_full = re.compile(transform(MONTH_FULL_PATTERN), flags)
+        self.day_month = re.compile(transform(DAY_MONTH_PATTERN), flags)
+        self.deadlines = [re.compile(transform(p), flags) for p in DEADLINE_PATTERNS]
+        self.rolling = re.compile(transform(ROLLING_PATTERN), flags)
+
+
+class DateExtractor:
+    """Find the first usable date in a snippet
+
+    All patterns are compiled once. Case-insensitive month alternations are
+    the slow part of matching, so the patterns are also compiled in lowercase
+    without re.IGNORECASE and run against a lowercased copy of the text; match
+    offsets are then used to slice the original text. Snippets without any 20xx
+    year cannot contain a date and skip straight to the rolling check.
+
+    Priority order (same as the original per-call implementation):
+    1. a date right after a deadline phrase (first phrase that yields one),
+    2. the first "January 15, 2026" style date from min_year onwards,
+    3. the first "15 January 2026" style date from min_year onwards,
+    4. "Rolling / Ongoing" for future items that mention rolling deadlines.
+    """
+
+    def __init__(self, min_year):
+        self.min_year = min_year
+        self.year_pat = re.compile(r"20\d{2}")
+        self._lower = _PatternSet(0, str.lower)
+        self._ignorecase = _PatternSet(re.I, lambda p: p)
+
+    def _is_recent(self, date_text):
+        year_match = self.year_pat.search(date_text)
+        return bool(year_match) and int(year_match.group()) >= self.min_year
+
+    def _find_date(self, text, haystack, pats):
+        """Scan haystack (text or its lowercased copy) and slice the hit from text"""
+        for deadline_pat in pats.deadlines:
+            match = deadline_pat.search(haystack)
+            if match:
+                start, end = match.span(1)
+                date_match = pats.month_full.search(haystack, start, end) or pats.day_month.search(haystack, start, end)
+                if date_match and int(date_match.group(2)) >= self.min_year:
+                    return text[date_match.start():date_match.end()]
+
+        for date_pat in (pats.month_full, pats.day_month):
+            for m in date_pat.finditer(haystack):
+                if self._is_recent(m.group(0)):
+                    return text[m.start():m.end()]
+        return None
+
+    def extract(self, text, future=True):
+        """Return the best date string in text, "Rolling / Ongoing" or "—" """
+        if not text:
+            return "—"
+
+        if text.isascii() or not _CASE_FOLD_EXCEPTIONS.search(text):
+            haystack, pats = text.lower(), self._lower
+        else:
+            haystack, pats = text, self._ignorecase
+
+        # Every date layout needs a 20xx year, so most snippets skip the scan
+        if self.year_pat.search(text):
+            found = self._find_date(text, haystack, pats)
+            if found:
+                return found
+
+        if future and pats.rolling.search(haystack):
+            return "Rolling / Ongoing"
+
+        return "—"
+
+    def extract_many(self, texts, future=True):
+        """Batch version of extract(); repeated texts are only scanned once"""
+        seen = {}
+        out = []
+        for text in texts:
+            if text not in seen:
+                seen[text] = self.extract(text, future=future)
+            out.append(seen[text])
+        return out
+
+
+@lru_cache(maxsize=FUZZY_PARSE_CACHE_SIZE)
+def _cached_fuzzy_parse(text, today):
+    # today is part of the key because dateutil fills missing fields
+    # (e.g. the year of "March 5") from the current date
+    try:
+        return parser.parse(text, fuzzy=True)
+    except Exception:
+        return None
+
+
+def parse_fuzzy_date(text):
+    """Memoized dateutil.parser.parse(text, fuzzy=True); None when unparseable
+
+    Scraped and accumulated date strings repeat heavily across rows, runs and
+    report renders, so results are kept in a bounded LRU cache.
+    """
+    return _cached_fuzzy_parse(text, date.today())
+
+
+def fuzzy_parse_stats():
+    """Hit/miss counters for parse_fuzzy_date() in this process"""
+    info = _cached_fuzzy_parse.cache_info()
+    lookups = info.hits + info.misses
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "hit_rate": info.hits / lookups if lookups else 0.0,
+        "entries": info.currsize,
+    }
+
+
+def _fuzzy_parse(text):
+    """Fuzzy parse as a naive datetime, or None when unparseable"""
+    parsed = parse_fuzzy_date(text)
+    return parsed.replace(tzinfo=None) if parsed else None
+
+
+def parse_date_column(values):
+    """Parse a column of date strings into datetime64 (NaT when unparseable)
+
+    The two layouts the scraper extracts are parsed with vectorized
+    str.extract + to_datetime; anything else falls back to dateutil's fuzzy
+    parser once per distinct value, so results match parsing row by row.
+    """
+    text = pd.Series(values, dtype="object").fillna("").astype(str).str.strip()
+    parsed = pd.Series(pd.NaT, index=text.index, dtype="datetime64[ns]")
+    if text.empty:
+        return parsed
+
+    matched = pd.Series(False, index=text.index)
+    for layout in (_MONTH_FIRST_DATE, _DAY_FIRST_DATE):
+        parts = text[~matched].str.extract(layout)
+        parts["month"] = parts["month"].str.lower().map(_MONTH_NUMBERS)
+        hit = parts["month"].notna()
+        if hit.any():
+            parts = parts[hit]
+            parsed.loc[parts.index] = pd.to_datetime(
+                {"year": parts["year"].astype(int), "month": parts["month"].astype(int),
+                 "day": parts["day"].astype(int)},
+                errors="coerce",
+            )
+            matched.loc[parts.index] = True
+
+    rest = text[~matched & (text != "") & (text != "—")]
+    if not rest.empty:
+        lookup = {value: _fuzzy_parse(value) for value in rest.unique()}
+        parsed.loc[rest.index] = pd.to_datetime(rest.map(lookup), errors="coerce")
+    return parsed
+
+
+def countdown_column(date_info, parsed, now=None):
+    """Vectorized calculate_deadline_text(): "Due in 4 weeks", "Deadline passed", ...
+
+    date_info is the raw date text and parsed its parse_date_column() result.
+    """
+    now = now or datetime.now()
+    text = pd.Series(date_info, dtype="object").fillna("").astype(str)
+    lowered = text.str.lower()
+    days = (parsed - pd.Timestamp(now)).dt.days
+
+    weeks = (days // 7).astype("Int64").astype(str)
+    months = (days // 30).astype("Int64").astype(str)
+    plural_weeks = np.where(days // 7 > 1, "s", "")
+    plural_months = np.where(days // 30 > 1, "s", "")
+
+    conditions = [
+        (text == "") | (text == "—"),
+        lowered.str.contains("rolling", regex=False) | lowered.str.contains("ongoing", regex=False),
+        days.isna(),
+        days < 0,
+        days == 0,
+        days == 1,
+        days < 7,
+        days < 30,
+        days < 365,
+    ]
+    choices = [
+        "—",
+        "Rolling deadline",
+        text,
+        "Deadline passed",
+        "Due today",
+        "Due tomorrow",
+        "Due in " + days.astype("Int64").astype(str) + " days",
+        "Due in " + weeks + " week" + plural_weeks,
+        "Due in " + months + " month" + plural_months,
+    ]
+    conditions = [c.fillna(False).to_numpy(dtype=bool) for c in conditions]
+    return pd.Series(np.select(conditions, choices, default=text), index=text.index, dtype="object")
+
+
+def normalize_section_dates(df, future=True, min_year=None, today=None, now=None):
+    """Date-normalize a section DataFrame in one pass
+
+    Parses 'Date Info' once into a real 'Parsed Date' column and fills
+    'Deadline' with countdown text (future sections) or the raw date text.
+    For future sections, rows dated before min_year or before today are
+    dropped, mirroring the per-row checks the scraper used to run.
+    """
+    now = now or datetime.now()
+    today = today or now.date()
+    out = df.copy()
+    parsed = parse_date_column(out["Date Info"])
+    out["Parsed Date"] = parsed
+
+    if future:
+        date_info = out["Date Info"].fillna("").astype(str)
+        too_old = parsed.dt.year < min_year if min_year else pd.Series(False, index=out.index)
+        dated = (date_info != "—") & (date_info != "Rolling / Ongoing")
+        in_past = dated & (parsed.dt.normalize() < pd.Timestamp(today))
+        keep = ~(too_old.fillna(False) | in_past.fillna(False))
+        out = out[keep]
+        out["Deadline"] = countdown_column(out["Date Info"], out["Parsed Date"], now=now)
+    else:
+        out["Deadline"] = out["Date Info"]
+    return out
@@ -4,24 +4,36 @@ and links to full report for users who want complete data
 """
 
 import pandas as pd
+from html import escape
 from pathlib import Path
 import re
 
-import requests
+from data_store import column_values
+from html_template import load_template
+from report_manifest import REPORTS_DIR, latest_report, load_manifest, published_reports
+from url_resolver import default_resolver
+
+TEMPLATE_PATH = Path(__file__).parent / "email_template_condensed.html"
+# Literal tokens in the template file; "Issue #6" and the date are sample
+# values left in the design and replaced like the others
+TEMPLATE_PLACEHOLDERS = (
+    "Issue #6", "February 06, 2026",
+    "COUNT_EXPERTS", "COUNT_GRANTS", "COUNT_EVENTS", "COUNT_REPORTS",
+    "TOTAL_EXPERTS_COUNT", "TOTAL_GRANTS_COUNT", "TOTAL_EVENTS_COUNT", "TOTAL_CSR_COUNT",
+    "FULL_REPORT_URL", "LATEST_REPORT_URL",
+    "FULL_EXPERTS_URL", "FULL_GRANTS_URL", "FULL_EVENTS_URL", "FULL_CSR_URL",
+)
 
 def _url_exists(url):
     """Return True when URL is reachable, handling servers that disallow HEAD."""
-    try:
-        response = requests.head(url, timeout=5, allow_redirects=True)
-        if response.status_code == 405:
-            response = requests.get(url, timeout=5, allow_redirects=True)
-        return 200 <= response.status_code < 400
-    except Exception:
-        return False
+    return default_resolver().exists(url)
 
 
 def _pick_report_url(base_url, report_filename):
-    """Resolve the best hosted URL for a known report filename."""
+    """Resolve the best hosted URL for a known report filename.
+
+    Candidates are probed concurrently; the first reachable one in order wins.
+    """
     if report_filename.startswith("http://") or report_filename.startswith("https://"):
         return report_filename
 
@@ -37,28 +49,50 @@ def _pick_report_url(base_url, report_filename):
             f"{base_url}/weekly_data/{cleaned}",
         ]
 
-    for candidate in candidates:
-        if _url_exists(candidate):
-            return candidate
-    return None
+    return default_resolver().first_existing(candidates)
+
+
+def _manifest_report_url(base_url, report_filename, explicit, reports_dir):
+    """Hosted URL for the report according to the reports.json manifest, or None
+
+    The reports folder is the published site root, so a recorded report is
+    served at {base_url}/{filename}. The manifest only says the report was
+    generated, not that the weekly deploy has published it yet, so that one
+    URL is still probed; None when it is not live. Without an explicit
+    filename the latest recorded report stands in for a missing one, like
+    the "View Latest Report" button on the index page.
+    """
+    if report_filename.startswith("http://") or report_filename.startswith("https://"):
+        return None
+    entries = load_manifest(reports_dir)
+    name = Path(report_filename).name
+    url = None
+    if any(entry['filename'] == name for entry in entries):
+        url = f"{base_url}/{name}"
+    elif not explicit:
+        latest = latest_report(published_reports(entries))
+        if latest:
+            url = f"{base_url}/{latest['filename']}"
+    return url if url and _url_exists(url) else None
 
 
-def generate_condensed_email_html(experts_df, grants_df, events_df, csr_df, base_url="", report_filename=None):
+def generate_condensed_email_html(sections, base_url="", report_filename=None, reports_dir=REPORTS_DIR):
     """Generate condensed email with top 3 items per section and links to full report
     
     Args:
-        experts_df: DataFrame with expert data
-        grants_df: DataFrame with grant data
-        events_df: DataFrame with event data
-        csr_df: DataFrame with CSR report data
+        sections: data_store.SectionBundle with the experts, grants, events and
+                  csr_reports DataFrames in template schema
         base_url: Base URL for hosted reports (e.g., "https://yourusername.github.io/reports")
                   Leave empty to use local file:// URLs (only works on your computer)
+        reports_dir: Folder with the generated reports and their reports.json
+                     manifest, used to pick the one report URL to probe
     """
+    experts_df, grants_df, events_df, csr_df = (
+        sections.experts, sections.grants, sections.events, sections.csr_reports
+    )
     
-    # Read condensed email template
-    template_path = Path(__file__).parent / "email_template_condensed.html"
-    with open(template_path, 'r', encoding='utf-8') as f:
-        html = f.read()
+    # Condensed email template, parsed once per process
+    template = load_template(TEMPLATE_PATH, TEMPLATE_PLACEHOLDERS)
     
     # Get counts
     experts_count = len(experts_df) if not experts_df.empty else 0
@@ -70,22 +104,6 @@ def generate_condensed_email_html(experts_df, grants_df, events_df, csr_df, base
     week_num = today.isocalendar()[1]
     date_str = today.strftime("%B %d, %Y")
     
-    # Replace date, issue info and counts in stats cards
-    html = html.replace("Issue #6", f"Issue #{week_num}")
-    html = html.replace("February 06, 2026", date_str)
-    
-    # Replace count placeholders in stats grid
-    html = html.replace("COUNT_EXPERTS", str(experts_count))
-    html = html.replace("COUNT_GRANTS", str(grants_count))
-    html = html.replace("COUNT_EVENTS", str(events_count))
-    html = html.replace("COUNT_REPORTS", str(csr_count))
-    
-    # Replace total counts in section headers
-    html = html.replace("TOTAL_EXPERTS_COUNT", str(experts_count))
-    html = html.replace("TOTAL_GRANTS_COUNT", str(grants_count))
-    html = html.replace("TOTAL_EVENTS_COUNT", str(events_count))
-    html = html.replace("TOTAL_CSR_COUNT", str(csr_count))
-    
     # Generate report URL based on hosting configuration
     explicit_report_filename = bool(report_filename)
     report_filename = report_filename or f"climate_cardinals_report_{today.strftime('%Y%m%d')}.html"
@@ -95,7 +113,13 @@ def generate_condensed_email_html(experts_df, grants_df, events_df, csr_df, base
         # never 404s. Section links point to an explicit report file when known.
         base_url = base_url.rstrip('/')
         report_url = f"{base_url}/index.html"
-        section_base = _pick_report_url(base_url, report_filename)
+        # Reports this project generated are in the manifest, which narrows
+        # the probe to one URL; the candidate list is the fallback when that
+        # report isn't deployed yet or was never recorded
+        section_base = (
+            _manifest_report_url(base_url, report_filename, explicit_report_filename, reports_dir)
+            or _pick_report_url(base_url, report_filename)
+        )
 
         # If no explicit report was provided and hosted file probing fails,
         # discover the most recent report from index pages as a fallback.
@@ -104,19 +128,15 @@ def generate_condensed_email_html(experts_df, grants_df, events_df, csr_df, base
                 f"{base_url}/index.html",
                 f"{base_url}/weekly_data/index.html",
             ]
-            for idx_url in index_candidates:
-                try:
-                    idx_html = requests.get(idx_url, timeout=8).text
-                    match = re.search(r'href="([^"]*climate_cardinals_report_[0-9]{8}\.html)"', idx_html)
-                    if match:
-                        href = match.group(1).strip()
-                        if href.startswith("http://") or href.startswith("https://"):
-                            section_base = href
-                        else:
-                            section_base = f"{base_url}/{href.lstrip('/')}"
-                        break
-                except Exception:
-                    continue
+            for idx_html in default_resolver().fetch_pages(index_candidates):
+                match = re.search(r'href="([^"]*climate_cardinals_report_[0-9]{8}\.html)"', idx_html or "")
+                if match:
+                    href = match.group(1).strip()
+                    if href.startswith("http://") or href.startswith("https://"):
+                        section_base = href
+                    else:
+                        section_base = f"{base_url}/{href.lstrip('/')}"
+                    break
 
         # For explicit report filenames, avoid old-week redirects by falling
         # back to index if the target file is not live yet.
@@ -145,23 +165,93 @@ def generate_condensed_email_html(experts_df, grants_df, events_df, csr_df, base
         print(f"   2. Replace YOUR_USERNAME/YOUR_REPO with your actual repo")
         print(f"   OR setup Netlify and add WEB_REPORT_BASE_URL to .env")
     
-    # Replace all URL placeholders with the actual report URL(s)
-    # FULL_REPORT_URL remains the index page (used for the bottom button)
-    html = html.replace("FULL_REPORT_URL", report_url)
-    # LATEST_REPORT_URL should point to the latest-dated report we selected above
-    latest_url = section_base if 'section_base' in locals() else report_url
-    html = html.replace("LATEST_REPORT_URL", latest_url)
-    # section links may have been computed above, fallback to report_url anchors
-    html = html.replace("FULL_EXPERTS_URL", experts_url if 'experts_url' in locals() else f"{report_url}#experts")
-    html = html.replace("FULL_GRANTS_URL", grants_url if 'grants_url' in locals() else f"{report_url}#grants")
-    html = html.replace("FULL_EVENTS_URL", events_url if 'events_url' in locals() else f"{report_url}#events")
-    html = html.replace("FULL_CSR_URL", csr_url if 'csr_url' in locals() else f"{report_url}#reports")
+    html = template.render({
+        # Date, issue info and counts in stats cards and section headers
+        "Issue #6": f"Issue #{week_num}",
+        "February 06, 2026": date_str,
+        "COUNT_EXPERTS": experts_count,
+        "COUNT_GRANTS": grants_count,
+        "COUNT_EVENTS": events_count,
+        "COUNT_REPORTS": csr_count,
+        "TOTAL_EXPERTS_COUNT": experts_count,
+        "TOTAL_GRANTS_COUNT": grants_count,
+        "TOTAL_EVENTS_COUNT": events_count,
+        "TOTAL_CSR_COUNT": csr_count,
+        # FULL_REPORT_URL remains the index page (used for the bottom button);
+        # LATEST_REPORT_URL points to the latest-dated report selected above
+        "FULL_REPORT_URL": report_url,
+        "LATEST_REPORT_URL": section_base,
+        "FULL_EXPERTS_URL": experts_url,
+        "FULL_GRANTS_URL": grants_url,
+        "FULL_EVENTS_URL": events_url,
+        "FULL_CSR_URL": csr_url,
+    })
     
     # Email now only shows overview with counts and "View Details" buttons
     # No need to generate condensed content - users click through to hosted page
     
     return html
 
+
+# Template comments that open each part of the digest, in document order. The
+# personalized digest is cut at these, so a recipient's copy is a join of the
+# parts they get plus their own greeting and unsubscribe link.
+DIGEST_PARTS = (
+    ("summary", "        <!-- Weekly Summary -->"),
+    ("experts", "        <!-- Climate Experts Section -->"),
+    ("grants", "        <!-- Grants Section -->"),
+    ("events", "        <!-- Events Section -->"),
+    ("csr_reports", "        <!-- ESG Reports Section -->"),
+    ("action", "        <!-- Action Section -->"),
+    ("end", "    </div>\n</body>"),
+)
+
+
+class PersonalizedDigest:
+    """One week's condensed email, rendered once and cut into reusable parts
+
+    render() assembles a recipient's copy from the shared parts: a greeting
+    with their name, only the sections they subscribed to and their own
+    unsubscribe link. Nothing week-level is re-rendered per recipient.
+    """
+
+    def __init__(self, html):
+        bounds = []
+        for name, marker in DIGEST_PARTS:
+            pos = html.find(marker)
+            if pos < 0:
+                raise ValueError(f"Digest HTML has no {name!r} marker: {marker.strip()!r}")
+            bounds.append((name, pos))
+        self.head = html[:bounds[0][1]]
+        self.parts = {
+            name: html[start:end]
+            for (name, start), (_, end) in zip(bounds, bounds[1:])
+        }
+        self.tail = html[bounds[-1][1]:]
+
+    def render(self, name="", sections=None, unsubscribe_url=""):
+        """The digest for one recipient; sections=None means every section"""
+        chunks = [self.head]
+        if name:
+            chunks.append(
+                '        <div style="padding: 25px 30px; font-family: Arial, sans-serif; font-size: 16px; '
+                f'font-weight: 600; color: #192928;">Hi {escape(name)},</div>\n\n'
+            )
+        chunks.append(self.parts["summary"])
+        for section in ("experts", "grants", "events", "csr_reports"):
+            if sections is None or section in sections:
+                chunks.append(self.parts[section])
+        chunks.append(self.parts["action"])
+        if unsubscribe_url:
+            chunks.append(
+                '        <div style="padding: 20px 30px; text-align: center; font-family: Arial, sans-serif; '
+                'font-size: 12px; color: #666666;">Don\'t want these emails? '
+                f'<a href="{escape(unsubscribe_url)}" style="color: #666666;">Unsubscribe</a></div>\n'
+            )
+        chunks.append(self.tail)
+        return "".join(chunks)
+
+
 def generate_condensed_experts_html(experts_df):
     """Generate condensed HTML for top 3 experts"""
     if experts_df.empty:
@@ -171,13 +261,12 @@ def generate_condensed_experts_html(experts_df):
         </div>'''
     
     html = ""
-    for idx, (_, row) in enumerate(experts_df.iterrows()):
-        if idx >= 3:  # Only show top 3
-            break
-            
-        name = row.get('Name', 'Unknown')
-        role = row.get('Role', '')
-        linkedin = row.get('LinkedIn', '')
+    top = experts_df.head(3)  # Only show top 3
+    for name, role, linkedin in zip(
+        column_values(top, 'Name', default='Unknown'),
+        column_values(top, 'Role'),
+        column_values(top, 'LinkedIn'),
+    ):
         
         # Truncate role if too long
         if role and len(role) > 80:
@@ -203,15 +292,15 @@ def generate_condensed_grants_html(grants_df):
         </div>'''
     
     html = ""
-    for idx, (_, row) in enumerate(grants_df.iterrows()):
-        if idx >= 3:  # Only show top 3
-            break
-            
-        title = row.get('Title', 'Untitled')
-        domain = row.get('Domain', row.get('Organization', ''))
-        date_info = row.get('Date Info', '')
-        url = row.get('URL', '')
-        description = row.get('Description', '')
+    top = grants_df.head(3)  # Only show top 3
+    for title, domain, date_info, url, description, scraped in zip(
+        column_values(top, 'Title', default='Untitled'),
+        column_values(top, 'Domain', 'Organization'),
+        column_values(top, 'Date Info'),
+        column_values(top, 'URL'),
+        column_values(top, 'Description'),
+        column_values(top, 'Scraped'),
+    ):
         
         # Truncate title and description for condensed view
         if title and len(title) > 90:
@@ -220,7 +309,6 @@ def generate_condensed_grants_html(grants_df):
             description = description[:117] + "..."
             
         meta_parts = []
-        scraped = row.get('Scraped', '')
         if scraped:
             meta_parts.append(f'🗓️ {scraped}')
         if date_info and date_info != '—':
@@ -249,15 +337,15 @@ def generate_condensed_events_html(events_df):
         </div>'''
     
     html = ""
-    for idx, (_, row) in enumerate(events_df.iterrows()):
-        if idx >= 3:  # Only show top 3
-            break
-            
-        title = row.get('Title', 'Untitled')
-        domain = row.get('Domain', row.get('Organization', ''))
-        date_info = row.get('Date Info', '')
-        url = row.get('URL', '')
-        description = row.get('Description', '')
+    top = events_df.head(3)  # Only show top 3
+    for title, domain, date_info, url, description, scraped in zip(
+        column_values(top, 'Title', default='Untitled'),
+        column_values(top, 'Domain', 'Organization'),
+        column_values(top, 'Date Info'),
+        column_values(top, 'URL'),
+        column_values(top, 'Description'),
+        column_values(top, 'Scraped'),
+    ):
         
         # Truncate title and description for condensed view
         if title and len(title) > 90:
@@ -266,7 +354,6 @@ def generate_condensed_events_html(events_df):
             description = description[:117] + "..."
             
         meta_parts = []
-        scraped = row.get('Scraped', '')
         if scraped:
             meta_parts.append(f'🗓️ {scraped}')
         if date_info and date_info != '—':
@@ -295,15 +382,15 @@ def generate_condensed_csr_html(csr_df):
         </div>'''
     
     html = ""
-    for idx, (_, row) in enumerate(csr_df.iterrows()):
-        if idx >= 3:  # Only show top 3
-            break
-            
-        title = row.get('Title', 'Untitled')
-        domain = row.get('Domain', row.get('Organization', ''))
-        date_info = row.get('Date Info', '')
-        url = row.get('URL', '')
-        description = row.get('Description', '')
+    top = csr_df.head(3)  # Only show top 3
+    for title, domain, date_info, url, description, scraped in zip(
+        column_values(top, 'Title', default='Untitled'),
+        column_values(top, 'Domain', 'Organization'),
+        column_values(top, 'Date Info'),
+        column_values(top, 'URL'),
+        column_values(top, 'Description'),
+        column_values(top, 'Scraped'),
+    ):
         
         # Truncate title and description for condensed view
         if title and len(title) > 90:
@@ -312,7 +399,6 @@ def generate_condensed_csr_html(csr_df):
             description = description[:117] + "..."
             
         meta_parts = []
-        scraped = row.get('Scraped', '')
         if scraped:
             meta_parts.append(f'🗓️ {scraped}')
         if date_info and date_info != '—':
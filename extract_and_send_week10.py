@@ -10,9 +10,10 @@ from pathlib import Path
 from bs4 import BeautifulSoup
 from datetime import datetime
 from dotenv import load_dotenv
-import smtplib
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
+from data_store import SectionBundle
+from mailer import SmtpPool
 
 # Load environment variables
 load_dotenv()
@@ -162,23 +163,14 @@ def send_email_with_data(data):
     # Import email template
     from email_template_condensed import generate_condensed_email_html
     
-    # Prepare data as DataFrames
-    grants_df = pd.DataFrame(data['grants']) if data['grants'] else pd.DataFrame()
-    events_df = pd.DataFrame(data['events']) if data['events'] else pd.DataFrame()
-    csr_df = pd.DataFrame(data['csr_reports']) if data['csr_reports'] else pd.DataFrame()
-    experts_df = pd.DataFrame(data['experts']) if data['experts'] else pd.DataFrame()
-    
-    # Rename Organization to Domain for template compatibility
-    for df in [grants_df, events_df, csr_df]:
-        if not df.empty and 'Organization' in df.columns:
-            df.rename(columns={'Organization': 'Domain'}, inplace=True)
+    # Prepare data as DataFrames in template schema
+    sections = SectionBundle.from_frames({
+        name: pd.DataFrame(rows) if rows else pd.DataFrame() for name, rows in data.items()
+    })
     
     # Generate HTML email
     html_content = generate_condensed_email_html(
-        experts_df, 
-        grants_df, 
-        events_df, 
-        csr_df, 
+        sections,
         base_url=WEB_REPORT_BASE_URL
     )
     
@@ -194,12 +186,9 @@ def send_email_with_data(data):
     try:
         print(f"📤 Connecting to {SMTP_SERVER}:{SMTP_PORT}...")
         
-        with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as server:
-            server.starttls()
-            print("🔐 Authenticating...")
-            server.login(SENDER_EMAIL, SENDER_PASSWORD)
+        with SmtpPool.from_env(size=1) as pool:
             print("📧 Sending email...")
-            server.sendmail(SENDER_EMAIL, [RECIPIENT_EMAIL], msg.as_string())
+            pool.send(SENDER_EMAIL, [RECIPIENT_EMAIL], msg.as_string())
         
         print("\n✅ WEEK 10 EMAIL SENT SUCCESSFULLY!")
         print(f"📧 Sent to: {RECIPIENT_EMAIL}")
@@ -0,0 +1,61 @@
+"""
+Compiled HTML templates for the report, index page and email
+A template is split once into literal segments and placeholder slots, so a
+render is a single join instead of one str.replace pass (and one full copy of
+the document) per placeholder
+"""
+
+import re
+from functools import lru_cache
+from pathlib import Path
+
+
+class CompiledTemplate:
+    """Template text pre-split at its placeholders
+
+    placeholders are literal tokens in the text (e.g. "COUNT_GRANTS"); where
+    two could match at the same position the longest wins. static maps tokens
+    to fixed values, such as a shared stylesheet, that are folded into the
+    literal segments at compile time. Values are inserted verbatim and never
+    re-scanned for placeholders.
+    """
+
+    def __init__(self, text, placeholders, static=None):
+        static = static or {}
+        tokens = sorted(set(placeholders) | set(static), key=len, reverse=True)
+        self.placeholders = frozenset(placeholders) - set(static)
+        self._segments = []
+        self._slots = []
+        literal = []
+        pos = 0
+        matches = re.finditer("|".join(map(re.escape, tokens)), text) if tokens else ()
+        for m in matches:
+            literal.append(text[pos:m.start()])
+            token = m.group()
+            if token in static:
+                literal.append(static[token])
+            else:
+                self._segments.append("".join(literal))
+                self._slots.append(token)
+                literal = []
+            pos = m.end()
+        literal.append(text[pos:])
+        self._segments.append("".join(literal))
+
+    def render(self, values):
+        """Fill every placeholder from values (token -> value) in one join"""
+        parts = [self._segments[0]]
+        for slot, segment in zip(self._slots, self._segments[1:]):
+            parts.append(str(values[slot]))
+            parts.append(segment)
+        return "".join(parts)
+
+
+@lru_cache(maxsize=None)
+def load_template(path, placeholders):
+    """CompiledTemplate for a template file, read and compiled once per process
+
+    placeholders must be hashable (a tuple), since compiled templates are
+    cached by (path, placeholders).
+    """
+    return CompiledTemplate(Path(path).read_text(encoding="utf-8"), placeholders)
@@ -0,0 +1,316 @@
+"""
+Newsletter delivery helpers
+Loads the recipient list (name and section preferences per address), signs
+unsubscribe links, turns one PersonalizedDigest into a ready-to-send message
+per recipient across a pool of worker processes, and delivers messages over
+a small pool of reused, authenticated SMTP connections
+"""
+
+import base64
+import csv
+import hashlib
+import hmac
+import os
+import queue
+import smtplib
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from pathlib import Path
+from typing import NamedTuple
+from urllib.parse import urlencode
+
+from data_store import SECTION_NAMES
+from html_template import CompiledTemplate
+
+BASE64_LINE_LENGTH = 76  # RFC 2045 limit, same as the email package
+
+
+class Recipient(NamedTuple):
+    """One newsletter subscriber; sections=None means every section"""
+    email: str
+    name: str = ""
+    sections: tuple = None
+
+
+def _parse_sections(value):
+    """'grants;events' -> ('grants', 'events'); empty -> None (all sections)"""
+    wanted = [part.strip().lower() for part in (value or "").split(";") if part.strip()]
+    if not wanted:
+        return None
+    unknown = set(wanted) - set(SECTION_NAMES)
+    if unknown:
+        raise ValueError(f"Unknown section(s) {sorted(unknown)}; expected some of {SECTION_NAMES}")
+    return tuple(name for name in SECTION_NAMES if name in wanted)
+
+
+def load_recipients(path="", fallback_emails=()):
+    """Recipients from a CSV with email, name and sections columns
+
+    sections is a ';'-separated subset of SECTION_NAMES (empty = all). Without
+    a file, every address in fallback_emails gets the full digest unnamed.
+    Duplicate addresses keep their first row.
+    """
+    if not path:
+        return [Recipient(email) for email in dict.fromkeys(fallback_emails)]
+
+    recipients = {}
+    with open(Path(path), newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            email = (row.get("email") or "").strip()
+            if email and email.lower() not in recipients:
+                recipients[email.lower()] = Recipient(
+                    email,
+                    (row.get("name") or "").strip(),
+                    _parse_sections(row.get("sections")),
+                )
+    return list(recipients.values())
+
+
+def unsubscribe_token(email, secret):
+    """HMAC of the lowercased address, so unsubscribe links cannot be forged"""
+    return hmac.new(secret.encode(), email.strip().lower().encode(), hashlib.sha256).hexdigest()[:32]
+
+
+def unsubscribe_url(base_url, email, secret):
+    """Signed unsubscribe link for email, or "" when unsubscribing isn't configured"""
+    if not base_url or not secret:
+        return ""
+    query = urlencode({"email": email, "token": unsubscribe_token(email, secret)})
+    return f"{base_url}{'&' if '?' in base_url else '?'}{query}"
+
+
+def compile_message(sender, subject):
+    """Message skeleton with RECIPIENT_ADDRESS and MESSAGE_BODY slots
+
+    The headers and MIME structure are produced once by the email package
+    (subject encoding included), so each recipient only costs a base64
+    encode of their HTML and one join. A fresh boundary is used per skeleton.
+    """
+    msg = MIMEMultipart("alternative", boundary=f"=============={uuid.uuid4().hex}==")
+    msg["Subject"] = subject
+    msg["From"] = sender
+    msg["To"] = "RECIPIENT_ADDRESS"
+    part = MIMEText("", "html", "utf-8")
+    part.set_payload("MESSAGE_BODY")
+    msg.attach(part)
+    return CompiledTemplate(msg.as_string(), ("RECIPIENT_ADDRESS", "MESSAGE_BODY"))
+
+
+def _base64_body(html_content):
+    encoded = base64.b64encode(html_content.encode("utf-8")).decode("ascii")
+    lines = [encoded[i:i + BASE64_LINE_LENGTH] for i in range(0, len(encoded), BASE64_LINE_LENGTH)]
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+def render_message(skeleton, recipient_email, html_content):
+    """One recipient's wire-format message from a compile_message() skeleton"""
+    return skeleton.render({"RECIPIENT_ADDRESS": recipient_email, "MESSAGE_BODY": _base64_body(html_content)})
+
+
+def build_message(sender, recipient_email, subject, html_content):
+    """The wire-format (RFC 5322) message for one recipient"""
+    return render_message(compile_message(sender, subject), recipient_email, html_content)
+
+
+# ---------------------- PERSONALIZED RENDERING ----------------------
+_worker_job = None  # (digest, message skeleton, unsubscribe base URL, secret) in each worker
+
+
+def _init_worker(job):
+    global _worker_job
+    _worker_job = job
+
+
+def _render_recipient(recipient):
+    digest, skeleton, unsubscribe_base, secret = _worker_job
+    html_content = digest.render(
+        name=recipient.name,
+        sections=recipient.sections,
+        unsubscribe_url=unsubscribe_url(unsubscribe_base, recipient.email, secret),
+    )
+    return recipient.email, render_message(skeleton, recipient.email, html_content)
+
+
+def render_personalized(digest, recipients, sender, subject, unsubscribe_base="", secret="", workers=1):
+    """Yield (email, message) for every recipient, in order
+
+    Each copy is assembled from the shared digest parts and MIME-encoded.
+    With workers > 1 that runs in a process pool: every worker receives the
+    digest once (pool initializer) and recipients arrive in chunks, so only
+    the finished messages cross process boundaries.
+    """
+    recipients = list(recipients)
+    job = (digest, compile_message(sender, subject), unsubscribe_base, secret)
+    if workers <= 1 or len(recipients) < 2:
+        _init_worker(job)
+        yield from map(_render_recipient, recipients)
+        return
+
+    chunksize = max(1, len(recipients) // (workers * 8))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(job,)) as pool:
+        yield from pool.map(_render_recipient, recipients, chunksize=chunksize)
+
+
+# ---------------------- SMTP DELIVERY ----------------------
+class SmtpPool:
+    """A few authenticated SMTP connections shared by every send
+
+    Connections are opened lazily (at most size of them), reused across
+    messages and replaced after max_messages sends, since providers cap how
+    much one session may deliver (Gmail: about 100). A connection the server
+    dropped is reopened and the send retried. Use as a context manager, or
+    call close() when done.
+    """
+
+    def __init__(self, host, port, username="", password="", size=1, max_messages=100,
+                 starttls=True, timeout=60, retries=2):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.size = max(1, size)
+        self.max_messages = max(1, max_messages)
+        self.starttls = starttls
+        self.timeout = timeout
+        self.retries = retries
+        # Free slots: None (not connected yet) or [smtp, messages sent on it]
+        self._idle = queue.LifoQueue()
+        for _ in range(self.size):
+            self._idle.put(None)
+        self._open = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, **overrides):
+        """Pool configured from SMTP_* / SENDER_* environment variables"""
+        settings = dict(
+            host=os.getenv("SMTP_SERVER", "smtp.gmail.com"),
+            port=int(os.getenv("SMTP_PORT", "587")),
+            username=os.getenv("SENDER_EMAIL", ""),
+            password=os.getenv("SENDER_PASSWORD", ""),
+            size=int(os.getenv("SMTP_POOL_SIZE", "2")),
+            max_messages=int(os.getenv("SMTP_MAX_MESSAGES_PER_CONNECTION", "100")),
+            starttls=os.getenv("SMTP_STARTTLS", "1") == "1",
+        )
+        settings.update(overrides)
+        return cls(**settings)
+
+    def _connect(self):
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.starttls:
+                server.starttls()
+            if self.username and self.password:
+                server.login(self.username, self.password)
+        except Exception:
+            server.close()
+            raise
+        with self._lock:
+            self._open.append(server)
+        return [server, 0]
+
+    def _discard(self, conn, polite=True):
+        server = conn[0]
+        with self._lock:
+            if server in self._open:
+                self._open.remove(server)
+        try:
+            server.quit() if polite else server.close()
+        except (smtplib.SMTPException, OSError):
+            server.close()
+
+    def send(self, sender, recipients, message):
+        """Send one message to one envelope of recipients
+
+        Returns {address: (code, reply)} for addresses the server refused
+        while accepting the rest, like smtplib's sendmail.
+        """
+        conn = self._idle.get()
+        try:
+            for attempt in range(self.retries + 1):
+                if conn is not None and conn[1] >= self.max_messages:
+                    self._discard(conn)
+                    conn = None
+                if conn is None:
+                    conn = self._connect()
+                try:
+                    refused = conn[0].sendmail(sender, recipients, message)
+                    conn[1] += 1
+                    return refused
+                except smtplib.SMTPServerDisconnected:
+                    self._discard(conn, polite=False)
+                    conn = None
+                    if attempt == self.retries:
+                        raise
+        finally:
+            self._idle.put(conn)
+
+    def send_all(self, sender, envelopes):
+        """Deliver (recipients, message) pairs over the pool's connections
+
+        envelopes may be a generator (e.g. from render_personalized); it is
+        consumed lazily, size messages in flight at most. A rejected envelope
+        doesn't stop the rest: returns (sent, failed), the number of envelopes
+        delivered and {address: error} for everyone who didn't get theirs.
+        Connection and login errors still abort the whole run.
+        """
+        envelopes = iter(envelopes)
+        lock = threading.Lock()
+        sent = 0
+        failed = {}
+        errors = []
+
+        def work():
+            nonlocal sent
+            while not errors:
+                with lock:
+                    envelope = next(envelopes, None)
+                if envelope is None:
+                    return
+                recipients, message = envelope
+                try:
+                    refused = self.send(sender, recipients, message)
+                except (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused, smtplib.SMTPDataError) as e:
+                    with lock:
+                        failed.update((address, str(e)) for address in recipients)
+                    continue
+                except Exception as e:
+                    errors.append(e)
+                    return
+                with lock:
+                    sent += 1
+                    failed.update((address, f"{code} {reply!r}") for address, (code, reply) in refused.items())
+
+        threads = [threading.Thread(target=work, daemon=True) for _ in range(self.size - 1)]
+        for thread in threads:
+            thread.start()
+        work()
+        for thread in threads:
+            thread.join()
+        if errors:
+            raise errors[0]
+        return sent, failed
+
+    def send_batched(self, sender, recipients, message, batch_size=50):
+        """send_all one message to recipients, batch_size addresses per envelope"""
+        recipients = list(recipients)
+        batch_size = max(1, batch_size)
+        return self.send_all(sender, (
+            (recipients[i:i + batch_size], message) for i in range(0, len(recipients), batch_size)
+        ))
+
+    def close(self):
+        """Log out of every open connection"""
+        with self._lock:
+            open_servers = list(self._open)
+        for server in open_servers:
+            self._discard([server, 0])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
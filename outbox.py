@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Durable email outbox
+Rendered messages are queued in SQLite next to the weekly data, then an
+asyncio worker drains the queue over an SmtpPool with per-message retries and
+exponential backoff. A failed send never needs the newsletter re-rendered:
+whatever is still queued goes out on the next drain, whether that is later in
+the same run, the next daily run, or `python outbox.py` by hand
+
+Delivery is at-least-once: a message whose send was interrupted by a crash
+is sent again on the next drain
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import smtplib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from mailer import SmtpPool
+
+PENDING = "pending"
+SENDING = "sending"
+SENT = "sent"
+FAILED = "failed"
+
+
+def is_permanent_error(error):
+    """True for SMTP 5xx replies about this message; anything else is worth retrying"""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(code >= 500 for code, _ in error.recipients.values())
+    if isinstance(error, smtplib.SMTPAuthenticationError):
+        return False  # Credentials can be fixed without re-rendering
+    if isinstance(error, smtplib.SMTPResponseException):
+        return error.smtp_code >= 500
+    return False
+
+
+class Outbox:
+    """SQLite queue of rendered messages with per-message delivery state
+
+    Each row holds one envelope (recipients plus the wire-format message),
+    its status (pending, sending, sent, failed), the attempts made, when it
+    may next be tried and the last error. Rows are keyed by (batch,
+    recipients), so enqueueing the same batch twice does not send twice.
+    """
+
+    def __init__(self, path, max_attempts=10, base_delay=30.0, max_delay=1800.0):
+        self.path = Path(path)
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS outbox (
+                    id INTEGER PRIMARY KEY,
+                    batch TEXT NOT NULL,
+                    recipients TEXT NOT NULL,
+                    message TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    next_attempt REAL NOT NULL,
+                    last_error TEXT,
+                    created REAL NOT NULL,
+                    updated REAL NOT NULL
+                )"""
+            )
+            self._conn.execute(
+                "CREATE UNIQUE INDEX IF NOT EXISTS idx_outbox_envelope ON outbox (batch, recipients)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_outbox_due ON outbox (status, next_attempt)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def enqueue(self, batch, envelopes):
+        """Queue (recipients, message) pairs under a batch name; returns rows added"""
+        now = time.time()
+        params = (
+            (batch, json.dumps(list(recipients)), message, PENDING, now, now, now)
+            for recipients, message in envelopes
+        )
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                before = conn.total_changes
+                conn.executemany(
+                    "INSERT OR IGNORE INTO outbox "
+                    "(batch, recipients, message, status, next_attempt, created, updated) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    params,
+                )
+                return conn.total_changes - before
+
+    def recover(self):
+        """Return rows left 'sending' by an interrupted drain to the queue"""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                return conn.execute(
+                    "UPDATE outbox SET status = ?, updated = ? WHERE status = ?",
+                    (PENDING, time.time(), SENDING),
+                ).rowcount
+
+    def claim(self, limit, now=None):
+        """Mark up to limit due rows as sending; returns (id, recipients, message, attempts)"""
+        now = time.time() if now is None else now
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                rows = conn.execute(
+                    "SELECT id, recipients, message, attempts FROM outbox "
+                    "WHERE status = ? AND next_attempt <= ? ORDER BY next_attempt, id LIMIT ?",
+                    (PENDING, now, limit),
+                ).fetchall()
+                conn.executemany(
+                    "UPDATE outbox SET status = ?, updated = ? WHERE id = ?",
+                    [(SENDING, now, row[0]) for row in rows],
+                )
+        return [(row_id, json.loads(recipients), message, attempts)
+                for row_id, recipients, message, attempts in rows]
+
+    def next_due(self):
+        """Earliest next_attempt among pending rows, or None when nothing is queued"""
+        with self._lock:
+            return self._connect().execute(
+                "SELECT MIN(next_attempt) FROM outbox WHERE status = ?", (PENDING,)
+            ).fetchone()[0]
+
+    def backoff(self, attempts):
+        """Delay before the next try after `attempts` failures (jittered exponential)"""
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (attempts - 1))
+        return ceiling / 2 + random.uniform(0, ceiling / 2)
+
+    def _finish(self, row_id, status, attempts, error=None, delay=0.0):
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "UPDATE outbox SET status = ?, attempts = ?, last_error = ?, "
+                    "next_attempt = ?, updated = ? WHERE id = ?",
+                    (status, attempts, error, now + delay, now, row_id),
+                )
+
+    def mark_sent(self, row_id, attempts, refused=None):
+        """Record a delivered envelope, noting any recipients the server refused"""
+        error = None
+        if refused:
+            error = "; ".join(f"{address}: {code}" for address, (code, _) in refused.items())
+        self._finish(row_id, SENT, attempts, error)
+
+    def mark_failed(self, row_id, attempts, error):
+        """Record a failed attempt: requeue with backoff, or give up when permanent"""
+        if is_permanent_error(error) or attempts >= self.max_attempts:
+            self._finish(row_id, FAILED, attempts, str(error))
+            return False
+        self._finish(row_id, PENDING, attempts, str(error), self.backoff(attempts))
+        return True
+
+    def retry_failed(self):
+        """Queue every failed row again with a fresh attempt count"""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                return conn.execute(
+                    "UPDATE outbox SET status = ?, attempts = 0, next_attempt = ?, updated = ? "
+                    "WHERE status = ?",
+                    (PENDING, time.time(), time.time(), FAILED),
+                ).rowcount
+
+    def counts(self, batch=None):
+        """Rows per status, e.g. {'pending': 3, 'sent': 120}, optionally for one batch"""
+        with self._lock:
+            if batch is None:
+                rows = self._connect().execute(
+                    "SELECT status, COUNT(*) FROM outbox GROUP BY status"
+                ).fetchall()
+            else:
+                rows = self._connect().execute(
+                    "SELECT status, COUNT(*) FROM outbox WHERE batch = ? GROUP BY status", (batch,)
+                ).fetchall()
+        return dict(rows)
+
+    def purge(self, older_than_days=30):
+        """Delete sent and failed rows last touched more than older_than_days ago"""
+        cutoff = time.time() - older_than_days * 86400
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                return conn.execute(
+                    "DELETE FROM outbox WHERE status IN (?, ?) AND updated < ?",
+                    (SENT, FAILED, cutoff),
+                ).rowcount
+
+    async def _deliver(self, row, send, semaphore, totals):
+        row_id, recipients, message, attempts = row
+        async with semaphore:
+            try:
+                refused = await asyncio.to_thread(send, recipients, message)
+            except Exception as e:
+                requeued = self.mark_failed(row_id, attempts + 1, e)
+                totals["retried" if requeued else "failed"] += 1
+                return
+        self.mark_sent(row_id, attempts + 1, refused)
+        totals["sent"] += 1
+
+    async def drain(self, send, concurrency=2, max_seconds=600.0):
+        """Deliver queued messages until the queue is empty or max_seconds pass
+
+        send(recipients, message) does one blocking delivery (e.g. an
+        SmtpPool's send with the sender bound); up to concurrency of them run
+        at once in threads. Messages waiting on backoff are slept for while
+        the deadline allows; the rest stay queued for the next drain.
+        Returns {'sent', 'retried', 'failed'} counts for this drain.
+        """
+        deadline = time.monotonic() + max_seconds
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        totals = {"sent": 0, "retried": 0, "failed": 0}
+        self.recover()
+        while time.monotonic() < deadline:
+            rows = self.claim(limit=max(1, concurrency) * 4)
+            if rows:
+                await asyncio.gather(*(self._deliver(row, send, semaphore, totals) for row in rows))
+                continue
+            next_due = self.next_due()
+            if next_due is None:
+                break
+            wait = next_due - time.time()
+            if wait > deadline - time.monotonic():
+                break
+            await asyncio.sleep(max(0.0, wait))
+        return totals
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def main():
+    # Only the CLI reads .env; automated_newsletter imports this module without python-dotenv
+    from dotenv import load_dotenv
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Send whatever is waiting in the email outbox")
+    parser.add_argument('--path', default=os.getenv("OUTBOX_PATH", "weekly_data/outbox.sqlite"),
+                        help='Outbox database')
+    parser.add_argument('--status', action='store_true', help='Only show queue counts')
+    parser.add_argument('--retry-failed', action='store_true',
+                        help='Queue messages that already gave up again')
+    parser.add_argument('--max-seconds', type=float, default=float(os.getenv("OUTBOX_DRAIN_SECONDS", "600")),
+                        help='Stop draining after this long')
+    args = parser.parse_args()
+
+    outbox = Outbox(args.path, max_attempts=int(os.getenv("OUTBOX_MAX_ATTEMPTS", "10")))
+    if args.retry_failed:
+        print(f"🔁 Requeued {outbox.retry_failed()} failed message(s)")
+    if not args.status:
+        sender = os.getenv("SENDER_EMAIL", "")
+        with SmtpPool.from_env() as pool:
+            totals = asyncio.run(outbox.drain(
+                lambda recipients, message: pool.send(sender, recipients, message),
+                concurrency=pool.size, max_seconds=args.max_seconds,
+            ))
+        print(f"📤 Sent {totals['sent']}, will retry {totals['retried']}, gave up on {totals['failed']}")
+    print(f"📬 Outbox: {outbox.counts() or 'empty'}")
+    outbox.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""
+Manifest of the generated web reports
+web_report_generator records every report it writes in weekly_data/reports.json
+(filename, date, ISO week, section counts, content hash). Since that folder is
+the published site, the manifest gives each report's hosted path, so the email
+only has to check that one URL is live and the index page needs no probing.
+A recorded report is generated, not necessarily deployed: only the weekly
+report workflow publishes the folder
+
+The counts are stored when a report is generated, so choosing the latest
+report never re-reads report HTML; reports older than the manifest have theirs
+read from the stat cards once and saved
+
+The manifest is also the persisted, sorted report list behind index.html:
+record_report()/remove_report() change one entry, and the folder is only
+scanned when the manifest is missing or a rescan is asked for
+"""
+
+import hashlib
+import json
+import os
+import re
+from datetime import datetime
+from pathlib import Path
+
+REPORTS_DIR = Path("weekly_data")
+MANIFEST_NAME = "reports.json"
+MANIFEST_VERSION = 1
+REPORT_GLOB = "climate_cardinals_report_*.html"
+REPORT_FILENAME = re.compile(r'climate_cardinals_report_(\d{8})\.html$')
+STAT_NUMBER = re.compile(rb'<div class="stat-number">(\d+)</div>')
+# Order of the stat cards in the report header
+STAT_SECTIONS = ("experts", "grants", "events", "csr_reports")
+
+
+def report_filename(report_date):
+    """climate_cardinals_report_YYYYMMDD.html for a date or datetime"""
+    return f"climate_cardinals_report_{report_date.strftime('%Y%m%d')}.html"
+
+
+def _scan_report(path):
+    """(sha256, counts) of a report file already on disk, reading it once
+
+    counts come from the header's stat cards; {} when they can't be read, so
+    the file is never parsed again.
+    """
+    try:
+        with open(path, 'rb') as f:
+            content = f.read()
+    except OSError:
+        return None, {}
+    values = STAT_NUMBER.findall(content)[:len(STAT_SECTIONS)]
+    counts = dict(zip(STAT_SECTIONS, map(int, values))) if len(values) == len(STAT_SECTIONS) else {}
+    return hashlib.sha256(content).hexdigest(), counts
+
+
+def make_entry(filename, report_date, counts=None, sha256=None):
+    """Manifest entry for one report; counts maps section name -> cards"""
+    iso_year, iso_week, _ = report_date.isocalendar()
+    return {
+        'filename': filename,
+        'date': report_date.strftime('%Y-%m-%d'),
+        'iso_year': iso_year,
+        'iso_week': iso_week,
+        'counts': dict(counts) if counts is not None else None,
+        'sha256': sha256,
+    }
+
+
+def entry_date(entry):
+    return datetime.fromisoformat(entry['date'])
+
+
+def _sort_key(entry):
+    return (entry['date'], entry['filename'])
+
+
+def _read(path):
+    """Entries in the manifest file, or None when it is missing or unreadable"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return list(data.get('reports', []))
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def save_manifest(entries, output_dir=REPORTS_DIR):
+    """Write the manifest atomically, newest report first
+
+    One report per line: quick to encode, and adding or removing a report
+    changes a single line of the file.
+    """
+    path = Path(output_dir) / MANIFEST_NAME
+    entries = sorted(entries, key=_sort_key, reverse=True)
+    lines = ",\n".join(f"    {json.dumps(entry)}" for entry in entries)
+    reports = f"[\n{lines}\n  ]" if lines else "[]"
+    tmp_path = path.with_suffix(".json.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(f'{{\n  "version": {MANIFEST_VERSION},\n  "reports": {reports}\n}}\n')
+    os.replace(tmp_path, path)
+    return entries
+
+
+def load_manifest(output_dir=REPORTS_DIR, rescan=False):
+    """Manifest entries, newest first
+
+    The folder is scanned when there is no (readable) manifest or rescan is True:
+    entries whose file was deleted are dropped, and reports on disk that
+    predate the manifest are added from their filename and content. Entries
+    recorded without counts get them from their report. Each of those reads
+    a report once; the manifest is only rewritten when something changed.
+    """
+    output_dir = Path(output_dir)
+    entries = _read(output_dir / MANIFEST_NAME)
+    if entries is None:
+        entries, rescan = [], True
+    if not rescan:
+        if all(entry.get('counts') is not None for entry in entries):
+            return entries
+        on_disk = {entry['filename']: output_dir / entry['filename'] for entry in entries}
+    else:
+        on_disk = {path.name: path for path in output_dir.glob(REPORT_GLOB)}
+
+    kept = [entry for entry in entries if entry.get('filename') in on_disk]
+    changed = len(kept) != len(entries)
+    for entry in kept:
+        if entry.get('counts') is None:
+            entry['sha256'], entry['counts'] = _scan_report(on_disk[entry['filename']])
+            changed = True
+    known = {entry['filename'] for entry in kept}
+    for name, path in on_disk.items():
+        match = REPORT_FILENAME.match(name)
+        if name in known or not match:
+            continue
+        try:
+            report_date = datetime.strptime(match.group(1), '%Y%m%d')
+        except ValueError:
+            continue
+        sha256, counts = _scan_report(path)
+        kept.append(make_entry(name, report_date, counts, sha256))
+        changed = True
+
+    if changed:
+        return save_manifest(kept, output_dir)
+    return sorted(kept, key=_sort_key, reverse=True)
+
+
+def record_report(output_dir, filename, report_date, counts, sha256):
+    """Add or replace the manifest entry for a report that was just written
+
+    Returns the updated entries, newest first.
+    """
+    entry = make_entry(filename, report_date, counts, sha256)
+    entries = [e for e in load_manifest(output_dir) if e['filename'] != filename]
+    key = _sort_key(entry)
+    position = next((i for i, e in enumerate(entries) if _sort_key(e) < key), len(entries))
+    entries.insert(position, entry)
+    return save_manifest(entries, output_dir)
+
+
+def remove_report(output_dir, filename):
+    """Drop a deleted report's entry; returns the entries, newest first"""
+    entries = load_manifest(output_dir)
+    kept = [e for e in entries if e['filename'] != filename]
+    if len(kept) == len(entries):
+        return entries
+    return save_manifest(kept, output_dir)
+
+
+def stat_signature(entry):
+    """(sections with cards, total cards) from the recorded counts; (-1, -1) if unknown"""
+    counts = entry.get('counts')
+    if not counts:
+        return (-1, -1)
+    values = list(counts.values())
+    return (sum(1 for v in values if v > 0), sum(values))
+
+
+def published_reports(entries, today=None):
+    """Entries not dated in the future (test files or mistakes), newest first"""
+    today = (today or datetime.now()).strftime('%Y-%m-%d')
+    return [entry for entry in entries if entry['date'] <= today]
+
+
+def _latest_rank(entry):
+    sections_with_cards, total_cards = stat_signature(entry)
+    report_date = entry_date(entry)
+    return (sections_with_cards, 1 if report_date.weekday() == 0 else 0, report_date, total_cards)
+
+
+def latest_report(entries):
+    """The report the "latest" links should point at
+
+    From the newest ISO week, prefer the most complete report (sections with
+    cards), then the canonical Monday issue over same-week reruns, then the
+    newest date and the most cards. One pass over entries, using only the
+    stored counts.
+    """
+    if not entries:
+        return None
+    newest = max(entries, key=_sort_key)
+    newest_week = (newest['iso_year'], newest['iso_week'])
+    return max(
+        (e for e in entries if (e['iso_year'], e['iso_week']) == newest_week),
+        key=_latest_rank,
+    )
@@ -0,0 +1,401 @@
+"""
+Search helpers for the newsletter scraper
+Fans keyword searches out across a small worker pool while a shared token bucket
+keeps the overall request rate polite (backing off when the backend pushes
+back), reuses one DDGS session for the whole run, and caches results on disk so
+reruns on the same day do not hit the network again
+
+Anything with a ``name`` and a ``text(query, max_results)`` method can act as the
+search backend (see SearchBackend); besides live DDGS there is a JSONL replay
+backend so the whole pipeline can run offline against recorded results
+"""
+
+import hashlib
+import json
+import random
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Protocol
+
+from ddgs import DDGS
+from ddgs.exceptions import RatelimitException, TimeoutException
+
+
+class SessionResetError(Exception):
+    """A query failed and its DDGS session was dropped; retrying opens a new one"""
+
+
+def is_retryable_error(error):
+    """True for rate-limit, timeout and session-reset failures that are worth retrying"""
+    if isinstance(error, (RatelimitException, TimeoutException, SessionResetError)):
+        return True
+    message = str(error).lower()
+    return any(marker in message for marker in ("429", "ratelimit", "rate limit", "timed out", "timeout"))
+
+
+class TokenBucket:
+    """Thread-safe token bucket shared by every search worker"""
+
+    def __init__(self, rate, capacity=1):
+        self.rate = rate          # tokens added per second
+        self.capacity = capacity  # maximum burst size
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then consume it"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class AdaptiveRateLimiter(TokenBucket):
+    """Token bucket whose rate follows backend health
+
+    Additive increase after each successful request, multiplicative decrease
+    when the backend rate-limits or times out (AIMD), bounded by min/max rate.
+    """
+
+    def __init__(self, rate, min_rate, max_rate, increase=0.25, decrease=0.5, capacity=1):
+        super().__init__(rate, capacity)
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+
+    def on_success(self):
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def on_throttle(self):
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            # Drop any saved-up burst so the slowdown takes effect immediately
+            self._tokens = min(self._tokens, 0.0)
+
+
+class RetryPolicy:
+    """Exponential backoff with jitter and a retry budget shared by the whole run"""
+
+    def __init__(self, max_attempts=4, base_delay=1.0, max_delay=30.0, budget=20):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget
+        self._lock = threading.Lock()
+
+    def backoff(self, attempt):
+        """Delay before retrying after the given (1-based) failed attempt"""
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return ceiling / 2 + random.uniform(0, ceiling / 2)
+
+    def take_retry(self, attempt):
+        """Reserve one retry from the budget; False once attempts or budget run out"""
+        if attempt >= self.max_attempts:
+            return False
+        with self._lock:
+            if self.budget <= 0:
+                return False
+            self.budget -= 1
+            return True
+
+
+class SearchMetrics:
+    """Per-query attempt counts and latency for the end-of-run report"""
+
+    def __init__(self):
+        self.records = []
+        self._failed = set()
+        self._lock = threading.Lock()
+
+    def record(self, query, attempts, latency, ok):
+        with self._lock:
+            self.records.append({
+                "query": query,
+                "attempts": attempts,
+                "latency": latency,
+                "ok": ok,
+            })
+            if ok:
+                self._failed.discard(query)
+            else:
+                self._failed.add(query)
+
+    def failed(self, query):
+        """True when the latest search for query gave up without results"""
+        with self._lock:
+            return query in self._failed
+
+    def summary(self):
+        with self._lock:
+            records = list(self.records)
+        latencies = sorted(r["latency"] for r in records)
+        return {
+            "queries": len(records),
+            "attempts": sum(r["attempts"] for r in records),
+            "retries": sum(r["attempts"] - 1 for r in records),
+            "failures": sum(1 for r in records if not r["ok"]),
+            "mean_latency": sum(latencies) / len(latencies) if latencies else 0.0,
+            "max_latency": latencies[-1] if latencies else 0.0,
+        }
+
+
+class SearchBackend(Protocol):
+    """What the scraper needs from a search backend
+
+    ``text`` returns a list of {"title", "link", "snippet"} dicts. ``remote``
+    backends go through the cache, rate limiter and retry policy; local ones
+    (replay fixtures) are called directly.
+    """
+
+    name: str
+    remote: bool
+
+    def text(self, query: str, max_results: int = 8) -> list[dict]:
+        ...
+
+
+class DDGSClient:
+    """Long-lived DDGS session shared by every query in a run
+
+    DDGS keeps its engine instances (and their HTTP connection pools) on the
+    instance, so reusing one object avoids a fresh client and TLS handshake per
+    query. If a query fails the session is discarded and SessionResetError is
+    raised, so a broken connection does not poison the rest of the run and the
+    caller's retry (through its rate limiter) runs on a new session.
+    Rate-limit and timeout errors are raised unchanged for the caller's backoff.
+    """
+
+    name = "ddgs"
+    remote = True
+
+    def __init__(self, timeout=5, session_factory=DDGS):
+        self.timeout = timeout
+        self._session_factory = session_factory
+        self._session = None
+        self._lock = threading.Lock()
+
+    def _get_session(self):
+        with self._lock:
+            if self._session is None:
+                self._session = self._session_factory(timeout=self.timeout)
+            return self._session
+
+    def reset(self):
+        """Drop the current session; the next query opens a new one"""
+        with self._lock:
+            self._session = None
+
+    def text(self, query, max_results=8):
+        """Run a text search and return rows with title/link/snippet keys"""
+        try:
+            raw = self._get_session().text(query, max_results=max_results)
+        except Exception as e:
+            if is_retryable_error(e):
+                raise
+            if str(e) == "No results found.":
+                return []
+            self.reset()
+            raise SessionResetError(f"session reset after: {e}") from e
+        return [
+            {
+                "title": r.get("title", ""),
+                "link": r.get("href", ""),
+                "snippet": r.get("body", ""),
+            }
+            for r in raw
+        ]
+
+    def close(self):
+        self.reset()
+
+
+class ReplayBackend:
+    """Serve recorded search results from a JSONL file, with no network access
+
+    Each line is {"query": ..., "results": [{"title", "link", "snippet"}, ...]}.
+    Unknown queries return no results; when a query was recorded more than once
+    the last recording wins.
+    """
+
+    name = "replay"
+    remote = False
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._results = {}
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    self._results[record["query"]] = record["results"]
+
+    def text(self, query, max_results=8):
+        return [dict(r) for r in self._results.get(query, [])[:max_results]]
+
+    def close(self):
+        pass
+
+
+class RecordingBackend:
+    """Wrap another backend and append every response to a JSONL replay file"""
+
+    def __init__(self, inner, path):
+        self.inner = inner
+        self.path = Path(path)
+        self.name = inner.name
+        self.remote = inner.remote
+        self._lock = threading.Lock()
+
+    def text(self, query, max_results=8):
+        results = self.inner.text(query, max_results=max_results)
+        record = {"query": query, "max_results": max_results, "results": results}
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        return results
+
+    def close(self):
+        self.inner.close()
+
+
+class SearchExecutor:
+    """Run searches concurrently with bounded workers and a shared rate limit"""
+
+    def __init__(self, search_fn, max_workers=4, limiter=None):
+        self.search_fn = search_fn
+        self.max_workers = max(1, max_workers)
+        self.limiter = limiter
+
+    def _search(self, query, **kwargs):
+        if self.limiter:
+            self.limiter.acquire()
+        return self.search_fn(query, **kwargs)
+
+    def iter_results(self, queries, **kwargs):
+        """Yield (query, results) pairs in input order as the searches complete.
+
+        Queries not yet started are cancelled when the caller stops iterating,
+        so breaking out early (e.g. a section hit its row cap) does not keep
+        spending searches.
+        """
+        queries = list(queries)
+        pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="search")
+        try:
+            futures = [pool.submit(self._search, q, **kwargs) for q in queries]
+            for query, future in zip(queries, futures):
+                yield query, future.result()
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+class SearchCache:
+    """SQLite-backed search result cache with TTL expiry and LRU eviction
+
+    Entries are content-addressed by (query, max_results, backend) and live in a
+    single database file. Reads refresh an entry's access time; once the cache
+    holds more than max_entries rows the least recently used ones are dropped.
+    """
+
+    def __init__(self, path, ttl_seconds, max_entries=2000):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._conn = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(query, max_results, backend):
+        payload = json.dumps([query, max_results, backend], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _connect(self):
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS search_cache (
+                    key TEXT PRIMARY KEY,
+                    query TEXT NOT NULL,
+                    max_results INTEGER NOT NULL,
+                    backend TEXT NOT NULL,
+                    results TEXT NOT NULL,
+                    created REAL NOT NULL,
+                    accessed REAL NOT NULL
+                )"""
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_search_cache_accessed ON search_cache (accessed)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def get(self, query, max_results, backend):
+        """Return cached results, or None when missing or older than the TTL"""
+        key = self.make_key(query, max_results, backend)
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT results, created FROM search_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl_seconds:
+                if row is not None:
+                    conn.execute("DELETE FROM search_cache WHERE key = ?", (key,))
+                    conn.commit()
+                self.misses += 1
+                return None
+            conn.execute("UPDATE search_cache SET accessed = ? WHERE key = ?", (now, key))
+            conn.commit()
+            self.hits += 1
+            return json.loads(row[0])
+
+    def put(self, query, max_results, backend, results):
+        key = self.make_key(query, max_results, backend)
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO search_cache "
+                "(key, query, max_results, backend, results, created, accessed) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, query, max_results, backend, json.dumps(results, ensure_ascii=False), now, now),
+            )
+            # LRU eviction: keep only the max_entries most recently used rows
+            conn.execute(
+                "DELETE FROM search_cache WHERE key IN ("
+                "SELECT key FROM search_cache ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            conn.commit()
+
+    def stats(self):
+        """Return hit/miss counters for this process plus the stored entry count"""
+        with self._lock:
+            entries = self._connect().execute("SELECT COUNT(*) FROM search_cache").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": entries,
+        }
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
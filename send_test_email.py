@@ -5,13 +5,14 @@ Quick test email sender to columbia@climatecardinals.org
 
 import os
 import sys
-import smtplib
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from datetime import datetime
 from dotenv import load_dotenv
 import pandas as pd
 from pathlib import Path
+from data_store import SectionBundle, get_section
+from mailer import SmtpPool
 from web_report_generator import generate_full_report_html
 
 # Load environment variables
@@ -80,16 +81,15 @@ def send_test_to_columbia(recipient_email=None):
     for name, filepath in data_files.items():
         if filepath.exists():
             try:
-                df = pd.read_csv(filepath)
-                all_data[name] = df.to_dict('records')
-                count = len(df)
+                all_data[name] = get_section(name, weekly_data)
+                count = len(all_data[name])
                 total_items += count
                 print(f"✅ {name}: {count} items")
             except Exception as e:
-                all_data[name] = []
+                all_data[name] = pd.DataFrame()
                 print(f"⚠️  {name}: Error reading ({e})")
         else:
-            all_data[name] = []
+            all_data[name] = pd.DataFrame()
             print(f"⚠️  {name}: Not found")
     
     if total_items == 0:
@@ -101,24 +101,13 @@ def send_test_to_columbia(recipient_email=None):
     try:
         from email_template_condensed import generate_condensed_email_html
         
-        # Prepare data as DataFrames
-        grants_df = pd.DataFrame(all_data.get("grants.csv", [])) if all_data.get("grants.csv") else pd.DataFrame()
-        events_df = pd.DataFrame(all_data.get("events.csv", [])) if all_data.get("events.csv") else pd.DataFrame()
-        csr_df = pd.DataFrame(all_data.get("csr_reports.csv", [])) if all_data.get("csr_reports.csv") else pd.DataFrame()
-        experts_df = pd.DataFrame(all_data.get("experts.csv", [])) if all_data.get("experts.csv") else pd.DataFrame()
-        
-        # Rename Organization to Domain for template compatibility
-        for df in [grants_df, events_df, csr_df]:
-            if not df.empty and 'Organization' in df.columns:
-                df.rename(columns={'Organization': 'Domain'}, inplace=True)
+        # Section DataFrames, already in template schema
+        sections = SectionBundle.from_frames({Path(name).stem: df for name, df in all_data.items()})
         
         # Generate HTML email
-        report_path = generate_full_report_html(experts_df, grants_df, events_df, csr_df)
+        report_path = generate_full_report_html(sections)
         html_content = generate_condensed_email_html(
-            experts_df, 
-            grants_df, 
-            events_df, 
-            csr_df, 
+            sections,
             base_url=WEB_REPORT_BASE_URL,
             report_filename=Path(report_path).name,
         )
@@ -134,12 +123,9 @@ def send_test_to_columbia(recipient_email=None):
         # Send via SMTP
         print(f"📤 Connecting to {SMTP_SERVER}:{SMTP_PORT}...")
         
-        with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as server:
-            server.starttls()
-            print("🔐 Authenticating...")
-            server.login(SENDER_EMAIL, SENDER_PASSWORD)
+        with SmtpPool.from_env(size=1) as pool:
             print("📧 Sending email...")
-            server.sendmail(SENDER_EMAIL, [RECIPIENT_EMAIL], msg.as_string())
+            pool.send(SENDER_EMAIL, [RECIPIENT_EMAIL], msg.as_string())
         
         print("\n✅ TEST EMAIL SENT SUCCESSFULLY!")
         print(f"📧 Sent to: {RECIPIENT_EMAIL}")
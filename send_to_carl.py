@@ -4,13 +4,13 @@ Send test email to carldybwad@climatecardinals.org with week 10 data
 """
 
 import os
-import pandas as pd
 from pathlib import Path
 from datetime import datetime
 from dotenv import load_dotenv
-import smtplib
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
+from data_store import get_sections
+from mailer import SmtpPool
 from web_report_generator import generate_full_report_html
 
 # Load environment variables
@@ -36,32 +36,21 @@ def send_to_carl():
     weekly_data = Path("weekly_data")
     
     try:
-        grants_df = pd.read_csv(weekly_data / "grants.csv") if (weekly_data / "grants.csv").exists() else pd.DataFrame()
-        events_df = pd.read_csv(weekly_data / "events.csv") if (weekly_data / "events.csv").exists() else pd.DataFrame()
-        csr_df = pd.read_csv(weekly_data / "csr_reports.csv") if (weekly_data / "csr_reports.csv").exists() else pd.DataFrame()
-        experts_df = pd.read_csv(weekly_data / "experts.csv") if (weekly_data / "experts.csv").exists() else pd.DataFrame()
-        
-        # Rename Organization to Domain for template compatibility
-        for df in [grants_df, events_df, csr_df]:
-            if not df.empty and 'Organization' in df.columns:
-                df.rename(columns={'Organization': 'Domain'}, inplace=True)
+        sections = get_sections(weekly_data)
         
         print(f"\n📊 Data loaded:")
-        print(f"   - {len(grants_df)} grants")
-        print(f"   - {len(events_df)} events")
-        print(f"   - {len(csr_df)} CSR reports")
-        print(f"   - {len(experts_df)} experts")
+        print(f"   - {len(sections.grants)} grants")
+        print(f"   - {len(sections.events)} events")
+        print(f"   - {len(sections.csr_reports)} CSR reports")
+        print(f"   - {len(sections.experts)} experts")
         
         # Import email template
         from email_template_condensed import generate_condensed_email_html
         
         # Generate HTML email
-        report_path = generate_full_report_html(experts_df, grants_df, events_df, csr_df)
+        report_path = generate_full_report_html(sections)
         html_content = generate_condensed_email_html(
-            experts_df, 
-            grants_df, 
-            events_df, 
-            csr_df, 
+            sections,
             base_url=WEB_REPORT_BASE_URL,
             report_filename=Path(report_path).name,
         )
@@ -77,12 +66,9 @@ def send_to_carl():
         # Send via SMTP
         print(f"\n📤 Connecting to {SMTP_SERVER}:{SMTP_PORT}...")
         
-        with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as server:
-            server.starttls()
-            print("🔐 Authenticating...")
-            server.login(SENDER_EMAIL, SENDER_PASSWORD)
+        with SmtpPool.from_env(size=1) as pool:
             print("📧 Sending email...")
-            server.sendmail(SENDER_EMAIL, [RECIPIENT_EMAIL], msg.as_string())
+            pool.send(SENDER_EMAIL, [RECIPIENT_EMAIL], msg.as_string())
         
         print("\n✅ EMAIL SENT SUCCESSFULLY!")
         print(f"📧 Sent to: {RECIPIENT_EMAIL}")
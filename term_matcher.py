@@ -0,0 +1,109 @@
+"""
+Multi-term matcher for the relevance filters
+Finds every occurrence of a labelled set of literal terms with a single compiled
+regex pass, so several keyword lists (climate terms, exclusions, grant signals)
+share one scan of the text
+"""
+
+import re
+
+
+def _trie_pattern(terms):
+    """Build a regex matching any of terms, factored into a prefix trie
+
+    Alternatives sharing a prefix are merged ("apply|application" becomes
+    "appl(?:y|ication)"), so the engine tries each leading character once
+    instead of once per term. At any position the longest term matches.
+    """
+    trie = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[""] = True
+
+    def build(node):
+        ends_here = "" in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if ends_here:
+            # Greedy optional suffix: prefer the longer term
+            return "(?:" + body + ")?" if len(branches) == 1 else body + "?"
+        return body
+
+    return build(trie)
+
+
+class TermMatches:
+    """Every term hit in one scanned text, as (term, label, start, end) tuples"""
+
+    def __init__(self, hits):
+        self.hits = hits
+
+    @property
+    def terms(self):
+        return {term for term, _, _, _ in self.hits}
+
+    @property
+    def labels(self):
+        return {label for _, label, _, _ in self.hits}
+
+    def has(self, label, end=None):
+        """True if a term with this label occurs (entirely before end, if given)"""
+        return any(
+            hit_label == label and (end is None or hit_end <= end)
+            for _, hit_label, _, hit_end in self.hits
+        )
+
+    def terms_for(self, label):
+        return {term for term, hit_label, _, _ in self.hits if hit_label == label}
+
+
+class TermMatcher:
+    """Find all labelled terms in a text with one compiled regex pass
+
+    terms_by_label maps a label (e.g. "climate", "exclude") to literal,
+    already-lowercased terms; a term may carry several labels. Matching is
+    plain substring matching, the same as ``term in text``.
+
+    The regex is a prefix trie, and each search resumes one character after
+    the previous hit's start, so overlapping hits are not lost. At each
+    position it reports the longest term; the shorter terms that are
+    prefixes of it (e.g. "grantee" inside "grantees") are added from a
+    precomputed prefix closure.
+    """
+
+    def __init__(self, terms_by_label):
+        self._labels = {}
+        for label, terms in terms_by_label.items():
+            for term in terms:
+                if term:
+                    self._labels.setdefault(term, []).append(label)
+        terms = sorted(self._labels)
+        # Longest term at a position -> (term, label, length) for it and every
+        # shorter term that is a prefix of it
+        self._closure = {
+            term: [(other, label, len(other))
+                   for other in terms if term.startswith(other)
+                   for label in self._labels[other]]
+            for term in terms
+        }
+        self._regex = re.compile(_trie_pattern(terms)) if terms else None
+
+    def scan(self, text):
+        """Return a TermMatches with every term occurrence in text"""
+        hits = []
+        if self._regex is None:
+            return TermMatches(hits)
+        search = self._regex.search
+        m = search(text)
+        while m:
+            start = m.start()
+            hits.extend((term, label, start, start + length)
+                        for term, label, length in self._closure[m.group()])
+            # Resume one character later rather than after the match, so
+            # terms overlapping this one are still found
+            m = search(text, start + 1)
+        return TermMatches(hits)
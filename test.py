@@ -6,10 +6,11 @@ Use this to test your email configuration with real data
 
 import os
 import sys
-import pandas as pd
 from pathlib import Path
 from datetime import datetime
 from dotenv import load_dotenv
+from data_store import SectionBundle, get_section
+from mailer import SmtpPool
 from web_report_generator import generate_full_report_html
 
 # Load environment variables from .env file
@@ -73,14 +74,12 @@ def test_email():
     total_items = 0
     
     for name, filepath in data_files.items():
+        all_data[name] = get_section(name, weekly_data)
         if filepath.exists():
-            df = pd.read_csv(filepath)
-            all_data[name] = df.to_dict('records')
-            count = len(df)
+            count = len(all_data[name])
             total_items += count
             print(f"✅ {name}: {count} items")
         else:
-            all_data[name] = []
             print(f"⚠️  {name}: Not found (will send empty)")
     
     if total_items == 0:
@@ -104,34 +103,19 @@ def test_email():
     print("\n📨 Sending email...")
     
     try:
-        import smtplib
         from email.mime.multipart import MIMEMultipart
         from email.mime.text import MIMEText
         
         # Import email template
         from email_template_condensed import generate_condensed_email_html
         
-        # Prepare data as DataFrames
-        grants_df = pd.DataFrame(all_data["grants.csv"]) if all_data["grants.csv"] else pd.DataFrame()
-        events_df = pd.DataFrame(all_data["events.csv"]) if all_data["events.csv"] else pd.DataFrame()
-        csr_df = pd.DataFrame(all_data["csr_reports.csv"]) if all_data["csr_reports.csv"] else pd.DataFrame()
-        experts_df = pd.DataFrame(all_data["experts.csv"]) if all_data["experts.csv"] else pd.DataFrame()
-        
-        # Rename Organization to Domain for template compatibility
-        if not grants_df.empty and 'Organization' in grants_df.columns:
-            grants_df = grants_df.rename(columns={'Organization': 'Domain'})
-        if not events_df.empty and 'Organization' in events_df.columns:
-            events_df = events_df.rename(columns={'Organization': 'Domain'})
-        if not csr_df.empty and 'Organization' in csr_df.columns:
-            csr_df = csr_df.rename(columns={'Organization': 'Domain'})
+        # Section DataFrames, already in template schema
+        sections = SectionBundle.from_frames({Path(name).stem: df for name, df in all_data.items()})
         
         # Generate HTML email
-        report_path = generate_full_report_html(experts_df, grants_df, events_df, csr_df)
+        report_path = generate_full_report_html(sections)
         html_content = generate_condensed_email_html(
-            experts_df, 
-            grants_df, 
-            events_df, 
-            csr_df, 
+            sections,
             base_url=WEB_REPORT_BASE_URL,
             report_filename=Path(report_path).name,
         )
@@ -150,14 +134,13 @@ def test_email():
         
         print(f"📤 Connecting to {SMTP_SERVER}:{SMTP_PORT}...")
         
-        with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as server:
-            server.starttls()
-            print("🔐 Authenticating...")
-            server.login(SENDER_EMAIL, SENDER_PASSWORD)
+        recipients = [e.strip() for e in RECIPIENT_EMAILS.split(",")]
+        with SmtpPool.from_env() as pool:
             print("📧 Sending email...")
-            
-            recipients = [e.strip() for e in RECIPIENT_EMAILS.split(",")]
-            server.sendmail(SENDER_EMAIL, recipients, msg.as_string())
+            _, failed = pool.send_batched(SENDER_EMAIL, recipients, msg.as_string(),
+                                          int(os.getenv("SMTP_BATCH_SIZE", "50")))
+        for email, error in failed.items():
+            print(f"⚠️  Rejected {email}: {error}")
         
         print("\n✅ TEST EMAIL SENT SUCCESSFULLY!")
         print("\n📋 Next steps:")
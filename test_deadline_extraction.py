@@ -1,19 +1,17 @@
 """Test enhanced deadline extraction"""
 from automated_newsletter import run_section, GRANT_KEYWORDS, write_csv
-import pandas as pd
+from data_store import CsvAccumulator, load_section
 
 print("🔍 Testing enhanced deadline extraction...")
 print("Removing old grants.csv...")
-import os
-if os.path.exists("weekly_data/grants.csv"):
-    os.remove("weekly_data/grants.csv")
+CsvAccumulator("weekly_data/grants.csv").clear()  # also drops its held-back rows
 
 print("\n🌐 Scraping grants with enhanced date detection...")
 grants = run_section(GRANT_KEYWORDS, future=True)
 write_csv('grants.csv', grants)
 
 # Analyze results
-df = pd.read_csv('weekly_data/grants.csv')
+df = load_section('grants')  # includes rows not yet compacted into the CSV
 print(f"\n✅ Scraped {len(df)} grants")
 
 deadlines_found = df[df['Deadline'] != '—']
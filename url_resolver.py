@@ -0,0 +1,142 @@
+"""
+Hosted URL probing for the email links
+Checks candidate report URLs concurrently over one pooled requests.Session and
+remembers the answers for a short while (misses for less time than hits), so
+rendering the email costs at most one round of parallel requests instead of a
+chain of blocking HEAD/GET calls
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+PROBE_TIMEOUT = 5  # Seconds per HEAD/GET
+PAGE_TIMEOUT = 8  # Seconds for a page whose text is needed
+FOUND_TTL = 300  # Seconds a reachable URL / fetched page is remembered
+MISSING_TTL = 30  # Seconds an unreachable URL is remembered
+PROBE_WORKERS = 4
+
+
+class UrlResolver:
+    """Concurrent, cached reachability checks and page fetches
+
+    Every answer is cached per URL: hits for found_ttl seconds, misses for
+    missing_ttl. A URL already being probed is not probed again; callers
+    share the in-flight request.
+    """
+
+    def __init__(self, timeout=PROBE_TIMEOUT, page_timeout=PAGE_TIMEOUT, found_ttl=FOUND_TTL,
+                 missing_ttl=MISSING_TTL, max_workers=PROBE_WORKERS, session=None):
+        self.timeout = timeout
+        self.page_timeout = page_timeout
+        self.found_ttl = found_ttl
+        self.missing_ttl = missing_ttl
+        self.max_workers = max_workers
+        self._session = session
+        self._executor = None
+        self._cache = {}  # (kind, url) -> [future, expires]
+        self._lock = threading.Lock()
+
+    def _get_session(self):
+        if self._session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.max_workers)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._session = session
+        return self._session
+
+    def _probe(self, url):
+        """True when url answers 2xx/3xx; falls back to GET where HEAD is refused"""
+        session = self._get_session()
+        try:
+            response = session.head(url, timeout=self.timeout, allow_redirects=True)
+            if response.status_code == 405:
+                # Stream so only the status line and headers are read
+                with session.get(url, timeout=self.timeout, allow_redirects=True, stream=True) as response:
+                    return 200 <= response.status_code < 400
+            return 200 <= response.status_code < 400
+        except Exception:
+            return False
+
+    def _fetch(self, url):
+        """Page text, or None when it can't be fetched"""
+        try:
+            response = self._get_session().get(url, timeout=self.page_timeout)
+            return response.text if response.ok else None
+        except Exception:
+            return None
+
+    def _submit(self, kind, url):
+        key = (kind, url)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None and (not entry[0].done() or entry[1] > now):
+                return entry[0]
+            self._get_session()
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                    thread_name_prefix="url-probe")
+            future = self._executor.submit(self._probe if kind == "head" else self._fetch, url)
+            entry = [future, float("inf")]
+            self._cache[key] = entry
+
+        def expire(done):
+            ttl = self.found_ttl if done.result() else self.missing_ttl
+            entry[1] = time.monotonic() + ttl
+
+        future.add_done_callback(expire)
+        return future
+
+    def exists(self, url):
+        """Cached reachability check for one URL"""
+        return self._submit("head", url).result()
+
+    def first_existing(self, candidates):
+        """The first reachable candidate in the given order, or None
+
+        All candidates are probed at once; this returns as soon as the
+        answer is known (a candidate is up and every earlier one is down).
+        """
+        futures = [self._submit("head", url) for url in candidates]
+        for url, future in zip(candidates, futures):
+            if future.result():
+                return url
+        return None
+
+    def fetch_pages(self, urls):
+        """Cached page texts for urls, fetched concurrently (None where a fetch failed)"""
+        for future in [self._submit("get", url) for url in urls]:
+            yield future.result()
+
+    def clear(self):
+        """Forget every cached answer"""
+        with self._lock:
+            self._cache.clear()
+
+    def close(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+            self._cache.clear()
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+
+_default_resolver = None
+_default_lock = threading.Lock()
+
+
+def default_resolver():
+    """Process-wide UrlResolver shared by every email render"""
+    global _default_resolver
+    with _default_lock:
+        if _default_resolver is None:
+            _default_resolver = UrlResolver()
+        return _default_resolver
@@ -3,31 +3,26 @@ Web page generator for complete weekly intelligence report
 Creates a standalone HTML page with all data when users want to see everything
 """
 
-import pandas as pd
+import hashlib
+import os
 from pathlib import Path
 from datetime import datetime
-from dateutil import parser
 import json
-import glob
-import re
 
+from data_store import column_values, get_sections
+from date_utils import parse_fuzzy_date
+from html_template import CompiledTemplate
+from report_manifest import (
+    entry_date,
+    latest_report,
+    load_manifest,
+    published_reports,
+    record_report,
+    report_filename,
+)
 
-def _extract_report_stat_signature(report_path):
-    """Best-effort parse of report stat cards to score report completeness."""
-    try:
-        text = Path(report_path).read_text(encoding='utf-8')
-    except Exception:
-        return (-1, -1)
-
-    # Each report has 4 stat numbers in the header; use their sum as quality score.
-    values = re.findall(r'<div class="stat-number">(\d+)</div>', text)
-    if len(values) < 4:
-        return (-1, -1)
+REPORT_WRITE_BUFFER = 1 << 20  # Bytes buffered before each write of the streamed report
 
-    ints = [int(v) for v in values[:4]]
-    non_zero_sections = sum(1 for v in ints if v > 0)
-    total = sum(ints)
-    return (non_zero_sections, total)
 
 def calculate_event_countdown(date_str):
     """Convert a date string into a countdown format like 'In 4 weeks'"""
@@ -38,8 +33,10 @@ def calculate_event_countdown(date_str):
         return "Ongoing"
     
     try:
-        # Parse the date
-        event_date = parser.parse(date_str, fuzzy=True)
+        # Parse the date (memoized, the same strings come back every render)
+        event_date = parse_fuzzy_date(date_str)
+        if event_date is None:
+            return date_str
         today = datetime.now()
         
         # Calculate difference
@@ -64,70 +61,50 @@ def calculate_event_countdown(date_str):
     except:
         return date_str  # If parsing fails, return original date
 
-def generate_full_report_html(experts_df, grants_df, events_df, csr_df, output_dir="weekly_data", report_datetime=None):
-    """Generate a complete HTML report with all data"""
 
-    today = report_datetime or datetime.now()
-    week_num = today.isocalendar()[1]
-    date_str = today.strftime("%B %d, %Y")
-    
-    # Get counts
-    experts_count = len(experts_df) if not experts_df.empty else 0
-    grants_count = len(grants_df) if not grants_df.empty else 0
-    events_count = len(events_df) if not events_df.empty else 0
-    csr_count = len(csr_df) if not csr_df.empty else 0
-    
-    # Start building the HTML
-    html_content = f"""<!DOCTYPE html>
-<html lang="en">
-
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Climate Cardinals - Complete Weekly Intelligence Report</title>
-    <style>
+REPORT_CSS = """
         @import url('https://fonts.cdnfonts.com/css/fk-screamer');
         @import url('https://fonts.cdnfonts.com/css/athletics');
 
-        body {{
+        body {
             font-family: 'Athletics', -apple-system, BlinkMacSystemFont, 'Segoe UI', Arial, sans-serif;
             background-color: #f0f0f0;
             margin: 0;
             padding: 20px;
             line-height: 1.6;
             color: #192928;
-        }}
+        }
 
         /* responsive helpers */
-        @media screen and (max-width: 800px) {{
-            .header h1 {{
+        @media screen and (max-width: 800px) {
+            .header h1 {
                 font-size: 38px !important;
                 line-height: 1.1 !important;
-            }}
-        }}
+            }
+        }
 
-        .container {{
+        .container {
             max-width: 1000px;
             margin: 0 auto;
             background: #ffffff;
             box-shadow: 0 8px 30px rgba(0, 0, 0, 0.12);
-        }}
+        }
 
-        .header {{
+        .header {
             padding: 50px 40px;
             background: linear-gradient(135deg, #3154ff 0%, #253292 100%);
             color: #ffffff;
-        }}
+        }
 
-        .stats-grid {{
+        .stats-grid {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
             gap: 0;
             margin: 0;
             background: #ff082c;
-        }}
+        }
 
-        .stat-card {{
+        .stat-card {
             text-align: center;
             padding: 40px 25px;
             background: #ff082c;
@@ -136,45 +113,45 @@ def generate_full_report_html(experts_df, grants_df, events_df, csr_df, output_d
             text-decoration: none;
             display: block;
             cursor: pointer;
-        }}
+        }
 
-        .stat-card:last-child {{
+        .stat-card:last-child {
             border-right: none;
-        }}
+        }
 
-        .stat-card:hover {{
+        .stat-card:hover {
             background: #f95208;
             transform: scale(1.05);
-        }}
+        }
 
-        .stat-number {{
+        .stat-number {
             font-family: 'FK Screamer', Arial, sans-serif;
             font-size: 48px;
             font-weight: 900;
             color: #ffffff;
             margin-bottom: 10px;
             line-height: 1;
-        }}
+        }
 
-        .stat-label {{
+        .stat-label {
             font-family: 'FK Screamer', Arial, sans-serif;
             font-size: 12px;
             color: #ffffff;
             text-transform: uppercase;
             letter-spacing: 2px;
             font-weight: 700;
-        }}
+        }
 
-        .section {{
+        .section {
             padding: 50px 40px;
             border-bottom: 1px solid #e0e0e0;
-        }}
+        }
 
-        .section-header {{
+        .section-header {
             margin-bottom: 30px;
-        }}
+        }
 
-        .section-title {{
+        .section-title {
             font-family: 'FK Screamer', Arial, sans-serif;
             font-size: 36px;
             font-weight: 900;
@@ -185,17 +162,17 @@ def generate_full_report_html(experts_df, grants_df, events_df, csr_df, output_d
             gap: 15px;
             text-transform: uppercase;
             letter-spacing: -1px;
-        }}
+        }
 
-        .section-subtitle {{
+        .section-subtitle {
             font-family: 'Athletics', Arial, sans-serif;
             font-size: 15px;
             color: #666666;
             margin: 0;
             font-weight: 600;
-        }}
+        }
 
-        .item-card {{
+        .item-card {
             background: #ffffff;
             border: 2px solid #e0e0e0;
             border-left: 5px solid #ff082c;
@@ -203,48 +180,48 @@ def generate_full_report_html(experts_df, grants_df, events_df, csr_df, output_d
             margin-bottom: 20px;
             border-radius: 10px;
             transition: all 0.3s ease;
-        }}
+        }
 
-        .item-card:hover {{
+        .item-card:hover {
             box-shadow: 0 8px 25px rgba(0, 0, 0, 0.1);
             transform: translateY(-3px);
             border-left-color: #3154ff;
-        }}
+        }
 
-        .item-title {{
+        .item-title {
             font-family: 'FK Screamer', Arial, sans-serif;
             font-size: 20px;
             font-weight: 900;
             color: #192928;
             margin: 0 0 15px 0;
             line-height: 1.3;
-        }}
+        }
 
-        .item-meta {{
+        .item-meta {
             display: flex;
             gap: 20px;
             margin-bottom: 15px;
             padding-bottom: 15px;
             border-bottom: 2px solid #f0f0f0;
             flex-wrap: wrap;
-        }}
+        }
 
-        .meta-item {{
+        .meta-item {
             font-size: 13px;
             color: #3154ff;
             font-weight: 600;
-        }}
+        }
 
-        .item-description {{
+        .item-description {
             font-family: 'Athletics', Arial, sans-serif;
             font-size: 15px;
             color: #192928;
             line-height: 1.6;
             margin-bottom: 20px;
             opacity: 0.9;
-        }}
+        }
 
-        .item-link {{
+        .item-link {
             display: inline-block;
             background: #ff082c;
             color: #ffffff;
@@ -256,15 +233,15 @@ def generate_full_report_html(experts_df, grants_df, events_df, csr_df, output_d
             transition: all 0.3s ease;
             text-transform: uppercase;
             letter-spacing: 1px;
-        }}
+        }
 
-        .item-link:hover {{
+        .item-link:hover {
             background: #3154ff;
             transform: translateY(-2px);
             box-shadow: 0 6px 20px rgba(49, 84, 255, 0.4);
-        }}
+        }
 
-        .expert-card {{
+        .expert-card {
             background: #ffffff;
             border: 2px solid #e0e0e0;
             border-left: 5px solid #3154ff;
@@ -272,31 +249,31 @@ def generate_full_report_html(experts_df, grants_df, events_df, csr_df, output_d
             margin-bottom: 20px;
             border-radius: 10px;
             transition: all 0.3s ease;
-        }}
+        }
 
-        .expert-card:hover {{
+        .expert-card:hover {
             box-shadow: 0 8px 25px rgba(0, 0, 0, 0.1);
             transform: translateY(-3px);
             border-left-color: #ff082c;
-        }}
+        }
 
-        .expert-name {{
+        .expert-name {
             font-family: 'FK Screamer', Arial, sans-serif;
             font-size: 22px;
             font-weight: 900;
             color: #192928;
             margin: 0 0 10px 0;
-        }}
+        }
 
-        .expert-role {{
+        .expert-role {
             font-family: 'Athletics', Arial, sans-serif;
             font-size: 15px;
             color: #666666;
             font-weight: 600;
             margin-bottom: 15px;
-        }}
+        }
 
-        .linkedin-btn {{
+        .linkedin-btn {
             display: inline-block;
             background: #3154ff;
             color: #ffffff;
@@ -308,15 +285,15 @@ def generate_full_report_html(experts_df, grants_df, events_df, csr_df, output_d
             transition: all 0.3s ease;
             text-transform: uppercase;
             letter-spacing: 1px;
-        }}
+        }
 
-        .linkedin-btn:hover {{
+        .linkedin-btn:hover {
             background: #ff082c;
             transform: translateY(-2px);
             box-shadow: 0 6px 20px rgba(255, 8, 44, 0.4);
-        }}
+        }
 
-        .no-data {{
+        .no-data {
             text-align: center;
             padding: 60px 20px;
             background: linear-gradient(135deg, #f0f7ff 0%, #e8f5fe 100%);
@@ -324,16 +301,16 @@ def generate_full_report_html(experts_df, grants_df, events_df, csr_df, output_d
             border-radius: 12px;
             color: #192928;
             opacity: 0.7;
-        }}
+        }
 
-        .footer {{
+        .footer {
             padding: 60px 40px;
             background: #000000;
             color: #ffffff;
             text-align: center;
-        }}
+        }
 
-        .back-to-top {{
+        .back-to-top {
             position: fixed;
             bottom: 30px;
             right: 30px;
@@ -348,15 +325,15 @@ def generate_full_report_html(experts_df, grants_df, events_df, csr_df, output_d
             box-shadow: 0 4px 20px rgba(255, 8, 44, 0.5);
             transition: all 0.3s ease;
             font-weight: bold;
-        }}
+        }
 
-        .back-to-top:hover {{
+        .back-to-top:hover {
             background: #3154ff;
             transform: translateY(-5px) scale(1.1);
             box-shadow: 0 8px 25px rgba(49, 84, 255, 0.5);
-        }}
+        }
 
-        .toggle-btn {{
+        .toggle-btn {
             display: block;
             margin: 40px auto 0;
             background: linear-gradient(135deg, #3154ff 0%, #253292 100%);
@@ -372,39 +349,48 @@ def generate_full_report_html(experts_df, grants_df, events_df, csr_df, output_d
             text-transform: uppercase;
             letter-spacing: 1px;
             box-shadow: 0 4px 15px rgba(49, 84, 255, 0.3);
-        }}
+        }
 
-        .toggle-btn:hover {{
+        .toggle-btn:hover {
             background: linear-gradient(135deg, #ff082c 0%, #f95208 100%);
             transform: translateY(-2px);
             box-shadow: 0 6px 20px rgba(255, 8, 44, 0.4);
-        }}
+        }
 
-        .toggle-btn:active {{
+        .toggle-btn:active {
             transform: translateY(0);
-        }}
+        }
 
-        .item-hidden {{
+        .item-hidden {
             display: none;
-        }}
+        }
 
         /* Print styles - show all content when printing */
-        @media print {{
-            .item-hidden {{
+        @media print {
+            .item-hidden {
                 display: block !important;
-            }}
+            }
 
             .toggle-btn,
-            .back-to-top {{
+            .back-to-top {
                 display: none !important;
-            }}
+            }
 
             .item-card,
-            .expert-card {{
+            .expert-card {
                 page-break-inside: avoid;
-            }}
-        }}
-    </style>
+            }
+        }
+"""
+
+_REPORT_HEAD = CompiledTemplate("""<!DOCTYPE html>
+<html lang="en">
+
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Climate Cardinals - Complete Weekly Intelligence Report</title>
+    <style>REPORT_CSS    </style>
 </head>
 
 <body>
@@ -413,7 +399,7 @@ def generate_full_report_html(experts_df, grants_df, events_df, csr_df, output_d
         <div class="header">
             <div
                 style="font-family: 'FK Screamer', Arial, sans-serif; font-size: 11px; font-weight: 900; letter-spacing: 3px; text-transform: uppercase; color: #ffffff; margin-bottom: 20px; opacity: 0.9;">
-                Complete Weekly Intelligence • Issue #{week_num}</div>
+                Complete Weekly Intelligence • Issue #WEEK_NUM</div>
             <h1
                 style="font-family: 'FK Screamer', Arial, sans-serif; font-size: 56px; font-weight: 900; color: #ffffff; margin: 0 0 15px 0; line-height: 1; letter-spacing: -2px;">
                 🌍 CLIMATE CARDINALS</h1>
@@ -425,7 +411,7 @@ def generate_full_report_html(experts_df, grants_df, events_df, csr_df, output_d
                 style="display: flex; justify-content: space-between; align-items: center; padding-top: 20px; padding-bottom: 10px; border-top: 2px solid rgba(255,255,255,0.3);">
                 <div
                     style="font-family: 'Athletics', Arial, sans-serif; font-size: 15px; font-weight: 700; color: #ffffff; opacity: 0.95;">
-                    📅 {date_str}</div>
+                    📅 DATE_STR</div>
                 <div
                     style="font-family: 'FK Screamer', Arial, sans-serif; font-size: 11px; color: #ffffff; font-weight: 900; text-transform: uppercase; letter-spacing: 2px; opacity: 0.9;">
                     Complete Dataset</div>
@@ -434,27 +420,44 @@ def generate_full_report_html(experts_df, grants_df, events_df, csr_df, output_d
             <!-- Stats Overview -->
             <div class="stats-grid">
                 <a href="#experts" class="stat-card">
-                    <div class="stat-number">{experts_count}</div>
+                    <div class="stat-number">COUNT_EXPERTS</div>
                     <div class="stat-label">Climate Experts</div>
                 </a>
                 <a href="#grants" class="stat-card">
-                    <div class="stat-number">{grants_count}</div>
+                    <div class="stat-number">COUNT_GRANTS</div>
                     <div class="stat-label">Grant Opportunities</div>
                 </a>
                 <a href="#events" class="stat-card">
-                    <div class="stat-number">{events_count}</div>
+                    <div class="stat-number">COUNT_EVENTS</div>
                     <div class="stat-label">Upcoming Events</div>
                 </a>
                 <a href="#reports" class="stat-card">
-                    <div class="stat-number">{csr_count}</div>
+                    <div class="stat-number">COUNT_REPORTS</div>
                     <div class="stat-label">ESG Reports</div>
                 </a>
             </div>
         </div>
-"""
-
-    # Climate Experts Section
-    html_content += f"""
+""",
+    placeholders=("WEEK_NUM", "DATE_STR", "COUNT_EXPERTS", "COUNT_GRANTS", "COUNT_EVENTS", "COUNT_REPORTS"),
+    static={"REPORT_CSS": REPORT_CSS},
+)
+
+
+def _report_head(week_num, date_str, experts_count, grants_count, events_count, csr_count):
+    """Document head, styles and the page header with the stat cards"""
+    return _REPORT_HEAD.render({
+        "WEEK_NUM": week_num,
+        "DATE_STR": date_str,
+        "COUNT_EXPERTS": experts_count,
+        "COUNT_GRANTS": grants_count,
+        "COUNT_EVENTS": events_count,
+        "COUNT_REPORTS": csr_count,
+    })
+
+
+def _experts_section(experts_df):
+    """Climate Experts section as a stream of chunks, one per card"""
+    yield f"""
         <div class="section" id="experts">
             <div class="section-header">
                 <h2 class="section-title">👤 Climate Experts</h2>
@@ -463,14 +466,15 @@ def generate_full_report_html(experts_df, grants_df, events_df, csr_df, output_d
 """
     
     if not experts_df.empty:
-        for idx, (_, row) in enumerate(experts_df.iterrows()):
-            name = row.get('Name', 'Unknown')
-            role = row.get('Role', '')  
-            linkedin = row.get('LinkedIn', '')
+        for name, role, linkedin in zip(
+            column_values(experts_df, 'Name', default='Unknown'),
+            column_values(experts_df, 'Role'),
+            column_values(experts_df, 'LinkedIn'),
+        ):
             
             linkedin_btn = f'<a href="{linkedin}" class="linkedin-btn">View LinkedIn Profile</a>' if linkedin and linkedin != '—' else ''
             
-            html_content += f"""
+            yield f"""
             <div class="expert-card">
                 <div class="expert-name">{name}</div>
                 <div class="expert-role">{role}</div>
@@ -478,12 +482,14 @@ def generate_full_report_html(experts_df, grants_df, events_df, csr_df, output_d
             </div>
 """
     else:
-        html_content += '<div class="no-data"><div style="font-size: 40px; margin-bottom: 15px;">👥</div><p>No climate experts curated this week</p></div>'
+        yield '<div class="no-data"><div style="font-size: 40px; margin-bottom: 15px;">👥</div><p>No climate experts curated this week</p></div>'
     
-    html_content += "</div>"
+    yield "</div>"
+
 
-    # Grants Section
-    html_content += f"""
+def _grants_section(grants_df):
+    """Grants section as a stream of chunks, one per card"""
+    yield f"""
         <div class="section" id="grants">
             <div class="section-header">
                 <h2 class="section-title">💰 Grants & Funding</h2>
@@ -492,13 +498,14 @@ def generate_full_report_html(experts_df, grants_df, events_df, csr_df, output_d
 """
     
     if not grants_df.empty:
-        for idx, (_, row) in enumerate(grants_df.iterrows()):
-            title = row.get('Title', 'Untitled')
-            domain = row.get('Domain', row.get('Organization', ''))
-            date_info = row.get('Date Info', '')
-            deadline = row.get('Deadline', '')
-            url = row.get('URL', '')
-            description = row.get('Description', '')
+        for title, domain, date_info, deadline, url, description in zip(
+            column_values(grants_df, 'Title', default='Untitled'),
+            column_values(grants_df, 'Domain', 'Organization'),
+            column_values(grants_df, 'Date Info'),
+            column_values(grants_df, 'Deadline'),
+            column_values(grants_df, 'URL'),
+            column_values(grants_df, 'Description'),
+        ):
             
             meta_items = []
             has_deadline = False
@@ -527,7 +534,7 @@ def generate_full_report_html(experts_df, grants_df, events_df, csr_df, output_d
             
             link_html = f'<a href="{url}" class="item-link">View Grant Details →</a>' if url and url != '—' else ''
             
-            html_content += f"""
+            yield f"""
             <div class="item-card">
                 <div class="item-title">{title}</div>
                 {meta_html}
@@ -537,12 +544,14 @@ def generate_full_report_html(experts_df, grants_df, events_df, csr_df, output_d
             </div>
 """
     else:
-        html_content += '<div class="no-data"><div style="font-size: 40px; margin-bottom: 15px;">💰</div><p>No grant opportunities curated this week</p></div>'
+        yield '<div class="no-data"><div style="font-size: 40px; margin-bottom: 15px;">💰</div><p>No grant opportunities curated this week</p></div>'
     
-    html_content += "</div>"
+    yield "</div>"
 
-    # Events Section
-    html_content += f"""
+
+def _events_section(events_df):
+    """Events section as a stream of chunks, one per card"""
+    yield f"""
         <div class="section" id="events">
             <div class="section-header">
                 <h2 class="section-title">🎤 Events & Conferences</h2>
@@ -551,12 +560,13 @@ def generate_full_report_html(experts_df, grants_df, events_df, csr_df, output_d
 """
     
     if not events_df.empty:
-        for idx, (_, row) in enumerate(events_df.iterrows()):
-            title = row.get('Title', 'Untitled')
-            domain = row.get('Domain', row.get('Organization', ''))
-            date_info = row.get('Date Info', '')
-            url = row.get('URL', '')
-            description = row.get('Description', '')
+        for title, domain, date_info, url, description in zip(
+            column_values(events_df, 'Title', default='Untitled'),
+            column_values(events_df, 'Domain', 'Organization'),
+            column_values(events_df, 'Date Info'),
+            column_values(events_df, 'URL'),
+            column_values(events_df, 'Description'),
+        ):
             
             meta_items = []
             
@@ -576,7 +586,7 @@ def generate_full_report_html(experts_df, grants_df, events_df, csr_df, output_d
             meta_html = '<div class="item-meta">' + ''.join(meta_items) + '</div>' if meta_items else ''
             link_html = f'<a href="{url}" class="item-link">Read Full Article →</a>' if url and url != '—' else ''
             
-            html_content += f"""
+            yield f"""
             <div class="item-card">
                 <div class="item-title">{title}</div>
                 {meta_html}
@@ -585,12 +595,14 @@ def generate_full_report_html(experts_df, grants_df, events_df, csr_df, output_d
             </div>
 """
     else:
-        html_content += '<div class="no-data"><div style="font-size: 40px; margin-bottom: 15px;">🎤</div><p>No events curated this week</p></div>'
+        yield '<div class="no-data"><div style="font-size: 40px; margin-bottom: 15px;">🎤</div><p>No events curated this week</p></div>'
     
-    html_content += "</div>"
+    yield "</div>"
+
 
-    # CSR Reports Section
-    html_content += f"""
+def _csr_section(csr_df):
+    """ESG reports section as a stream of chunks, one per card"""
+    yield f"""
         <div class="section" id="reports">
             <div class="section-header">
                 <h2 class="section-title">📊 ESG & Sustainability Reports</h2>
@@ -599,12 +611,13 @@ def generate_full_report_html(experts_df, grants_df, events_df, csr_df, output_d
 """
     
     if not csr_df.empty:
-        for idx, (_, row) in enumerate(csr_df.iterrows()):
-            title = row.get('Title', 'Untitled')
-            domain = row.get('Domain', row.get('Organization', ''))
-            date_info = row.get('Date Info', '')
-            url = row.get('URL', '')
-            description = row.get('Description', '')
+        for title, domain, date_info, url, description in zip(
+            column_values(csr_df, 'Title', default='Untitled'),
+            column_values(csr_df, 'Domain', 'Organization'),
+            column_values(csr_df, 'Date Info'),
+            column_values(csr_df, 'URL'),
+            column_values(csr_df, 'Description'),
+        ):
             
             meta_items = []
             if date_info and date_info != '—':
@@ -615,7 +628,7 @@ def generate_full_report_html(experts_df, grants_df, events_df, csr_df, output_d
             meta_html = '<div class="item-meta">' + ''.join(meta_items) + '</div>' if meta_items else ''
             link_html = f'<a href="{url}" class="item-link">Read Full Article →</a>' if url and url != '—' else ''
             
-            html_content += f"""
+            yield f"""
             <div class="item-card">
                 <div class="item-title">{title}</div>
                 {meta_html}
@@ -624,12 +637,12 @@ def generate_full_report_html(experts_df, grants_df, events_df, csr_df, output_d
             </div>
 """
     else:
-        html_content += '<div class="no-data"><div style="font-size: 40px; margin-bottom: 15px;">📊</div><p>No ESG reports curated this week</p></div>'
+        yield '<div class="no-data"><div style="font-size: 40px; margin-bottom: 15px;">📊</div><p>No ESG reports curated this week</p></div>'
     
-    html_content += "</div>"
+    yield "</div>"
+
 
-    # Footer
-    html_content += f"""
+_REPORT_FOOTER = CompiledTemplate("""
         <div class="footer">
             <div style="font-size: 48px; margin-bottom: 20px;">🌍</div>
             <h3
@@ -640,108 +653,149 @@ def generate_full_report_html(experts_df, grants_df, events_df, csr_df, output_d
                 Complete Weekly Intelligence Report</p>
             <div style="width: 60px; height: 3px; background: #ffffff; margin: 20px auto;"></div>
             <p style="font-family: 'Athletics', Arial, sans-serif; font-size: 12px; opacity: 0.7; margin: 12px 0 0 0;">©
-                2026 Climate Cardinals • Generated on {date_str}</p>
+                2026 Climate Cardinals • Generated on DATE_STR</p>
         </div>
     </div>
     
     <!-- Back to top button -->
-    <button class="back-to-top" onclick="window.scrollTo({{top: 0, behavior: 'smooth'}})" title="Back to top">↑</button>
+    <button class="back-to-top" onclick="window.scrollTo({top: 0, behavior: 'smooth'})" title="Back to top">↑</button>
     
     <script>
         // Show/hide back to top button
-        window.addEventListener('scroll', function() {{
+        window.addEventListener('scroll', function() {
             const backToTop = document.querySelector('.back-to-top');
-            if (window.pageYOffset > 300) {{
+            if (window.pageYOffset > 300) {
                 backToTop.style.display = 'block';
-            }} else {{
+            } else {
                 backToTop.style.display = 'none';
-            }}
-        }});
+            }
+        });
         
         // Initially hide the button
         document.querySelector('.back-to-top').style.display = 'none';
         
         // Read More/Show Less functionality
-        document.addEventListener('DOMContentLoaded', function() {{
+        document.addEventListener('DOMContentLoaded', function() {
             const sections = document.querySelectorAll('.section');
             
-            sections.forEach(section => {{
+            sections.forEach(section => {
                 // Get all cards in this section (both expert-card and item-card)
                 const cards = section.querySelectorAll('.expert-card, .item-card');
                 
                 // Only add toggle functionality if there are more than 3 cards
-                if (cards.length > 3) {{
+                if (cards.length > 3) {
                     // Hide cards after the first 3
-                    cards.forEach((card, index) => {{
-                        if (index >= 3) {{
+                    cards.forEach((card, index) => {
+                        if (index >= 3) {
                             card.classList.add('item-hidden');
-                        }}
-                    }});
+                        }
+                    });
                     
                     // Create toggle button
                     const toggleBtn = document.createElement('button');
                     toggleBtn.className = 'toggle-btn';
-                    toggleBtn.textContent = `Read More (${{cards.length - 3}} more)`;
+                    toggleBtn.textContent = `Read More (${cards.length - 3} more)`;
                     toggleBtn.setAttribute('aria-expanded', 'false');
-                    toggleBtn.setAttribute('aria-label', `Show ${{cards.length - 3}} more items`);
+                    toggleBtn.setAttribute('aria-label', `Show ${cards.length - 3} more items`);
                     
                     // Add click handler
                     let isExpanded = false;
-                    toggleBtn.addEventListener('click', function() {{
+                    toggleBtn.addEventListener('click', function() {
                         isExpanded = !isExpanded;
                         
-                        cards.forEach((card, index) => {{
-                            if (index >= 3) {{
-                                if (isExpanded) {{
+                        cards.forEach((card, index) => {
+                            if (index >= 3) {
+                                if (isExpanded) {
                                     card.classList.remove('item-hidden');
-                                }} else {{
+                                } else {
                                     card.classList.add('item-hidden');
-                                }}
-                            }}
-                        }});
+                                }
+                            }
+                        });
                         
                         // Update button text and accessibility
-                        if (isExpanded) {{
+                        if (isExpanded) {
                             toggleBtn.textContent = 'Show Less';
                             toggleBtn.setAttribute('aria-expanded', 'true');
                             toggleBtn.setAttribute('aria-label', 'Show fewer items');
-                        }} else {{
-                            toggleBtn.textContent = `Read More (${{cards.length - 3}} more)`;
+                        } else {
+                            toggleBtn.textContent = `Read More (${cards.length - 3} more)`;
                             toggleBtn.setAttribute('aria-expanded', 'false');
-                            toggleBtn.setAttribute('aria-label', `Show ${{cards.length - 3}} more items`);
+                            toggleBtn.setAttribute('aria-label', `Show ${cards.length - 3} more items`);
                             
                             // Scroll to section header when collapsing
                             const sectionHeader = section.querySelector('.section-header');
-                            if (sectionHeader) {{
-                                sectionHeader.scrollIntoView({{ behavior: 'smooth', block: 'start' }});
-                            }}
-                        }}
-                    }});
+                            if (sectionHeader) {
+                                sectionHeader.scrollIntoView({ behavior: 'smooth', block: 'start' });
+                            }
+                        }
+                    });
                     
                     // Append button to section
                     section.appendChild(toggleBtn);
-                }}
-            }});
-        }});
+                }
+            });
+        });
     </script>
 </body>
-</html>"""
+</html>""",
+    placeholders=("DATE_STR",),
+)
+
+
+def _report_footer(date_str):
+    """Footer, back-to-top button and the Read More script"""
+    return _REPORT_FOOTER.render({"DATE_STR": date_str})
 
-    # Save the HTML file
-    output_path = Path(output_dir) / f"climate_cardinals_report_{today.strftime('%Y%m%d')}.html"
+
+def _report_chunks(sections, today):
+    """The full report for a SectionBundle as HTML chunks in document order"""
+    week_num = today.isocalendar()[1]
+    date_str = today.strftime("%B %d, %Y")
+
+    yield _report_head(week_num, date_str, len(sections.experts), len(sections.grants),
+                       len(sections.events), len(sections.csr_reports))
+    yield from _experts_section(sections.experts)
+    yield from _grants_section(sections.grants)
+    yield from _events_section(sections.events)
+    yield from _csr_section(sections.csr_reports)
+    yield _report_footer(date_str)
+
+
+def generate_full_report_html(sections, output_dir="weekly_data", report_datetime=None):
+    """Generate a complete HTML report with all data from a SectionBundle
+
+    The page is streamed to disk one card at a time through a large write
+    buffer, so time and memory stay linear in the number of cards. It goes to
+    a temporary file that is moved into place, so the index never links a
+    half-written report. The report is then recorded in the reports.json
+    manifest (see report_manifest.py) with its counts and content hash.
+    """
+    today = report_datetime or datetime.now()
+    output_path = Path(output_dir) / report_filename(today)
     output_path.parent.mkdir(exist_ok=True)
-    
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(html_content)
-    
+    tmp_path = output_path.with_suffix(".html.tmp")
+
+    digest = hashlib.sha256()
+
+    def hashed(chunks):
+        for chunk in chunks:
+            digest.update(chunk.encode('utf-8'))
+            yield chunk
+
+    with open(tmp_path, 'w', encoding='utf-8', buffering=REPORT_WRITE_BUFFER) as f:
+        f.writelines(hashed(_report_chunks(sections, today)))
+    os.replace(tmp_path, output_path)
     print(f"📄 Full report saved: {output_path.resolve()}")
     
+    entries = record_report(output_dir, output_path.name, today, sections.counts(), digest.hexdigest())
+    
     # Update index.html with all reports
-    update_index_html(output_dir)
+    update_index_html(output_dir, entries=entries)
     
     return output_path.resolve()
 
-def generate_report_metadata(experts_df, grants_df, events_df, csr_df, report_url):
+def generate_report_metadata(sections, report_url):
     """Generate metadata about the report for use in email templates"""
     
     today = datetime.now()
@@ -751,10 +805,10 @@ def generate_report_metadata(experts_df, grants_df, events_df, csr_df, report_ur
         'week_number': today.isocalendar()[1],
         'report_url': str(report_url),
         'counts': {
-            'experts': len(experts_df) if not experts_df.empty else 0,
-            'grants': len(grants_df) if not grants_df.empty else 0,
-            'events': len(events_df) if not events_df.empty else 0,
-            'csr': len(csr_df) if not csr_df.empty else 0
+            'experts': len(sections.experts),
+            'grants': len(sections.grants),
+            'events': len(sections.events),
+            'csr': len(sections.csr_reports)
         }
     }
     
@@ -766,100 +820,8 @@ def generate_report_metadata(experts_df, grants_df, events_df, csr_df, report_ur
     return metadata
 
 
-def update_index_html(output_dir="weekly_data"):
-    """
-    Update index.html with all available reports listed in reverse chronological order
-    """
-    # Find all report files
-    report_pattern = str(Path(output_dir) / "climate_cardinals_report_*.html")
-    report_files = glob.glob(report_pattern)
-    
-    # Extract dates and sort (newest first)
-    reports_data = []
-    for report_file in report_files:
-        filename = Path(report_file).name
-        # Extract date from filename: climate_cardinals_report_YYYYMMDD.html
-        match = re.search(r'climate_cardinals_report_(\d{8})\.html', filename)
-        if match:
-            date_str = match.group(1)
-            try:
-                report_date = datetime.strptime(date_str, '%Y%m%d')
-                reports_data.append({
-                    'filename': filename,
-                    'date': report_date,
-                    'date_str': date_str
-                })
-            except ValueError:
-                continue
-    
-    # Sort by date (newest first)
-    reports_data.sort(key=lambda x: x['date'], reverse=True)
-    
-    # Remove any reports dated in the future (e.g. test files or mistakes)
-    today = datetime.now()
-    reports_data = [r for r in reports_data if r['date'] <= today]
-
-    # Show ALL reports in reverse chronological order (newest first)
-    # This allows users to see all available reports, including test versions
-    reports_data = sorted(reports_data, key=lambda x: x['date'], reverse=True)
-    
-    # Pick latest button target from the newest ISO week, preferring canonical
-    # Monday issue over same-week test reruns.
-    latest_report = None
-    if reports_data:
-        newest = reports_data[0]['date']
-        newest_week = (newest.isocalendar()[0], newest.isocalendar()[1])
-        newest_week_candidates = [
-            r for r in reports_data
-            if (r['date'].isocalendar()[0], r['date'].isocalendar()[1]) == newest_week
-        ]
-
-        latest_report = sorted(
-            newest_week_candidates,
-            key=lambda x: (
-                _extract_report_stat_signature(Path(output_dir) / x['filename'])[0],
-                1 if x['date'].weekday() == 0 else 0,
-                x['date'],
-                _extract_report_stat_signature(Path(output_dir) / x['filename'])[1],
-            ),
-            reverse=True,
-        )[0]['filename']
-    
-    # Generate report links HTML (show first N and allow expanding)
-    initial_visible_reports = 6
-    has_more_reports = len(reports_data) > initial_visible_reports
-    report_links_html = ""
-    for idx, report in enumerate(reports_data):
-        formatted_date = report['date'].strftime("%B %d, %Y")
-        week_num = report['date'].isocalendar()[1]
-        extra_class = " extra-report" if idx >= initial_visible_reports else ""
-        report_links_html += f'''            <a href="{report['filename']}" class="report-link{extra_class}">
-                📅 Week {week_num} - {formatted_date}
-            </a>
-'''
-
-    show_more_button_html = ""
-    if has_more_reports:
-        hidden_count = len(reports_data) - initial_visible_reports
-        show_more_button_html = f'''            <button id="toggleReportsBtn" class="btn secondary show-more-btn" data-expanded="false" onclick="toggleReports()">
-                Show {hidden_count} More Report{'s' if hidden_count != 1 else ''}
-            </button>
-'''
-    
-    if not report_links_html:
-        report_links_html = '''            <p style="color: #8b7355; font-style: italic;">No reports available yet.</p>
-'''
-    
-    # Generate the complete index.html
-    index_html = f'''<!DOCTYPE html>
-<html lang="en">
-
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Climate Cardinals Weekly Reports</title>
-    <style>
-        body {{
+INDEX_CSS = """
+        body {
             font-family: Georgia, serif;
             background: linear-gradient(135deg, #0a2f1f 0%, #1a5538 100%);
             margin: 0;
@@ -868,36 +830,36 @@ def update_index_html(output_dir="weekly_data"):
             display: flex;
             align-items: center;
             justify-content: center;
-        }}
+        }
 
-        .container {{
+        .container {
             max-width: 600px;
             background: #ffffff;
             border-radius: 12px;
             padding: 50px;
             box-shadow: 0 10px 40px rgba(0, 0, 0, 0.3);
             text-align: center;
-        }}
+        }
 
-        .logo {{
+        .logo {
             font-size: 72px;
             margin-bottom: 20px;
-        }}
+        }
 
-        h1 {{
+        h1 {
             color: #0a2f1f;
             font-size: 36px;
             margin: 0 0 15px 0;
-        }}
+        }
 
-        p {{
+        p {
             color: #1a5538;
             font-size: 18px;
             line-height: 1.6;
             margin-bottom: 30px;
-        }}
+        }
 
-        .btn {{
+        .btn {
             display: inline-block;
             background: #0a2f1f;
             color: #ffffff;
@@ -908,30 +870,30 @@ def update_index_html(output_dir="weekly_data"):
             font-weight: 600;
             transition: all 0.3s ease;
             margin: 10px;
-        }}
+        }
 
-        .btn:hover {{
+        .btn:hover {
             background: #1a5538;
             transform: translateY(-2px);
             box-shadow: 0 4px 15px rgba(0, 0, 0, 0.2);
-        }}
+        }
 
-        .secondary {{
+        .secondary {
             background: #9caf88;
             color: #0a2f1f;
-        }}
+        }
 
-        .secondary:hover {{
+        .secondary:hover {
             background: #7d9270;
-        }}
+        }
 
-        .reports-list {{
+        .reports-list {
             margin-top: 40px;
             padding-top: 30px;
             border-top: 2px solid #e8ece9;
-        }}
+        }
 
-        .report-link {{
+        .report-link {
             display: block;
             padding: 15px;
             margin: 10px 0;
@@ -941,38 +903,47 @@ def update_index_html(output_dir="weekly_data"):
             color: #0a2f1f;
             text-decoration: none;
             transition: all 0.3s ease;
-        }}
+        }
 
-        .report-link:hover {{
+        .report-link:hover {
             background: #e8ece9;
             transform: translateX(5px);
-        }}
+        }
 
-        .extra-report {{
+        .extra-report {
             display: none;
-        }}
+        }
 
-        .show-more-btn {{
+        .show-more-btn {
             border: none;
             cursor: pointer;
             margin-top: 12px;
-        }}
+        }
 
-        .footer {{
+        .footer {
             margin-top: 40px;
             padding-top: 20px;
             border-top: 1px solid #e8ece9;
             color: #8b7355;
             font-size: 14px;
-        }}
+        }
 
         /* index page responsive tweaks are inserted at generation time below */
-        @media screen and (max-width: 600px) {{
-            .logo {{ font-size: 60px; }}
-            h1 {{ font-size: 28px; }}
-            .btn {{ padding: 12px 30px; font-size: 14px; }}
-        }}
-    </style>
+        @media screen and (max-width: 600px) {
+            .logo { font-size: 60px; }
+            h1 { font-size: 28px; }
+            .btn { padding: 12px 30px; font-size: 14px; }
+        }
+"""
+
+_INDEX_PAGE = CompiledTemplate('''<!DOCTYPE html>
+<html lang="en">
+
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Climate Cardinals Weekly Reports</title>
+    <style>INDEX_CSS    </style>
 </head>
 
 <body>
@@ -982,13 +953,13 @@ def update_index_html(output_dir="weekly_data"):
         <p>Weekly Intelligence Reports for Climate Action Leaders</p>
 
         <div>
-            {f'<a href="{latest_report}" class="btn">View Latest Report</a>' if latest_report else '<span class="btn" style="opacity: 0.5; cursor: not-allowed;">No Reports Yet</span>'}
+            LATEST_BUTTON
             <a href="#reports" class="btn secondary">All Reports</a>
         </div>
 
         <div id="reports" class="reports-list">
             <h3 style="color: #0a2f1f; margin-bottom: 20px;">📊 Available Reports</h3>
-{report_links_html}{show_more_button_html}        </div>
+REPORT_LINKSSHOW_MORE_BUTTON        </div>
 
         <div class="footer">
             <p>© 2026 Climate Cardinals<br>
@@ -996,29 +967,100 @@ def update_index_html(output_dir="weekly_data"):
         </div>
     </div>
     <script>
-        function toggleReports() {{
+        function toggleReports() {
             const btn = document.getElementById('toggleReportsBtn');
             if (!btn) return;
             const expanded = btn.getAttribute('data-expanded') === 'true';
             const extraReports = document.querySelectorAll('.extra-report');
-            extraReports.forEach((el) => {{
+            extraReports.forEach((el) => {
                 el.style.display = expanded ? 'none' : 'block';
-            }});
+            });
             const hiddenCount = extraReports.length;
             btn.textContent = expanded
-                ? `Show ${{hiddenCount}} More Report${{hiddenCount === 1 ? '' : 's'}}`
+                ? `Show ${hiddenCount} More Report${hiddenCount === 1 ? '' : 's'}`
                 : 'Show Fewer Reports';
             btn.setAttribute('data-expanded', expanded ? 'false' : 'true');
-        }}
+        }
     </script>
 </body>
 
-</html>'''
+</html>''',
+    placeholders=("LATEST_BUTTON", "REPORT_LINKS", "SHOW_MORE_BUTTON"),
+    static={"INDEX_CSS": INDEX_CSS},
+)
+
+
+def update_index_html(output_dir="weekly_data", entries=None, rescan=False):
+    """
+    Update index.html with all available reports listed in reverse chronological order
+
+    The report list is the reports.json manifest (or entries, when the caller
+    already has it), so nothing is globbed or sorted here; rescan=True first
+    matches the manifest against the folder, for reports added or deleted by
+    hand. index.html is only rewritten, atomically, when its content changes.
+    """
+    if entries is None:
+        entries = load_manifest(output_dir, rescan=rescan)
+    # Every report on record, newest first, minus any dated in the future
+    # (e.g. test files or mistakes)
+    reports_data = published_reports(entries)
+    
+    # Pick latest button target from the newest ISO week, preferring canonical
+    # Monday issue over same-week test reruns (by the counts in the manifest)
+    latest = latest_report(reports_data)
+    latest_report_name = latest['filename'] if latest else None
+    
+    # Generate report links HTML (show first N and allow expanding)
+    initial_visible_reports = 6
+    has_more_reports = len(reports_data) > initial_visible_reports
+    report_links = []
+    for idx, report in enumerate(reports_data):
+        formatted_date = entry_date(report).strftime("%B %d, %Y")
+        week_num = report['iso_week']
+        extra_class = " extra-report" if idx >= initial_visible_reports else ""
+        report_links.append(f'''            <a href="{report['filename']}" class="report-link{extra_class}">
+                📅 Week {week_num} - {formatted_date}
+            </a>
+''')
+    report_links_html = "".join(report_links)
+
+    show_more_button_html = ""
+    if has_more_reports:
+        hidden_count = len(reports_data) - initial_visible_reports
+        show_more_button_html = f'''            <button id="toggleReportsBtn" class="btn secondary show-more-btn" data-expanded="false" onclick="toggleReports()">
+                Show {hidden_count} More Report{'s' if hidden_count != 1 else ''}
+            </button>
+'''
     
-    # Save index.html
+    if not report_links_html:
+        report_links_html = '''            <p style="color: #8b7355; font-style: italic;">No reports available yet.</p>
+'''
+    
+    # Generate the complete index.html
+    latest_button_html = (
+        f'<a href="{latest_report_name}" class="btn">View Latest Report</a>' if latest_report_name
+        else '<span class="btn" style="opacity: 0.5; cursor: not-allowed;">No Reports Yet</span>'
+    )
+    index_html = _INDEX_PAGE.render({
+        "LATEST_BUTTON": latest_button_html,
+        "REPORT_LINKS": report_links_html,
+        "SHOW_MORE_BUTTON": show_more_button_html,
+    })
+    
+    # Save index.html, leaving the file (and the deploy diff) alone when
+    # nothing visible changed
     index_path = Path(output_dir) / "index.html"
-    with open(index_path, 'w', encoding='utf-8') as f:
+    try:
+        unchanged = index_path.read_text(encoding='utf-8') == index_html
+    except OSError:
+        unchanged = False
+    if unchanged:
+        print(f"🏠 Index page already up to date ({len(reports_data)} report(s))")
+        return index_path
+    tmp_path = index_path.with_suffix(".html.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
         f.write(index_html)
+    os.replace(tmp_path, index_path)
     
     print(f"🏠 Index page updated with {len(reports_data)} report(s)")
     return index_path
@@ -1028,11 +1070,8 @@ def main():
     """Main entry point - regenerate report with current CSV data"""
     OUTPUT_FOLDER = Path("weekly_data")
     
-    # Load current CSV data
-    experts_df = pd.read_csv(OUTPUT_FOLDER / "experts.csv") if (OUTPUT_FOLDER / "experts.csv").exists() else pd.DataFrame()
-    grants_df = pd.read_csv(OUTPUT_FOLDER / "grants.csv") if (OUTPUT_FOLDER / "grants.csv").exists() else pd.DataFrame()
-    events_df = pd.read_csv(OUTPUT_FOLDER / "events.csv") if (OUTPUT_FOLDER / "events.csv").exists() else pd.DataFrame()
-    csr_df = pd.read_csv(OUTPUT_FOLDER / "csr_reports.csv") if (OUTPUT_FOLDER / "csr_reports.csv").exists() else pd.DataFrame()
+    # Load current section data
+    sections = get_sections(OUTPUT_FOLDER)
     
     print("=" * 70)
     print("🌍 CLIMATE CARDINALS - WEB REPORT GENERATOR")
@@ -1040,17 +1079,17 @@ def main():
     print(f"📅 Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print()
     print("📊 Data Summary:")
-    print(f"   👥 Climate Experts: {len(experts_df)}")
-    print(f"   💰 Grants: {len(grants_df)}")
-    print(f"   🎤 Events: {len(events_df)}")
-    print(f"   📊 ESG Reports: {len(csr_df)}")
+    print(f"   👥 Climate Experts: {len(sections.experts)}")
+    print(f"   💰 Grants: {len(sections.grants)}")
+    print(f"   🎤 Events: {len(sections.events)}")
+    print(f"   📊 ESG Reports: {len(sections.csr_reports)}")
     print()
     
     # Generate the report
-    report_path = generate_full_report_html(experts_df, grants_df, events_df, csr_df)
+    report_path = generate_full_report_html(sections)
     
     # Generate and save metadata
-    metadata = generate_report_metadata(experts_df, grants_df, events_df, csr_df, report_path)
+    metadata = generate_report_metadata(sections, report_path)
     print()
     print(f"✅ Report generated for week {metadata['week_number']}")
     print(f"📄 Report saved: {report_path}")